@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+Database-scale benchmark
+Seeds a database through DatabaseManager at a configurable scale - tortoises
+with years of health, growth and feeding records, millions of habitat
+readings and a large plant catalogue - then times every data-access path the
+screens use, headless on Qt's offscreen platform:
+
+    home       latest feedings, dashboard counts, table versions
+    health     record pages (first, keyset-deep, filtered), summaries
+    reminders  each list filter and the 30-day calendar expansion
+    growth     record pages and growth analytics (cold and cached)
+    feeding    plant safety map, running nutrition totals, recent sessions,
+               diet balance windows and warnings
+    plants     browser pages, search and safety filter, full catalogue,
+               in-memory name lookup (index build, exact, prefix, typo)
+    screens    building each screen and its refresh
+
+Each path is run several times and reported as min/median/p95/mean in ms.
+The report is printed and, with --output, written as JSON; --compare
+prints the change against an earlier report.
+
+    python benchmark_database.py --tortoises 20 --years 5 --habitat 1000000 --plants 50000
+    python benchmark_database.py --output before.json
+    python benchmark_database.py --output after.json --compare before.json
+
+Seeding millions of habitat readings takes a while; --db keeps the seeded
+database so later runs can reuse it.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtWidgets import QApplication
+
+from database.db_manager import DatabaseManager, VERSIONED_TABLES
+from utils.growth_analytics import GrowthAnalytics, NUMPY_AVAILABLE
+from utils.recurrence import expand_reminders
+from utils.diet_analytics import DietAnalytics, WINDOWS
+from utils.plant_lookup import PlantLookup
+from qt_screens.home_screen import HomeScreen
+from qt_screens.health_records_screen import HealthRecordsScreen
+from qt_screens.care_reminders_screen import CareRemindersScreen, CALENDAR_DAYS
+from qt_screens.growth_tracking_screen import GrowthTrackingScreen
+from qt_screens.plant_database_screen import PlantDatabaseScreen
+from qt_screens.feeding_screen import FeedingScreen
+
+REPORT_VERSION = 1
+
+RECORD_TYPES = ['vet_visit', 'observation', 'medication', 'injury', 'behavior']
+PRIORITIES = ['low', 'medium', 'high', 'urgent']
+SAFETY_LEVELS = ['safe', 'safe', 'caution', 'toxic']
+REMINDER_TYPES = [('daily', 1), ('weekly', 7), ('monthly', 30), ('yearly', 365), ('once', 0)]
+SUPPLEMENTS = ['Calcium', 'Cuttlebone', 'Multivitamin']
+
+# Rows per executemany batch while seeding
+BATCH_SIZE = 50000
+
+
+class BenchmarkWindow:
+    """Stands in for the main window"""
+
+    def show_screen(self, name):
+        pass
+
+
+def batched(rows, size=BATCH_SIZE):
+    """Split a row generator into lists of at most size rows"""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def insert_rows(db, sql, rows):
+    """Insert generated rows in batches, one transaction per batch"""
+    conn = db.get_connection()
+    count = 0
+    for batch in batched(rows):
+        with conn:
+            conn.executemany(sql, batch)
+        count += len(batch)
+    return count
+
+
+def timestamp(moment):
+    return moment.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def seed_database(db, scale, rng):
+    """
+    Fill an initialized database with synthetic data
+
+    Args:
+        db: DatabaseManager for an empty, initialized database
+        scale: Dict with tortoises, years, habitat, plants and reminders
+        rng: random.Random, so a seed gives the same data every run
+
+    Returns:
+        Dict[str, int]: Rows created per table
+    """
+    now = datetime.now().replace(microsecond=0)
+    days = int(scale['years'] * 365)
+    counts = {}
+
+    user_ids = [db.get_users()[0]['id']]
+    user_ids += [db.add_user(f"Caregiver {i + 1}") for i in range(3)]
+
+    tortoise_ids = [db.add_tortoise(f"Tortoise {i + 1}", sex=rng.choice(['male', 'female']),
+                                    birth_date=(now - timedelta(days=days + rng.randint(30, 3000))).date().isoformat())
+                    for i in range(scale['tortoises'])]
+    counts['tortoises'] = len(tortoise_ids)
+
+    # Plant catalogue
+    print(f"  plants: {scale['plants']}")
+    counts['plants'] = insert_rows(db, '''
+        INSERT OR IGNORE INTO plants (name, scientific_name, safety_level, nutrition_notes,
+                                      feeding_frequency, description, main_photo_path)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', ((f"Plant {i:05d}", f"Genus{i % 997} species{i}", rng.choice(SAFETY_LEVELS),
+           'High calcium, low protein', rng.choice(['Daily', 'Weekly', 'Occasionally']),
+           'Synthetic benchmark plant', None) for i in range(scale['plants'])))
+    plant_ids = [row[0] for row in db.execute('SELECT id FROM plants')]
+
+    # Health records: a few a month per tortoise
+    print(f"  health records over {scale['years']} years")
+    counts['health_records'] = insert_rows(db, '''
+        INSERT INTO health_records (tortoise_id, user_id, record_type, title, description,
+                                    priority, resolved, record_date)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', ((tortoise_id, rng.choice(user_ids), rng.choice(RECORD_TYPES), 'Benchmark record', 'Synthetic',
+           rng.choice(PRIORITIES), day > 60 or rng.random() < 0.5,
+           timestamp(now - timedelta(days=day, minutes=rng.randint(0, 1439))))
+          for tortoise_id in tortoise_ids for day in range(0, days, 10)))
+
+    # Growth records: weekly, growing slowly, through DatabaseManager's bulk insert
+    print("  growth records")
+    growth = []
+    for tortoise_id in tortoise_ids:
+        for week, day in enumerate(range(days, 0, -7)):
+            growth.append({'tortoise_id': tortoise_id, 'user_id': rng.choice(user_ids),
+                           'measurement_date': timestamp(now - timedelta(days=day)),
+                           'weight': round(200 + week * 1.5 + rng.gauss(0, 5), 1),
+                           'length': round(8 + week * 0.03 + rng.gauss(0, 0.1), 2)})
+    counts['growth_records'] = db.add_growth_records(growth)
+
+    # Feedings: daily, with a few plants each
+    print("  feeding records")
+    counts['feeding_records'] = insert_rows(db, '''
+        INSERT INTO feeding_records (tortoise_id, user_id, feeding_date, total_weight, ate_well)
+        VALUES (?, ?, ?, ?, ?)
+    ''', ((tortoise_id, rng.choice(user_ids), timestamp(now - timedelta(days=day, hours=rng.randint(7, 10))),
+           round(rng.uniform(20, 80), 1), rng.random() < 0.9)
+          for tortoise_id in tortoise_ids for day in range(days)))
+    feeding_ids = [row[0] for row in db.execute('SELECT id FROM feeding_records')]
+    counts['feeding_items'] = insert_rows(db, '''
+        INSERT INTO feeding_items (feeding_record_id, plant_id, supplement_name, weight)
+        VALUES (?, ?, ?, ?)
+    ''', ((feeding_id, rng.choice(plant_ids) if plant_ids and item else None,
+           None if item else rng.choice(SUPPLEMENTS), round(rng.uniform(1, 30), 1))
+          for feeding_id in feeding_ids for item in range(rng.randint(2, 4))))
+    # Bulk-inserted history, so count the running totals and diet aggregates once
+    db.rebuild_nutrition_totals()
+    db.rebuild_diet_aggregates()
+
+    # Habitat readings, one per interval back from now
+    print(f"  habitat readings: {scale['habitat']}")
+    interval = max(1, days * 86400 // max(1, scale['habitat']))
+    counts['habitat_readings'] = insert_rows(db, '''
+        INSERT INTO habitat_readings (timestamp, temperature, humidity, basking_temp, cool_temp, uv_index)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', ((timestamp(now - timedelta(seconds=i * interval)), round(rng.uniform(20, 30), 1),
+           round(rng.uniform(40, 70), 1), round(rng.uniform(30, 38), 1), round(rng.uniform(18, 24), 1),
+           round(rng.uniform(0, 6), 1)) for i in range(scale['habitat'])))
+
+    # Care reminders, some overdue, some completed
+    for i in range(scale['reminders']):
+        reminder_type, frequency = rng.choice(REMINDER_TYPES)
+        due = now + timedelta(days=rng.randint(-20, 60), hours=rng.randint(0, 23))
+        reminder_id = db.add_care_reminder(f"Reminder {i + 1}", assigned_user_id=rng.choice(user_ids),
+                                           tortoise_id=rng.choice(tortoise_ids), reminder_type=reminder_type,
+                                           frequency_days=frequency, next_due_date=due.isoformat(),
+                                           priority=rng.choice(['low', 'medium', 'high']))
+        if rng.random() < 0.3:
+            db.complete_care_reminder(reminder_id, due)
+    counts['care_reminders'] = scale['reminders']
+
+    db.execute('ANALYZE', fetch=None, commit=True)
+    return counts
+
+
+def summarize(durations, rows=None):
+    """Timing statistics in milliseconds for one path"""
+    ms = sorted(d * 1000 for d in durations)
+    p95 = ms[min(len(ms) - 1, int(round(0.95 * (len(ms) - 1))))]
+    return {
+        'runs': len(ms),
+        'min_ms': round(ms[0], 3),
+        'median_ms': round(statistics.median(ms), 3),
+        'p95_ms': round(p95, 3),
+        'mean_ms': round(statistics.fmean(ms), 3),
+        'rows': rows,
+    }
+
+
+def time_path(function, repeat, warmup=1):
+    """Run a path warmup + repeat times and summarize the timed runs"""
+    for _ in range(warmup):
+        result = function()
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        durations.append(time.perf_counter() - start)
+    rows = len(result) if isinstance(result, (list, dict, tuple)) else None
+    return summarize(durations, rows)
+
+
+def data_paths(db, window):
+    """(name, function) for each query path, calling what the screens call"""
+    today = datetime.now().date()
+    tomorrow = today + timedelta(days=1)
+    tortoise_id = db.get_tortoises()[0]['id']
+
+    # "Deep" pages are halfway down each list, whatever the scale
+    health_count, growth_count, plant_count = db.execute('''
+        SELECT (SELECT COUNT(*) FROM health_records), (SELECT COUNT(*) FROM growth_records),
+               (SELECT COUNT(*) FROM plants)
+    ''', fetch='one')
+
+    # Keyset cursor for the middle page of health records, as HealthRecordsScreen keeps them
+    cursor = None
+    for _ in range(health_count // 50 // 2):
+        page = db.get_health_records(limit=50, before=cursor)
+        cursor = (page[-1]['record_date'], page[-1]['id'])
+
+    growth_screen = GrowthTrackingScreen(db, window)
+    plants_screen = PlantDatabaseScreen(db, window)
+
+    def plants_page(search='', safety='All Plants', page_number=0):
+        def load():
+            plants_screen.search_input.blockSignals(True)
+            plants_screen.search_input.setText(search)
+            plants_screen.search_input.blockSignals(False)
+            plants_screen.safety_filter.blockSignals(True)
+            plants_screen.safety_filter.setCurrentText(safety)
+            plants_screen.safety_filter.blockSignals(False)
+            plants_screen.current_page = page_number
+            plants_screen.load_plants()
+            return plants_screen.current_plants
+        return load
+
+    def calendar():
+        start = datetime.combine(today, datetime.min.time())
+        end = start + timedelta(days=CALENDAR_DAYS)
+        return expand_reminders(db.get_care_reminders_due_before(end.isoformat()), start, end,
+                                include_overdue=True)
+
+    shared_analytics = GrowthAnalytics(db)
+    lookup = PlantLookup(db)
+
+    paths = [
+        ('home.latest_feedings', db.get_latest_feedings),
+        ('home.dashboard_counts', lambda: db.get_dashboard_counts(today.isoformat(), tomorrow.isoformat())),
+        ('home.table_versions', lambda: db.get_table_versions(list(VERSIONED_TABLES))),
+        ('tortoises.active', db.get_tortoises),
+        ('tortoises.all', db.get_all_tortoises),
+        ('settings.all', db.get_all_settings),
+        ('health.page_first', lambda: db.get_health_records(limit=50)),
+        ('health.page_deep_keyset', lambda: db.get_health_records(limit=50, before=cursor)),
+        ('health.unresolved', lambda: db.get_health_records(limit=50, resolved=False)),
+        ('health.urgent', lambda: db.get_health_records(limit=50, resolved=False, priority='urgent')),
+        ('health.recent_30_days', lambda: db.get_health_records(
+            limit=50, since=timestamp(datetime.now() - timedelta(days=30)))),
+        ('health.one_tortoise', lambda: db.get_health_records(limit=50, tortoise_id=tortoise_id)),
+        ('health.summaries', db.get_health_summaries),
+    ]
+    for filter_type in ('due', 'overdue', 'upcoming', 'all', 'completed'):
+        paths.append((f"reminders.{filter_type}",
+                      lambda f=filter_type: db.get_care_reminders(f, limit=50)))
+    paths += [
+        ('reminders.calendar_30_days', calendar),
+        ('reminders.due_dates', db.get_active_reminder_due_dates),
+        ('growth.page_first', lambda: growth_screen.get_growth_records(limit=50)),
+        ('growth.page_deep', lambda: growth_screen.get_growth_records(limit=50, offset=growth_count // 100 * 50)),
+        ('growth.one_tortoise', lambda: growth_screen.get_growth_records(tortoise_id, limit=50)),
+        ('plants.page_first', plants_page()),
+        ('plants.page_deep', plants_page(page_number=plant_count // plants_screen.plants_per_page // 2)),
+        ('plants.search', plants_page(search='Plant 12')),
+        ('plants.safe_only', plants_page(safety='Safe Only')),
+        ('plants.catalogue', db.get_plants),
+        ('plants.lookup_index', lambda: PlantLookup(db).get_index()),
+        ('plants.lookup_exact', lambda: lookup.find(f"Plant {plant_count // 2:05d}")),
+        ('plants.lookup_prefix', lambda: lookup.complete('Plant 012')),
+        ('plants.lookup_typo', lambda: lookup.fuzzy(f"Genus12 specis{plant_count // 2}")),
+        ('feeding.plant_safety_map', db.get_plant_safety_map),
+        ('feeding.nutrition_totals', lambda: db.get_nutrition_totals(tortoise_id)),
+        ('feeding.recent_sessions', lambda: db.get_feeding_sessions(tortoise_id, limit=5)),
+    ]
+    diet = DietAnalytics(db)
+    paths += [(f'feeding.diet_{days}d', lambda days=days: diet.balance(tortoise_id, days)) for days in WINDOWS]
+    paths.append(('feeding.diet_warnings', diet.warnings))
+    if NUMPY_AVAILABLE:
+        paths += [
+            ('growth.analytics_cold', lambda: GrowthAnalytics(db).analyze_all()),
+            ('growth.analytics_cached', shared_analytics.analyze_all),
+        ]
+    return paths
+
+
+def screen_paths(db, window):
+    """(name, function) for building each screen and refreshing it"""
+    home = HomeScreen(db, window)
+    health = HealthRecordsScreen(db, window)
+    reminders = CareRemindersScreen(db, window)
+    growth = GrowthTrackingScreen(db, window)
+
+    def build(screen_class):
+        def run():
+            screen = screen_class(db, window)
+            screen.deleteLater()
+        return run
+
+    paths = []
+    for screen_class in (HomeScreen, HealthRecordsScreen, CareRemindersScreen, GrowthTrackingScreen,
+                         PlantDatabaseScreen, FeedingScreen):
+        paths.append((f"screens.build.{screen_class.__name__}", build(screen_class)))
+    paths += [
+        ('screens.refresh.HomeScreen', home.refresh_display),
+        ('screens.refresh.HealthRecordsScreen', health.refresh_records),
+        ('screens.refresh.GrowthTrackingScreen', growth.refresh_records),
+    ]
+    for filter_type in ('due', 'calendar', 'all'):
+        paths.append((f"screens.refresh.CareRemindersScreen.{filter_type}",
+                      lambda f=filter_type: reminders.apply_filter(f)))
+    return paths
+
+
+def git_commit():
+    """Current commit of the working tree, if it is a git checkout"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare_reports(current, previous, only=None):
+    """Print the median change of each path against an earlier report"""
+    print(f"\nCompared with {previous.get('commit') or 'previous run'} "
+          f"from {previous.get('generated_at', '?')} (median ms):")
+    old_results = previous.get('results', {})
+    for name, stats in current['results'].items():
+        old = old_results.get(name)
+        if old is None:
+            print(f"  {name:46} {stats['median_ms']:10.2f}        (new)")
+            continue
+        ratio = stats['median_ms'] / old['median_ms'] if old['median_ms'] else float('inf')
+        flag = '  slower' if ratio > 1.2 else '  faster' if ratio < 0.8 else ''
+        print(f"  {name:46} {old['median_ms']:10.2f} -> {stats['median_ms']:10.2f}  ({ratio:.2f}x){flag}")
+    for name in sorted(old_results.keys() - current['results'].keys()):
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        print(f"  {name:46} (no longer measured)")
+
+
+def run_benchmark(args):
+    app = QApplication.instance() or QApplication([])
+    temp_dir = None
+    if args.db:
+        db_path = args.db
+    else:
+        temp_dir = tempfile.mkdtemp(prefix='database_bench_')
+        db_path = os.path.join(temp_dir, 'bench.db')
+    reuse = os.path.exists(db_path)
+
+    db = DatabaseManager(db_path)
+    try:
+        db.initialize_database()
+        scale = {'tortoises': args.tortoises, 'years': args.years, 'habitat': args.habitat,
+                 'plants': args.plants, 'reminders': args.reminders}
+        seed_seconds = None
+        counts = None
+        if reuse:
+            print(f"Reusing {db_path} (scale options are ignored)")
+        else:
+            print(f"Seeding {db_path}...")
+            start = time.perf_counter()
+            counts = seed_database(db, scale, random.Random(args.seed))
+            seed_seconds = round(time.perf_counter() - start, 1)
+            print(f"Seeded in {seed_seconds} s")
+        if counts is None:
+            counts = {table: db.execute(f"SELECT COUNT(*) FROM {table}", fetch='one')[0]
+                      for table in ('tortoises', 'plants', 'health_records', 'growth_records', 'feeding_records',
+                                    'feeding_items', 'habitat_readings', 'care_reminders')}
+
+        window = BenchmarkWindow()
+        results = {}
+        print(f"\nTiming (best of warmup + {args.repeat} runs, ms):")
+        print(f"  {'path':46} {'min':>9} {'median':>9} {'p95':>9} {'rows':>7}")
+        paths = data_paths(db, window) + screen_paths(db, window)
+        for name, function in paths:
+            if args.only and not any(name.startswith(prefix) for prefix in args.only):
+                continue
+            stats = time_path(function, args.repeat)
+            app.processEvents()
+            results[name] = stats
+            rows = '' if stats['rows'] is None else stats['rows']
+            print(f"  {name:46} {stats['min_ms']:9.2f} {stats['median_ms']:9.2f} {stats['p95_ms']:9.2f} {rows:>7}")
+        # Destroy the screens while the application still exists
+        del paths, function
+        gc.collect()
+
+        report = {
+            'version': REPORT_VERSION,
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': sys.version.split()[0],
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'scale': scale if not reuse else None,
+            'seed': args.seed,
+            'seed_seconds': seed_seconds,
+            'rows': counts,
+            'database_bytes': os.path.getsize(db_path),
+            'repeat': args.repeat,
+            'results': results,
+        }
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"\nWrote {args.output}")
+        if args.compare:
+            with open(args.compare) as f:
+                compare_reports(report, json.load(f), args.only)
+    finally:
+        db.close()
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Database-scale benchmark')
+    parser.add_argument('--tortoises', type=int, default=20, help='Tortoises to create')
+    parser.add_argument('--years', type=float, default=5, help='Years of health, growth and feeding history')
+    parser.add_argument('--habitat', type=int, default=1000000, help='Habitat readings to create')
+    parser.add_argument('--plants', type=int, default=50000, help='Plants in the catalogue')
+    parser.add_argument('--reminders', type=int, default=200, help='Care reminders to create')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed for the synthetic data')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per path')
+    parser.add_argument('--only', nargs='+', help='Only time paths starting with these prefixes (e.g. health plants)')
+    parser.add_argument('--db', help='Database file to seed and keep (reused if it already exists)')
+    parser.add_argument('--output', help='Write the report to this JSON file')
+    parser.add_argument('--compare', help='Earlier JSON report to compare against')
+    args = parser.parse_args()
+
+    run_benchmark(args)
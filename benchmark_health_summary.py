@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the health summary queries
+Builds a temporary database with 100k health records and compares:
+
+    1. the old approach - four COUNT queries per tortoise
+    2. get_health_summaries - one aggregate query for every tortoise
+    3. get_health_summaries with the trigger-maintained health_summary table
+
+It also checks that all three give the same numbers and measures how much
+the counter triggers slow down inserts. All three run against the indexes
+created by initialize_database.
+
+    python benchmark_health_summary.py --records 100000 --tortoises 50
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from database.db_manager import DatabaseManager
+
+RECORD_TYPES = ['vet_visit', 'observation', 'medication', 'injury', 'behavior']
+PRIORITIES = ['low', 'medium', 'high', 'urgent']
+
+
+def legacy_health_summary(db, tortoise_id):
+    """The per-tortoise summary as it was computed before (four scans)"""
+    cursor = db.get_connection().cursor()
+    cursor.execute('SELECT COUNT(*) FROM health_records WHERE tortoise_id = ?', (tortoise_id,))
+    total_records = cursor.fetchone()[0]
+    cursor.execute('SELECT COUNT(*) FROM health_records WHERE tortoise_id = ? AND resolved = 0', (tortoise_id,))
+    unresolved_issues = cursor.fetchone()[0]
+    cursor.execute('''
+        SELECT COUNT(*) FROM health_records
+        WHERE tortoise_id = ? AND record_date > datetime('now', '-30 days')
+    ''', (tortoise_id,))
+    recent_records = cursor.fetchone()[0]
+    cursor.execute('SELECT COUNT(*) FROM health_records WHERE tortoise_id = ? AND priority = "urgent" AND resolved = 0',
+                   (tortoise_id,))
+    urgent_issues = cursor.fetchone()[0]
+    return {
+        'total_records': total_records,
+        'unresolved_issues': unresolved_issues,
+        'recent_records': recent_records,
+        'urgent_issues': urgent_issues
+    }
+
+
+def populate(db, records, tortoises):
+    """Fill the database with random tortoises and health records"""
+    user_id = db.get_users()[0]['id']
+    tortoise_ids = [db.add_tortoise(f"Tortoise {i + 1}") for i in range(tortoises)]
+
+    rows = []
+    for _ in range(records):
+        days_ago = random.randint(0, 5 * 365)
+        rows.append((random.choice(tortoise_ids), user_id, random.choice(RECORD_TYPES), 'Benchmark record',
+                     random.choice(PRIORITIES), random.random() < 0.7, f"-{days_ago} days"))
+
+    conn = db.get_connection()
+    with conn:
+        conn.executemany('''
+            INSERT INTO health_records (tortoise_id, user_id, record_type, title, priority, resolved, record_date)
+            VALUES (?, ?, ?, ?, ?, ?, datetime('now', ?))
+        ''', rows)
+    return tortoise_ids
+
+
+def time_it(function, repeat):
+    """Best wall time of several runs, in milliseconds"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def time_inserts(db, tortoise_ids, count):
+    """Time single-record inserts, as the app does them"""
+    user_id = db.get_users()[0]['id']
+    start = time.perf_counter()
+    for _ in range(count):
+        db.add_health_record(random.choice(tortoise_ids), user_id, 'observation', 'Insert timing',
+                             priority=random.choice(PRIORITIES))
+    return (time.perf_counter() - start) * 1000 / count
+
+
+def run_benchmark(records, tortoises, repeat):
+    temp_dir = tempfile.mkdtemp(prefix='health_summary_bench_')
+    db = DatabaseManager(os.path.join(temp_dir, 'bench.db'))
+    try:
+        db.initialize_database()
+        print(f"Creating {records} health records for {tortoises} tortoises...")
+        tortoise_ids = populate(db, records, tortoises)
+
+        legacy_ms, legacy = time_it(lambda: {t: legacy_health_summary(db, t) for t in tortoise_ids}, repeat)
+        aggregate_ms, aggregate = time_it(lambda: db.get_health_summaries(tortoise_ids), repeat)
+        insert_ms = time_inserts(db, tortoise_ids, 200)
+
+        db.enable_health_summary_counters()
+        counters_ms, counters = time_it(lambda: db.get_health_summaries(tortoise_ids), repeat)
+        counter_insert_ms = time_inserts(db, tortoise_ids, 200)
+
+        # The inserts changed the data, so compare everything against a fresh run
+        db.disable_health_summary_counters()
+        legacy = {t: legacy_health_summary(db, t) for t in tortoise_ids}
+        aggregate = db.get_health_summaries(tortoise_ids)
+        db.enable_health_summary_counters()
+        counters = db.get_health_summaries(tortoise_ids)
+
+        print(f"\nSummaries for all {tortoises} tortoises (best of {repeat}):")
+        print(f"  4 queries per tortoise:   {legacy_ms:8.2f} ms")
+        print(f"  Single aggregate query:   {aggregate_ms:8.2f} ms  ({legacy_ms / aggregate_ms:.1f}x faster)")
+        print(f"  Counter table:            {counters_ms:8.2f} ms  ({legacy_ms / counters_ms:.1f}x faster)")
+        print(f"\nInsert cost: {insert_ms:.3f} ms without triggers, {counter_insert_ms:.3f} ms with counter triggers")
+        print(f"Results match: {legacy == aggregate == counters}")
+    finally:
+        db.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Health summary benchmark')
+    parser.add_argument('--records', type=int, default=100000, help='Health records to generate')
+    parser.add_argument('--tortoises', type=int, default=50, help='Tortoises to spread them over')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per approach')
+    args = parser.parse_args()
+
+    run_benchmark(args.records, args.tortoises, args.repeat)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the application stylesheet
+Compares building and restyling widgets the old way - every widget gets its
+own setStyleSheet string - with the shared stylesheet from design_system/theme.py:
+
+    1. a page of plant cards (five stylesheets per card before)
+    2. a screen's worth of create_button buttons
+    3. cycling the home screen status labels through their states
+    4. building the real home and settings screens
+
+Each build is polished and rendered once, since that is when Qt parses and
+applies the stylesheets. Runs offscreen unless QT_QPA_PLATFORM is set.
+
+    python benchmark_theme.py --cards 12 --buttons 40 --repeat 5
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtWidgets import QApplication, QWidget, QGridLayout, QPushButton, QLabel
+
+from database.db_manager import DatabaseManager
+from design_system.colors import APP_COLORS
+from design_system.theme import apply_theme, set_style_property, BUTTON_VARIANTS, STATUS_STATES, color
+from qt_screens.plant_database_screen import PlantCard
+from qt_screens.home_screen import HomeScreen
+from qt_screens.settings_main_screen import SettingsMainScreen
+
+SAFETY_LEVELS = ['safe', 'caution', 'toxic']
+SAFETY_BG = {'safe': '#28a745', 'caution': '#ffc107', 'toxic': '#dc3545'}
+
+
+class BenchmarkWindow:
+    """Stands in for the main window"""
+
+    def show_screen(self, name):
+        pass
+
+
+def legacy_card_styles(card, safety):
+    """Apply the per-widget stylesheets PlantCard used to set"""
+    card.setStyleSheet(f"""
+        QFrame {{ background-color: white; border: 1px solid {SAFETY_BG[safety]}; border-radius: 8px; margin: 4px; }}
+        QFrame:hover {{ border: 1px solid {SAFETY_BG[safety]}; background-color: #f8f9fa; }}
+    """)
+    card.photo_label.setStyleSheet("""
+        QLabel { border: 1px solid #e0e0e0; border-radius: 6px; background-color: #f8f9fa;
+                 color: #6c757d; font-size: 10px; font-weight: 500; }
+    """)
+    card.name_label.setStyleSheet("""
+        QLabel { background-color: rgba(255, 255, 255, 0.95); color: #000; font-size: 16px;
+                 font-weight: bold; padding: 8px; border-radius: 6px; }
+    """)
+    card.sci_label.setStyleSheet("""
+        QLabel { background-color: rgba(255, 255, 255, 0.9); color: #333; font-size: 14px;
+                 font-style: italic; padding: 8px; border-radius: 6px; line-height: 1.3; }
+    """)
+    card.safety_label.setStyleSheet(f"""
+        QLabel {{ background-color: {SAFETY_BG[safety]}; color: white; font-size: 18px;
+                  font-weight: bold; padding: 8px; border-radius: 6px; }}
+    """)
+
+
+def legacy_button_style(variant):
+    """The stylesheet create_button used to build for each button"""
+    background, hover, pressed = BUTTON_VARIANTS[variant]
+    return f"""
+        QPushButton {{
+            background-color: {color(background)};
+            color: white;
+            border: none;
+            border-radius: 10px;
+            padding: 12px;
+            font-weight: bold;
+        }}
+        QPushButton:hover {{ background-color: {color(hover)}; }}
+        QPushButton:pressed {{ background-color: {color(pressed)}; }}
+    """
+
+
+def legacy_status_style(state):
+    """The stylesheet HomeScreen.get_status_style used to build for each update"""
+    border, background, width = STATUS_STATES[state]
+    return f"""
+        QLabel {{
+            background-color: {color(background)};
+            border: {width}px solid {color(border)};
+            border-radius: 8px;
+            padding: 12px;
+            margin: 5px;
+            font-size: 14px;
+            color: {APP_COLORS['text']['primary']};
+            font-weight: bold;
+            min-height: 20px;
+        }}
+    """
+
+
+def build_cards(count, legacy):
+    container = QWidget()
+    layout = QGridLayout(container)
+    for i in range(count):
+        safety = SAFETY_LEVELS[i % 3]
+        card = PlantCard((f"Plant {i}", f"Planta {i}", safety, '', '', '', None))
+        if legacy:
+            legacy_card_styles(card, safety)
+        layout.addWidget(card, i // 4, i % 4)
+    container.grab()
+    return container
+
+
+def build_buttons(count, legacy):
+    container = QWidget()
+    layout = QGridLayout(container)
+    variants = list(BUTTON_VARIANTS)
+    for i in range(count):
+        button = QPushButton(f"Button {i}")
+        variant = variants[i % len(variants)]
+        if legacy:
+            button.setStyleSheet(legacy_button_style(variant))
+        else:
+            button.setProperty('variant', variant)
+        layout.addWidget(button, i // 4, i % 4)
+    container.grab()
+    return container
+
+
+def cycle_status(labels, updates, legacy):
+    """Apply a sequence of state changes to the status labels, as update_display does"""
+    states = list(STATUS_STATES)
+    for i in range(updates):
+        label = labels[i % len(labels)]
+        state = states[i % len(states)]
+        if legacy:
+            label.setStyleSheet(legacy_status_style(state))
+        else:
+            set_style_property(label, 'status', state)
+        label.ensurePolished()
+
+
+def time_it(function, repeat):
+    """Best wall time of several runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run_benchmark(cards, buttons, updates, repeat):
+    app = QApplication.instance() or QApplication([])
+    temp_dir = tempfile.mkdtemp(prefix='theme_bench_')
+    db = DatabaseManager(os.path.join(temp_dir, 'bench.db'))
+    try:
+        db.initialize_database()
+
+        labels = []
+        for _ in range(3):
+            label = QLabel('Status')
+            label.setObjectName('statusLabel')
+            labels.append(label)
+
+        results = []
+        for legacy in (True, False):
+            # The old widgets never relied on an application stylesheet
+            if legacy:
+                app.setStyleSheet('')
+            else:
+                apply_theme(app)
+            for label in labels:
+                label.setStyleSheet('')
+                label.setProperty('status', None)
+            results.append((
+                time_it(lambda: build_cards(cards, legacy), repeat),
+                time_it(lambda: build_buttons(buttons, legacy), repeat),
+                time_it(lambda: cycle_status(labels, updates, legacy), repeat),
+            ))
+
+        screens = []
+        for name, screen_class in [('Home screen', HomeScreen), ('Settings screen', SettingsMainScreen)]:
+            def build():
+                screen = screen_class(db, BenchmarkWindow())
+                screen.resize(1280, 720)
+                screen.grab()
+            screens.append((name, time_it(build, repeat)))
+
+        (legacy_cards, legacy_buttons, legacy_status), (theme_cards, theme_buttons, theme_status) = results
+        print(f"Best of {repeat} runs, per-widget stylesheets vs application stylesheet:\n")
+        print(f"  {cards} plant cards:        {legacy_cards:8.2f} ms -> {theme_cards:8.2f} ms  "
+              f"({legacy_cards / theme_cards:.1f}x)")
+        print(f"  {buttons} buttons:           {legacy_buttons:8.2f} ms -> {theme_buttons:8.2f} ms  "
+              f"({legacy_buttons / theme_buttons:.1f}x)")
+        print(f"  {updates} status updates:   {legacy_status:8.2f} ms -> {theme_status:8.2f} ms  "
+              f"({legacy_status / theme_status:.1f}x)")
+        print("\nScreen build with the application stylesheet:")
+        for name, ms in screens:
+            print(f"  {name + ':':24} {ms:8.2f} ms")
+    finally:
+        db.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Application stylesheet benchmark')
+    parser.add_argument('--cards', type=int, default=12, help='Plant cards per page')
+    parser.add_argument('--buttons', type=int, default=40, help='Buttons to build')
+    parser.add_argument('--updates', type=int, default=300, help='Status label state changes')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per approach')
+    args = parser.parse_args()
+
+    run_benchmark(args.cards, args.buttons, args.updates, args.repeat)
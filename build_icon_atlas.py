@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Build pre-scaled icon atlases for QtIconManager
+Scales every icons/*.png once per icon size the screens use and packs the
+results into one image per size, so the app decodes a handful of small
+atlases at startup instead of a 618px PNG for every icon it shows.
+
+Run it again after adding or changing icons:
+
+    python build_icon_atlas.py
+    python build_icon_atlas.py --sizes 24 32
+"""
+
+import argparse
+import json
+import math
+import os
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtCore import Qt, QSize
+from PySide6.QtGui import QGuiApplication, QImage, QPainter
+
+from qt_screens.icon_manager import ICONS_DIR, ATLAS_DIR, ATLAS_MANIFEST, ATLAS_SIZES
+
+
+def pack_atlas(images, size):
+    """
+    Pack square-ish icons into a grid image
+
+    Args:
+        images: {icon name: QImage} already scaled to fit size x size
+        size: Cell size in pixels
+
+    Returns:
+        tuple: (atlas QImage, {icon name: [x, y, width, height]})
+    """
+    columns = max(1, math.ceil(math.sqrt(len(images))))
+    rows = max(1, math.ceil(len(images) / columns))
+    atlas = QImage(columns * size, rows * size, QImage.Format_ARGB32_Premultiplied)
+    atlas.fill(Qt.transparent)
+
+    rects = {}
+    painter = QPainter(atlas)
+    for index, (name, image) in enumerate(sorted(images.items())):
+        x = (index % columns) * size
+        y = (index // columns) * size
+        painter.drawImage(x, y, image)
+        rects[name] = [x, y, image.width(), image.height()]
+    painter.end()
+    return atlas, rects
+
+
+def build_atlases(sizes=ATLAS_SIZES, icons_dir=ICONS_DIR, atlas_dir=ATLAS_DIR):
+    """Scale and pack every icon for each size, then write the atlases and manifest"""
+    sources = {}
+    for path in sorted(icons_dir.glob('*.png')):
+        image = QImage(str(path))
+        if image.isNull():
+            print(f"Skipping unreadable icon: {path.name}")
+            continue
+        sources[path.stem] = image
+    print(f"Packing {len(sources)} icons at sizes {', '.join(str(s) for s in sizes)}")
+
+    atlas_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {'atlases': {}}
+    for size in sizes:
+        # Same scaling QtIconManager used to do per icon at runtime
+        scaled = {name: image.scaled(QSize(size, size), Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                  for name, image in sources.items()}
+        atlas, rects = pack_atlas(scaled, size)
+        file_name = f"icons_{size}.png"
+        if not atlas.save(str(atlas_dir / file_name)):
+            raise OSError(f"Could not write {atlas_dir / file_name}")
+        manifest['atlases'][str(size)] = {'file': file_name, 'icons': rects}
+        print(f"  {file_name}: {atlas.width()}x{atlas.height()}")
+
+    with open(atlas_dir / ATLAS_MANIFEST.name, 'w') as f:
+        json.dump(manifest, f, sort_keys=True)
+    print(f"Wrote {atlas_dir / ATLAS_MANIFEST.name}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build pre-scaled icon atlases')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(ATLAS_SIZES),
+                        help='Icon sizes to build atlases for')
+    args = parser.parse_args()
+
+    app = QGuiApplication([])
+    build_atlases(args.sizes)
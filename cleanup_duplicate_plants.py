@@ -1,11 +1,31 @@
 #!/usr/bin/env python3
 """
 Clean up duplicate plants in the database
-Keeps the first entry of each unique plant name and removes duplicates
+Keeps the first entry of each unique plant (normalized name + scientific name),
+removes the rest in a single set-based DELETE and adds a unique index so
+duplicates cannot be inserted again
 """
 
 import sqlite3
-from database.db_manager import DatabaseManager
+import time
+from database.db_manager import DatabaseManager, PLANT_IDENTITY_SQL
+
+# Online backup target and the number of pages copied per backup step
+BACKUP_PATH = "tortoise_care_backup.db"
+BACKUP_PAGES_PER_STEP = 256
+
+
+def backup_database(conn, backup_path=BACKUP_PATH):
+    """Incrementally copy the live database to backup_path using the SQLite online backup API"""
+    def progress(status, remaining, total):
+        print(f"  Backed up {total - remaining} of {total} pages...")
+
+    backup_conn = sqlite3.connect(backup_path)
+    try:
+        conn.backup(backup_conn, pages=BACKUP_PAGES_PER_STEP, progress=progress)
+    finally:
+        backup_conn.close()
+
 
 def cleanup_duplicate_plants():
     """Remove duplicate plants, keeping only one copy of each unique plant"""
@@ -22,34 +42,41 @@ def cleanup_duplicate_plants():
         initial_count = cursor.fetchone()[0]
         print(f"Initial plant count: {initial_count}")
         
-        # Backup the original data (optional but recommended)
-        print("Creating backup of plants table...")
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS plants_backup AS 
-            SELECT * FROM plants
+        # Backup the whole database in small page steps so other connections
+        # are not locked out for the duration of the copy
+        print(f"Backing up database to {BACKUP_PATH}...")
+        start = time.perf_counter()
+        backup_database(conn)
+        print(f"  Backup finished in {time.perf_counter() - start:.2f}s")
+
+        # Map every duplicate row to the row we keep (lowest ID per identity)
+        cursor.execute('DROP TABLE IF EXISTS temp.plant_duplicates')
+        cursor.execute(f'''
+            CREATE TEMP TABLE plant_duplicates AS
+            SELECT id AS duplicate_id, keep_id FROM (
+                SELECT id, MIN(id) OVER (PARTITION BY {PLANT_IDENTITY_SQL}) AS keep_id
+                FROM plants
+            )
+            WHERE id != keep_id
         ''')
         
-        # Get unique plants (keep the one with lowest ID for each name)
+        cursor.execute('SELECT COUNT(DISTINCT keep_id) FROM temp.plant_duplicates')
+        print(f"Found {cursor.fetchone()[0]} plants with duplicates")
+
+        # Point feeding history at the surviving rows before deleting
         cursor.execute('''
-            SELECT name, MIN(id) as keep_id, COUNT(*) as duplicate_count
-            FROM plants 
-            GROUP BY name
-            HAVING COUNT(*) > 1
+            UPDATE feeding_items
+            SET plant_id = (SELECT keep_id FROM temp.plant_duplicates WHERE duplicate_id = feeding_items.plant_id)
+            WHERE plant_id IN (SELECT duplicate_id FROM temp.plant_duplicates)
         ''')
         
-        duplicates = cursor.fetchall()
-        print(f"Found {len(duplicates)} plants with duplicates")
+        # Delete all duplicates in one statement
+        cursor.execute('DELETE FROM plants WHERE id IN (SELECT duplicate_id FROM temp.plant_duplicates)')
+        total_deleted = cursor.rowcount
+        cursor.execute('DROP TABLE temp.plant_duplicates')
         
-        # Delete duplicates (keep only the entry with minimum ID for each name)
-        total_deleted = 0
-        for name, keep_id, dup_count in duplicates:
-            cursor.execute('''
-                DELETE FROM plants 
-                WHERE name = ? AND id > ?
-            ''', (name, keep_id))
-            deleted = cursor.rowcount
-            total_deleted += deleted
-            print(f"  {name}: kept ID {keep_id}, deleted {deleted} duplicates")
+        # Stop duplicates from coming back
+        db.create_plant_unique_index()
         
         # Get final count
         cursor.execute('SELECT COUNT(*) FROM plants')
@@ -79,7 +106,7 @@ def cleanup_duplicate_plants():
         return False
     
     finally:
-        conn.close()
+        db.close()
 
 def verify_cleanup():
     """Verify the cleanup was successful"""
@@ -91,10 +118,10 @@ def verify_cleanup():
     
     try:
         # Check for any remaining duplicates
-        cursor.execute('''
-            SELECT name, COUNT(*) as count 
+        cursor.execute(f'''
+            SELECT MIN(name), COUNT(*) as count
             FROM plants 
-            GROUP BY name 
+            GROUP BY {PLANT_IDENTITY_SQL}
             HAVING count > 1
         ''')
         
@@ -117,13 +144,13 @@ def verify_cleanup():
         print(f"\nFinal database stats:")
         print(f"  Total plants: {total}")
         for safety, count in safety_stats:
-            print(f"  {safety.title()}: {count}")
+            print(f"  {(safety or 'unknown').title()}: {count}")
             
     except Exception as e:
         print(f"ERROR during verification: {e}")
     
     finally:
-        conn.close()
+        db.close()
 
 if __name__ == "__main__":
     print("Plant Database Cleanup Tool")
@@ -4,9 +4,18 @@ Create sample placeholder photos for testing the photo display system
 """
 
 import os
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from database.db_manager import DatabaseManager
 
+# Bump when the placeholder drawing changes so every photo is regenerated
+TEMPLATE_VERSION = 1
+
+# Records the inputs each placeholder was rendered from
+MANIFEST_NAME = "placeholder_manifest.json"
+
 try:
     from PIL import Image, ImageDraw, ImageFont
     PIL_AVAILABLE = True
@@ -93,7 +102,29 @@ def create_placeholder_photo(plant_name, safety_level, filename):
     image.save(filename, "PNG")
     print(f"Created placeholder photo: {filename}")
 
-def create_sample_photos_for_database():
+def placeholder_filename(photos_dir, plant_name, plant_id=None):
+    """Get the placeholder path for a plant name (with the plant ID if the name alone is taken)"""
+    safe_name = "".join(c for c in plant_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+    safe_name = safe_name.replace(' ', '_').lower()
+    if plant_id is not None:
+        safe_name = f"{safe_name}_{plant_id}"
+    return photos_dir / f"{safe_name}_placeholder.png"
+
+def placeholder_signature(plant_name, safety_level):
+    """Hash of everything that affects a placeholder's pixels"""
+    key = f"{TEMPLATE_VERSION}|{plant_name}|{safety_level}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+def render_placeholder_job(job):
+    """Process pool entry point - render one placeholder"""
+    plant_name, safety_level, filename = job
+    try:
+        create_placeholder_photo(plant_name, safety_level, filename)
+        return filename, None
+    except Exception as e:
+        return filename, str(e)
+
+def create_sample_photos_for_database(max_workers=None):
     """Create placeholder photos for all plants in the database"""
     
     if not PIL_AVAILABLE:
@@ -115,49 +146,65 @@ def create_sample_photos_for_database():
     photos_dir = Path("plant_photos")
     photos_dir.mkdir(exist_ok=True)
     
+    manifest_path = photos_dir / MANIFEST_NAME
+    manifest = {}
+    if manifest_path.exists():
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    
     # Get all plants from database
     db = DatabaseManager()
     conn = db.get_connection()
     cursor = conn.cursor()
     
-    cursor.execute('SELECT id, name, safety_level FROM plants ORDER BY name')
+    cursor.execute('SELECT id, name, safety_level FROM plants ORDER BY name, id')
     plants = cursor.fetchall()
     
-    created_count = 0
-    
+    # Work out which placeholders are missing or stale
+    jobs = {}
+    plant_paths = {}
     for plant_id, name, safety_level in plants:
-        # Create safe filename
-        safe_name = "".join(c for c in name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-        safe_name = safe_name.replace(' ', '_').lower()
-        
-        filename = photos_dir / f"{safe_name}_placeholder.png"
+        filename = placeholder_filename(photos_dir, name)
+        relative_path = str(filename).replace('\\', '/')
+        if relative_path in plant_paths:
+            # Another plant's name maps to the same file
+            filename = placeholder_filename(photos_dir, name, plant_id)
+            relative_path = str(filename).replace('\\', '/')
+        plant_paths[relative_path] = plant_id
         
-        # Skip if already exists
-        if filename.exists():
-            print(f"Photo already exists for {name}")
+        signature = placeholder_signature(name, safety_level)
+        if filename.exists() and manifest.get(relative_path) == signature:
             continue
-        
-        try:
-            create_placeholder_photo(name, safety_level, str(filename))
-            
-            # Update database with photo path
-            relative_path = str(filename).replace('\\', '/')
-            cursor.execute('''
-                UPDATE plants 
-                SET main_photo_path = ? 
-                WHERE id = ?
-            ''', (relative_path, plant_id))
-            
-            created_count += 1
-            
-        except Exception as e:
-            print(f"Error creating photo for {name}: {e}")
-    
-    # Commit database changes
-    conn.commit()
+        jobs[relative_path] = (name, safety_level, str(filename))
+        manifest[relative_path] = signature
+    
+    print(f"{len(plants)} plants, {len(jobs)} placeholders to render")
+    
+    # Render in parallel - each job is independent CPU-bound Pillow work
+    failed = set()
+    if jobs:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for filename, error in executor.map(render_placeholder_job, jobs.values(), chunksize=16):
+                if error:
+                    print(f"Error creating photo {filename}: {error}")
+                    failed.add(str(filename).replace('\\', '/'))
+    
+    for relative_path in failed:
+        manifest.pop(relative_path, None)
+    
+    # Point the plants whose placeholders were written at them, in one transaction
+    with conn:
+        cursor.executemany('''
+            UPDATE plants 
+            SET main_photo_path = ? 
+            WHERE id = ?
+        ''', [(path, plant_paths[path]) for path in jobs if path not in failed])
     conn.close()
     
-    print(f"\nCreated {created_count} placeholder photos")
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    
+    print(f"\nCreated {len(jobs) - len(failed)} placeholder photos")
     print(f"Photos saved in: {photos_dir}")
     print("Database updated with photo paths")
 
@@ -1,16 +1,35 @@
 import sqlite3
 import os
-from datetime import datetime, date
-from typing import Optional, List, Dict, Any
+import time
+from datetime import datetime, date, timedelta
+from typing import Optional, List, Dict, Any, Tuple
+
+from utils.recurrence import RecurrenceRule, DEFAULT_CATCH_UP
+from utils.feeding import classify_nutrition, session_totals, empty_totals, diet_grams, TOTAL_FIELDS, DIET_FIELDS
+from utils.instrumentation import instrumentation, InstrumentedConnection
+from utils.query_stats import query_stats, explain_query_plan
+
+# Normalized identity of a plant: case/whitespace-insensitive name plus scientific name.
+# Used by the unique index on plants and by the duplicate cleanup tool.
+PLANT_IDENTITY_SQL = "lower(trim(name)), lower(trim(coalesce(scientific_name, '')))"
+
+# Tables whose writes bump a counter in table_versions, so caches can tell when to reload
+VERSIONED_TABLES = ('tortoises', 'photo_derivatives', 'growth_records', 'feeding_records',
+                    'care_reminders', 'health_records', 'settings', 'plants')
 
 class DatabaseManager:
     def __init__(self, db_path: str = "tortoise_care.db"):
         self.db_path = db_path
         self.connection = None
+        # plant id -> safety and nutrition, reloaded when the plants table changes
+        self.plant_safety_map = None
+        self.plant_safety_version = None
         
     def get_connection(self):
         if self.connection is None:
-            self.connection = sqlite3.connect(self.db_path)
+            # Statements are only timed on connections opened while instrumentation is on
+            factory = InstrumentedConnection if instrumentation.enabled else sqlite3.Connection
+            self.connection = sqlite3.connect(self.db_path, factory=factory)
             self.connection.row_factory = sqlite3.Row
         return self.connection
     
@@ -18,7 +37,46 @@ class DatabaseManager:
         if self.connection:
             self.connection.close()
             self.connection = None
-    
+
+    def execute(self, sql: str, params=(), fetch: Optional[str] = 'all', commit: bool = False):
+        """
+        Run a statement with its latency recorded under the query's fingerprint
+
+        Queries slower than query_stats.slow_query_ms are logged with their
+        EXPLAIN QUERY PLAN (see utils/query_stats.py).
+
+        Args:
+            sql: Statement text
+            params: Statement parameters
+            fetch: 'all' for a list of rows, 'one' for a single row (or None),
+                   None for the cursor (lastrowid, rowcount)
+            commit: Commit after the statement
+
+        Returns:
+            List[sqlite3.Row], sqlite3.Row or sqlite3.Cursor depending on fetch
+        """
+        conn = self.get_connection()
+        start = time.perf_counter()
+        cursor = conn.execute(sql, params)
+        if fetch == 'all':
+            result = cursor.fetchall()
+        elif fetch == 'one':
+            result = cursor.fetchone()
+        else:
+            result = cursor
+        if commit:
+            conn.commit()
+        duration = time.perf_counter() - start
+
+        if query_stats.record(sql, duration):
+            plan = explain_query_plan(conn, sql, params) if query_stats.should_explain(sql) else None
+            query_stats.log_slow(sql, duration, plan)
+        return result
+
+    def get_query_stats(self) -> List[Dict[str, Any]]:
+        """Latency percentiles for each query fingerprint run through execute()"""
+        return query_stats.summary()
+
     def initialize_database(self):
         conn = self.get_connection()
         cursor = conn.cursor()
@@ -82,7 +140,13 @@ class DatabaseManager:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
+
+        # Add main_photo_path column if it doesn't exist (the plant browser reads it)
+        try:
+            cursor.execute('ALTER TABLE plants ADD COLUMN main_photo_path TEXT')
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+
         # Feeding records
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS feeding_records (
@@ -113,6 +177,63 @@ class DatabaseManager:
             )
         ''')
         
+        # Running nutrition totals per tortoise, updated with each feeding session
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'feeding_nutrition_totals'")
+        new_totals_table = cursor.fetchone() is None
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS feeding_nutrition_totals (
+                tortoise_id INTEGER PRIMARY KEY,
+                sessions INTEGER NOT NULL DEFAULT 0,
+                total_weight REAL NOT NULL DEFAULT 0,
+                calcium_rich REAL NOT NULL DEFAULT 0,
+                oxalate REAL NOT NULL DEFAULT 0,
+                goitrogen REAL NOT NULL DEFAULT 0,
+                caution REAL NOT NULL DEFAULT 0,
+                toxic REAL NOT NULL DEFAULT 0,
+                supplements REAL NOT NULL DEFAULT 0,
+                last_feeding TIMESTAMP,
+                FOREIGN KEY (tortoise_id) REFERENCES tortoises(id)
+            )
+        ''')
+        
+        # Diet aggregates (see utils/diet_analytics.py): grams per tortoise, day and plant
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS diet_daily (
+                tortoise_id INTEGER NOT NULL,
+                day DATE NOT NULL,
+                plant_id INTEGER NOT NULL,
+                safety_level TEXT,
+                grams REAL NOT NULL DEFAULT 0,
+                servings INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (tortoise_id, day, plant_id)
+            ) WITHOUT ROWID
+        ''')
+        # ...grams per DIET_FIELDS fed up to and including each feeding day
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS diet_cumulative (
+                tortoise_id INTEGER NOT NULL,
+                day DATE NOT NULL,
+                {', '.join(f'{field} REAL NOT NULL DEFAULT 0' for field in DIET_FIELDS)},
+                PRIMARY KEY (tortoise_id, day)
+            ) WITHOUT ROWID
+        ''')
+        # ...the last day each plant was fed to each tortoise
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS diet_plant_last (
+                tortoise_id INTEGER NOT NULL,
+                plant_id INTEGER NOT NULL,
+                last_day DATE NOT NULL,
+                PRIMARY KEY (tortoise_id, plant_id)
+            ) WITHOUT ROWID
+        ''')
+        # ...and the plant_classification version they were counted with
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS diet_aggregate_state (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                classification_version INTEGER NOT NULL
+            )
+        ''')
+        
         # Health records
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS health_records (
@@ -189,6 +310,42 @@ class DatabaseManager:
             )
         ''')
         
+        # Recurrence anchor and catch-up policy (see utils/recurrence.py)
+        try:
+            cursor.execute('ALTER TABLE care_reminders ADD COLUMN anchor_date TIMESTAMP')
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+        # Reminders from before the column anchor on their current due date, so
+        # month-end reminders don't drift (Jan 31 -> Feb 28 -> Mar 28)
+        cursor.execute('UPDATE care_reminders SET anchor_date = next_due_date WHERE anchor_date IS NULL')
+        try:
+            cursor.execute("ALTER TABLE care_reminders ADD COLUMN catch_up TEXT DEFAULT 'skip'")
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+        
+        # Resized derivatives of stored photos (see utils/photo_pipeline.py)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS photo_derivatives (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source_path TEXT NOT NULL,
+                variant TEXT NOT NULL,
+                format TEXT NOT NULL,
+                path TEXT NOT NULL,
+                width INTEGER,
+                height INTEGER,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (source_path, variant, format)
+            )
+        ''')
+        
+        # Change counters maintained by triggers on VERSIONED_TABLES
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS table_versions (
+                table_name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        
         # Settings for Adafruit.IO and other configurations
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS settings (
@@ -199,6 +356,7 @@ class DatabaseManager:
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
+        self.create_version_triggers()
         
         # Insert default settings
         default_settings = [
@@ -316,9 +474,159 @@ class DatabaseManager:
         if cursor.fetchone()[0] == 0:
             cursor.execute('INSERT INTO users (name, email) VALUES (?, ?)', ('Default User', ''))
         
+        self.create_health_record_indexes()
+        self.create_feeding_record_indexes()
+        self.create_care_reminder_indexes()
+        
+        # Start the running totals and diet aggregates from any feedings recorded before they existed
+        if new_totals_table:
+            self.rebuild_nutrition_totals()
+        self.ensure_diet_aggregates()
+        
+        # Prevent duplicate plants (existing duplicates must be removed first)
+        try:
+            self.create_plant_unique_index()
+        except sqlite3.IntegrityError:
+            print("Warning: duplicate plants found - run cleanup_duplicate_plants.py to enable the unique index")
+        
         conn.commit()
         print("Database initialized successfully!")
     
+    def create_plant_unique_index(self):
+        """Create the unique index on normalized plant identity"""
+        conn = self.get_connection()
+        conn.execute(f'''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_plants_identity
+            ON plants ({PLANT_IDENTITY_SQL})
+        ''')
+    
+    def create_health_record_indexes(self):
+        """Create the indexes used by the health record filters"""
+        conn = self.get_connection()
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_health_records_date
+            ON health_records (record_date DESC, id DESC)
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_health_records_resolved_date
+            ON health_records (resolved, record_date DESC, id DESC)
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_health_records_priority_date
+            ON health_records (priority, resolved, record_date DESC, id DESC)
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_health_records_tortoise_date
+            ON health_records (tortoise_id, record_date DESC, id DESC)
+        ''')
+        # Covers every column the health summary aggregate reads
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_health_records_summary
+            ON health_records (tortoise_id, resolved, priority, record_date)
+        ''')
+    
+    def create_feeding_record_indexes(self):
+        """Create the indexes used to find the latest feeding per tortoise and a session's items"""
+        conn = self.get_connection()
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_feeding_records_tortoise_date
+            ON feeding_records (tortoise_id, feeding_date)
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_feeding_items_record
+            ON feeding_items (feeding_record_id)
+        ''')
+        # Covers diet windows across every tortoise at once
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_diet_daily_day
+            ON diet_daily (day, tortoise_id, plant_id, safety_level, grams)
+        ''')
+        # Diet variety: plants last fed inside a window, per tortoise
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_diet_plant_last_day
+            ON diet_plant_last (tortoise_id, last_day)
+        ''')
+    
+    def create_care_reminder_indexes(self):
+        """Create the indexes used by the reminder filters and scheduler"""
+        conn = self.get_connection()
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_care_reminders_active_due
+            ON care_reminders (is_active, next_due_date)
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_care_reminders_completed
+            ON care_reminders (last_completed)
+        ''')
+    
+    def create_version_triggers(self):
+        """Create triggers that bump table_versions on every write to VERSIONED_TABLES"""
+        conn = self.get_connection()
+        for table in VERSIONED_TABLES:
+            for event in ('INSERT', 'UPDATE', 'DELETE'):
+                conn.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS trg_{table}_version_{event.lower()}
+                    AFTER {event} ON {table}
+                    BEGIN
+                        INSERT INTO table_versions (table_name, version) VALUES ('{table}', 1)
+                        ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+                    END
+                ''')
+        # Changes to how existing plants are classified, which the diet aggregates
+        # depend on (new plants and photo updates don't count)
+        classification_bump = '''
+            INSERT INTO table_versions (table_name, version) VALUES ('plant_classification', 1)
+            ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+        '''
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_plant_classification_update
+            AFTER UPDATE OF safety_level, nutrition_notes ON plants
+            WHEN OLD.safety_level IS NOT NEW.safety_level OR OLD.nutrition_notes IS NOT NEW.nutrition_notes
+            BEGIN {classification_bump} END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_plant_classification_delete
+            AFTER DELETE ON plants
+            BEGIN {classification_bump} END
+        ''')
+        # Changes to the names and safety levels the plant lookup index holds
+        # (photo and description updates don't count)
+        names_bump = '''
+            INSERT INTO table_versions (table_name, version) VALUES ('plant_names', 1)
+            ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+        '''
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_plant_names_update
+            AFTER UPDATE OF name, scientific_name, safety_level ON plants
+            WHEN OLD.name IS NOT NEW.name OR OLD.scientific_name IS NOT NEW.scientific_name
+                 OR OLD.safety_level IS NOT NEW.safety_level
+            BEGIN {names_bump} END
+        ''')
+        for event in ('INSERT', 'DELETE'):
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_plant_names_{event.lower()}
+                AFTER {event} ON plants
+                BEGIN {names_bump} END
+            ''')
+    
+    def get_table_versions(self, tables: List[str]) -> Dict[str, int]:
+        """Get the change counters for several tables in one query"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        placeholders = ','.join('?' * len(tables))
+        cursor.execute(f'SELECT table_name, version FROM table_versions WHERE table_name IN ({placeholders})', tables)
+        versions = {table: 0 for table in tables}
+        versions.update({row[0]: row[1] for row in cursor.fetchall()})
+        return versions
+    
+    def get_table_version(self, table: str) -> int:
+        """Get the change counter for a table (0 if it has never been written)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT version FROM table_versions WHERE table_name = ?', (table,))
+        row = cursor.fetchone()
+        return row[0] if row else 0
+    
     def get_setting(self, key: str) -> Optional[str]:
         conn = self.get_connection()
         cursor = conn.cursor()
@@ -494,11 +802,25 @@ class DatabaseManager:
         return cursor.lastrowid
     
     def get_health_records(self, tortoise_id: Optional[int] = None, record_type: Optional[str] = None,
-                          resolved: Optional[bool] = None) -> List[Dict]:
-        """Get health records with optional filtering"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+                          resolved: Optional[bool] = None, priority: Optional[str] = None,
+                          since: Optional[str] = None, until: Optional[str] = None,
+                          limit: Optional[int] = None, before: Optional[Tuple[str, int]] = None) -> List[Dict]:
+        """
+        Get health records with optional filtering, newest first
         
+        Args:
+            tortoise_id: Only records for this tortoise
+            record_type: Only records of this type
+            resolved: Only resolved (True) or unresolved (False) records
+            priority: Only records with this priority
+            since: Only records on or after this 'YYYY-MM-DD[ HH:MM:SS]' timestamp
+            until: Only records before this timestamp
+            limit: Maximum number of records to return
+            before: Cursor (record_date, id) of the last record of the previous page
+            
+        Returns:
+            List[Dict]: Records ordered by record_date then id, descending
+        """
         query = '''
             SELECT hr.*, t.name as tortoise_name, u.name as user_name
             FROM health_records hr
@@ -517,11 +839,26 @@ class DatabaseManager:
         if resolved is not None:
             query += ' AND hr.resolved = ?'
             params.append(resolved)
+        if priority:
+            query += ' AND hr.priority = ?'
+            params.append(priority)
+        if since:
+            query += ' AND hr.record_date >= ?'
+            params.append(since)
+        if until:
+            query += ' AND hr.record_date < ?'
+            params.append(until)
+        if before:
+            # Keyset paging: continue after the last record already shown
+            query += ' AND (hr.record_date, hr.id) < (?, ?)'
+            params.extend(before)
             
-        query += ' ORDER BY hr.record_date DESC'
+        query += ' ORDER BY hr.record_date DESC, hr.id DESC'
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
         
-        cursor.execute(query, params)
-        return [dict(row) for row in cursor.fetchall()]
+        return [dict(row) for row in self.execute(query, params)]
     
     def update_health_record(self, record_id: int, **kwargs) -> bool:
         """Update health record fields"""
@@ -572,34 +909,709 @@ class DatabaseManager:
     
     def get_health_summary(self, tortoise_id: int) -> Dict:
         """Get health summary statistics for a tortoise"""
+        return self.get_health_summaries([tortoise_id])[tortoise_id]
+    
+    def get_health_summaries(self, tortoise_ids: Optional[List[int]] = None) -> Dict[int, Dict]:
+        """
+        Get health summary statistics for several tortoises in one query
+        
+        Uses the health_summary counter table when it is enabled. The recent
+        count depends on the current time, so it is always counted from the
+        (tortoise_id, record_date) index.
+        
+        Args:
+            tortoise_ids: Tortoises to summarize (all tortoises if None)
+            
+        Returns:
+            Dict[int, Dict]: Summary per tortoise ID, with zero counts for tortoises without records
+        """
+        if tortoise_ids is None:
+            tortoise_ids = [row[0] for row in self.execute('SELECT id FROM tortoises')]
+        summaries = {tortoise_id: {'total_records': 0, 'unresolved_issues': 0,
+                                   'recent_records': 0, 'urgent_issues': 0}
+                     for tortoise_id in tortoise_ids}
+        if not tortoise_ids:
+            return summaries
+        placeholders = ','.join('?' * len(tortoise_ids))
+        
+        # Each count only reads that tortoise's slice of a covering index,
+        # never the health_records rows themselves
+        recent_count = '''(SELECT COUNT(*) FROM health_records hr
+                           WHERE hr.tortoise_id = t.id
+                           AND hr.record_date > datetime('now', '-30 days')) as recent_records'''
+        if self.health_summary_counters_enabled():
+            rows = self.execute(f'''
+                SELECT t.id as tortoise_id, s.total_records, s.unresolved_issues, s.urgent_issues,
+                       {recent_count}
+                FROM tortoises t
+                LEFT JOIN health_summary s ON s.tortoise_id = t.id
+                WHERE t.id IN ({placeholders})
+            ''', tortoise_ids)
+        else:
+            rows = self.execute(f'''
+                SELECT t.id as tortoise_id,
+                       (SELECT COUNT(*) FROM health_records hr
+                        WHERE hr.tortoise_id = t.id) as total_records,
+                       (SELECT COUNT(*) FROM health_records hr
+                        WHERE hr.tortoise_id = t.id AND hr.resolved = 0) as unresolved_issues,
+                       (SELECT COUNT(*) FROM health_records hr
+                        WHERE hr.tortoise_id = t.id AND hr.resolved = 0 AND hr.priority = 'urgent') as urgent_issues,
+                       {recent_count}
+                FROM tortoises t
+                WHERE t.id IN ({placeholders})
+            ''', tortoise_ids)
+        
+        for row in rows:
+            summaries[row['tortoise_id']] = {
+                'total_records': row['total_records'] or 0,
+                'unresolved_issues': row['unresolved_issues'] or 0,
+                'recent_records': row['recent_records'] or 0,
+                'urgent_issues': row['urgent_issues'] or 0
+            }
+        return summaries
+    
+    def health_summary_counters_enabled(self) -> bool:
+        """Check whether the trigger-maintained health_summary table exists"""
         conn = self.get_connection()
         cursor = conn.cursor()
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'health_summary'")
+        return cursor.fetchone() is not None
+    
+    def enable_health_summary_counters(self):
+        """Create the health_summary counter table, fill it and keep it up to date with triggers"""
+        conn = self.get_connection()
+        with conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS health_summary (
+                    tortoise_id INTEGER PRIMARY KEY,
+                    total_records INTEGER NOT NULL DEFAULT 0,
+                    unresolved_issues INTEGER NOT NULL DEFAULT 0,
+                    urgent_issues INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+            conn.execute('DELETE FROM health_summary')
+            conn.execute('''
+                INSERT INTO health_summary (tortoise_id, total_records, unresolved_issues, urgent_issues)
+                SELECT tortoise_id, COUNT(*), SUM(resolved = 0), SUM(priority = 'urgent' AND resolved = 0)
+                FROM health_records
+                GROUP BY tortoise_id
+            ''')
+            
+            add_new = '''
+                INSERT INTO health_summary (tortoise_id, total_records, unresolved_issues, urgent_issues)
+                VALUES (NEW.tortoise_id, 1, NEW.resolved = 0, NEW.priority = 'urgent' AND NEW.resolved = 0)
+                ON CONFLICT(tortoise_id) DO UPDATE SET
+                    total_records = total_records + 1,
+                    unresolved_issues = unresolved_issues + excluded.unresolved_issues,
+                    urgent_issues = urgent_issues + excluded.urgent_issues;
+            '''
+            remove_old = '''
+                UPDATE health_summary SET
+                    total_records = total_records - 1,
+                    unresolved_issues = unresolved_issues - (OLD.resolved = 0),
+                    urgent_issues = urgent_issues - (OLD.priority = 'urgent' AND OLD.resolved = 0)
+                WHERE tortoise_id = OLD.tortoise_id;
+            '''
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_health_summary_insert
+                AFTER INSERT ON health_records
+                BEGIN {add_new} END
+            ''')
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_health_summary_delete
+                AFTER DELETE ON health_records
+                BEGIN {remove_old} END
+            ''')
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_health_summary_update
+                AFTER UPDATE OF tortoise_id, priority, resolved ON health_records
+                BEGIN {remove_old} {add_new} END
+            ''')
+    
+    def disable_health_summary_counters(self):
+        """Drop the health_summary counter table and its triggers"""
+        conn = self.get_connection()
+        with conn:
+            for event in ('insert', 'delete', 'update'):
+                conn.execute(f'DROP TRIGGER IF EXISTS trg_health_summary_{event}')
+            conn.execute('DROP TABLE IF EXISTS health_summary')
+    
+    # Care Reminder Methods
+    def add_care_reminder(self, title: str, description: str = '', assigned_user_id: Optional[int] = None,
+                          tortoise_id: Optional[int] = None, reminder_type: str = 'once',
+                          frequency_days: int = 0, next_due_date: Optional[str] = None,
+                          priority: str = 'medium', catch_up: str = DEFAULT_CATCH_UP) -> int:
+        """Add a new care reminder (its first due date is kept as the recurrence anchor)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO care_reminders (title, description, assigned_user_id, tortoise_id, 
+                                      reminder_type, frequency_days, next_due_date, priority,
+                                      anchor_date, catch_up) 
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (title, description, assigned_user_id, tortoise_id, reminder_type, 
+              frequency_days, next_due_date, priority, next_due_date, catch_up))
+        conn.commit()
+        return cursor.lastrowid
+    
+    def get_care_reminders(self, filter_type: str = 'all', today: Optional[str] = None,
+                           limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        """
+        Get care reminders for one of the reminder screen filters
+        
+        Args:
+            filter_type: 'due', 'overdue', 'upcoming', 'completed' or 'all'
+            today: Current date as 'YYYY-MM-DD' (defaults to today)
+            limit: Maximum number of reminders to return
+            offset: Number of reminders to skip
+            
+        Returns:
+            List[Dict]: Reminders with tortoise_name and user_name
+        """
+        today_date = date.fromisoformat(today) if today else date.today()
+        tomorrow = (today_date + timedelta(days=1)).isoformat()
+        
+        query = '''
+            SELECT cr.*, t.name as tortoise_name, u.name as user_name
+            FROM care_reminders cr
+            LEFT JOIN tortoises t ON cr.tortoise_id = t.id
+            LEFT JOIN users u ON cr.assigned_user_id = u.id
+        '''
+        params = []
+        
+        # Compare the raw column against day boundaries so the (is_active, next_due_date) index applies
+        if filter_type == 'due':
+            query += ' WHERE cr.is_active = 1 AND cr.next_due_date < ? ORDER BY cr.next_due_date ASC'
+            params.append(tomorrow)
+        elif filter_type == 'overdue':
+            query += ' WHERE cr.is_active = 1 AND cr.next_due_date < ? ORDER BY cr.next_due_date ASC'
+            params.append(today_date.isoformat())
+        elif filter_type == 'upcoming':
+            query += ' WHERE cr.is_active = 1 AND cr.next_due_date >= ? ORDER BY cr.next_due_date ASC'
+            params.append(tomorrow)
+        elif filter_type == 'completed':
+            query += ' WHERE cr.last_completed IS NOT NULL ORDER BY cr.last_completed DESC'
+        else:  # all
+            query += ' WHERE cr.is_active = 1 ORDER BY cr.next_due_date ASC'
+        
+        if limit is not None:
+            query += ' LIMIT ? OFFSET ?'
+            params.extend([limit, offset])
+        
+        return [dict(row) for row in self.execute(query, params)]
+    
+    def get_active_reminder_due_dates(self) -> List[Tuple[int, str]]:
+        """Get (id, next_due_date) for every active reminder"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT id, next_due_date FROM care_reminders
+            WHERE is_active = 1 AND next_due_date IS NOT NULL
+        ''')
+        return [(row[0], row[1]) for row in cursor.fetchall()]
+    
+    def complete_care_reminder(self, reminder_id: int, completed_at: Optional[datetime] = None) -> Optional[str]:
+        """
+        Mark a reminder as complete and schedule its next occurrence
+        
+        The next due date follows the reminder's recurrence rule and catch-up
+        policy, so a reminder completed weeks late doesn't have to be completed
+        once for every missed occurrence (unless its policy is 'next').
+        
+        Returns:
+            Optional[str]: The new next_due_date, or None if the reminder was a
+            one-time reminder and has been deactivated
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        completed_at = completed_at or datetime.now()
+        with conn:
+            cursor.execute('SELECT * FROM care_reminders WHERE id = ?', (reminder_id,))
+            reminder = cursor.fetchone()
+            if reminder is None:
+                raise ValueError(f"Reminder {reminder_id} not found")
+            reminder = dict(reminder)
+            
+            rule = RecurrenceRule.from_reminder(reminder)
+            next_due = None
+            if reminder['next_due_date']:
+                next_due = rule.next_due(datetime.fromisoformat(reminder['next_due_date']), completed_at,
+                                         reminder.get('catch_up') or DEFAULT_CATCH_UP)
+            if next_due:
+                next_due = next_due.isoformat()
+                cursor.execute('UPDATE care_reminders SET last_completed = ?, next_due_date = ? WHERE id = ?',
+                               (completed_at.isoformat(), next_due, reminder_id))
+                return next_due
+            
+            # Deactivate one-time reminders
+            cursor.execute('UPDATE care_reminders SET last_completed = ?, is_active = 0 WHERE id = ?',
+                           (completed_at.isoformat(), reminder_id))
+            return None
+    
+    def get_care_reminders_due_before(self, end: str) -> List[Dict]:
+        """Get active reminders whose next due date is before end (for expanding into a calendar range)"""
+        rows = self.execute('''
+            SELECT cr.*, t.name as tortoise_name, u.name as user_name
+            FROM care_reminders cr
+            LEFT JOIN tortoises t ON cr.tortoise_id = t.id
+            LEFT JOIN users u ON cr.assigned_user_id = u.id
+            WHERE cr.is_active = 1 AND cr.next_due_date < ?
+            ORDER BY cr.next_due_date ASC
+        ''', (end,))
+        return [dict(row) for row in rows]
+    
+    def deactivate_care_reminder(self, reminder_id: int) -> bool:
+        """Deactivate a care reminder"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('UPDATE care_reminders SET is_active = 0 WHERE id = ?', (reminder_id,))
+        conn.commit()
+        return cursor.rowcount > 0
+    
+    # Feeding Methods
+    def get_plant_safety_map(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Safety level and nutrition classes of every plant, keyed by plant ID
+        
+        Kept in memory and only reloaded when the plants table has been written.
+        
+        Returns:
+            Dict[int, Dict]: name, safety_level and nutrition (frozenset of NUTRITION_CLASSES)
+        """
+        version = self.get_table_version('plants')
+        if self.plant_safety_map is None or version != self.plant_safety_version:
+            rows = self.execute('SELECT id, name, safety_level, nutrition_notes FROM plants')
+            self.plant_safety_map = {row['id']: {'name': row['name'], 'safety_level': row['safety_level'],
+                                                 'nutrition': classify_nutrition(row['nutrition_notes'])}
+                                     for row in rows}
+            self.plant_safety_version = version
+        return self.plant_safety_map
+    
+    def record_feeding_session(self, tortoise_id: int, user_id: int, items: List[Dict],
+                               feeding_date: Optional[str] = None, notes: str = '',
+                               ate_well: Optional[bool] = None, new_food_introduced: bool = False,
+                               allow_toxic: bool = False) -> int:
+        """
+        Record a feeding session and all of its items in one transaction
+        
+        The tortoise's running nutrition totals are updated in the same
+        transaction, so they never need to be recounted from history.
+        
+        Args:
+            tortoise_id: Tortoise that was fed
+            user_id: Who fed it
+            items: Dicts with plant_id or supplement_name, weight (grams) and optional notes
+            feeding_date: 'YYYY-MM-DD HH:MM:SS' (defaults to now)
+            notes: Session notes
+            ate_well: Whether the tortoise ate well, if recorded
+            new_food_introduced: Whether a new food was offered
+            allow_toxic: Record the session even if it includes toxic plants
+            
+        Returns:
+            int: The new feeding record ID
+            
+        Raises:
+            ValueError: If there are no items, a plant is unknown, or a plant is
+                toxic and allow_toxic is False
+        """
+        if not items:
+            raise ValueError("A feeding session needs at least one item")
+        plant_map = self.get_plant_safety_map()
+        for item in items:
+            plant_id = item.get('plant_id')
+            if plant_id is None and not item.get('supplement_name'):
+                raise ValueError("Each item needs a plant or a supplement")
+            if plant_id is not None and plant_id not in plant_map:
+                raise ValueError(f"Plant {plant_id} not found")
+        toxic = [plant_map[item['plant_id']]['name'] for item in items
+                 if item.get('plant_id') is not None and plant_map[item['plant_id']]['safety_level'] == 'toxic']
+        if toxic and not allow_toxic:
+            raise ValueError(f"Toxic plants in session: {', '.join(toxic)}")
+        
+        totals = session_totals(items, plant_map)
+        feeding_date = feeding_date or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        conn = self.get_connection()
+        with conn:
+            cursor = conn.execute('''
+                INSERT INTO feeding_records (tortoise_id, user_id, feeding_date, total_weight, notes,
+                                             ate_well, new_food_introduced)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (tortoise_id, user_id, feeding_date, totals['total_weight'], notes, ate_well, new_food_introduced))
+            feeding_id = cursor.lastrowid
+            conn.executemany('''
+                INSERT INTO feeding_items (feeding_record_id, plant_id, supplement_name, weight, notes)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [(feeding_id, item.get('plant_id'), item.get('supplement_name'), item['weight'],
+                   item.get('notes', '')) for item in items])
+            self.add_nutrition_totals(tortoise_id, totals, feeding_date)
+            self.add_diet_aggregates(tortoise_id, feeding_date, items, plant_map)
+        return feeding_id
+    
+    def add_nutrition_totals(self, tortoise_id: int, totals: Dict[str, float], feeding_date: str):
+        """Add a session's totals to a tortoise's running totals (call inside the session's transaction)"""
+        columns = ('sessions',) + TOTAL_FIELDS
+        self.get_connection().execute(f'''
+            INSERT INTO feeding_nutrition_totals (tortoise_id, {', '.join(columns)}, last_feeding)
+            VALUES (?, {', '.join('?' * len(columns))}, ?)
+            ON CONFLICT(tortoise_id) DO UPDATE SET
+                {', '.join(f"{column} = {column} + excluded.{column}" for column in columns)},
+                last_feeding = MAX(COALESCE(last_feeding, ''), excluded.last_feeding)
+        ''', (tortoise_id, *(totals[column] for column in columns), feeding_date))
+    
+    def get_nutrition_totals(self, tortoise_id: int) -> Dict[str, Any]:
+        """
+        Running nutrition totals for a tortoise
+        
+        Returns:
+            Dict: sessions, last_feeding and grams per TOTAL_FIELDS (zeros if never fed)
+        """
+        row = self.execute('SELECT * FROM feeding_nutrition_totals WHERE tortoise_id = ?',
+                           (tortoise_id,), fetch='one')
+        if row is None:
+            totals = empty_totals()
+            totals['last_feeding'] = None
+            return totals
+        totals = dict(row)
+        del totals['tortoise_id']
+        return totals
+    
+    def rebuild_nutrition_totals(self):
+        """Recount every tortoise's running totals from the feeding history"""
+        plant_map = self.get_plant_safety_map()
+        sessions = {}
+        for row in self.execute('''
+            SELECT f.id, f.tortoise_id, f.feeding_date, i.plant_id, i.supplement_name, i.weight
+            FROM feeding_records f
+            JOIN feeding_items i ON i.feeding_record_id = f.id
+        '''):
+            session = sessions.setdefault(row['id'], (row['tortoise_id'], row['feeding_date'], []))
+            session[2].append(dict(row))
+        
+        conn = self.get_connection()
+        with conn:
+            conn.execute('DELETE FROM feeding_nutrition_totals')
+            for tortoise_id, feeding_date, items in sessions.values():
+                self.add_nutrition_totals(tortoise_id, session_totals(items, plant_map), feeding_date)
+    
+    def add_diet_aggregates(self, tortoise_id: int, feeding_date: str, items: List[Dict],
+                            plant_map: Dict[int, Dict[str, Any]]):
+        """Add a session's plant items to the diet aggregates (call inside the session's transaction)"""
+        day = feeding_date[:10]
+        plants = [item for item in items if item.get('plant_id') in plant_map]
+        if not plants:
+            return
+        conn = self.get_connection()
+        conn.executemany('''
+            INSERT INTO diet_daily (tortoise_id, day, plant_id, safety_level, grams, servings)
+            VALUES (?, ?, ?, ?, ?, 1)
+            ON CONFLICT(tortoise_id, day, plant_id) DO UPDATE SET
+                grams = grams + excluded.grams,
+                servings = servings + 1
+        ''', [(tortoise_id, day, item['plant_id'], plant_map[item['plant_id']]['safety_level'], item['weight'])
+              for item in plants])
+        conn.executemany('''
+            INSERT INTO diet_plant_last (tortoise_id, plant_id, last_day) VALUES (?, ?, ?)
+            ON CONFLICT(tortoise_id, plant_id) DO UPDATE SET last_day = MAX(last_day, excluded.last_day)
+        ''', [(tortoise_id, item['plant_id'], day) for item in plants])
         
-        # Get total records count
-        cursor.execute('SELECT COUNT(*) as total FROM health_records WHERE tortoise_id = ?', (tortoise_id,))
-        total_records = cursor.fetchone()[0]
+        # Start the day's row from the day before's totals, then add the session to it
+        # and to any later days (only there if the session was entered late)
+        conn.execute(f'''
+            INSERT OR IGNORE INTO diet_cumulative (tortoise_id, day, {', '.join(DIET_FIELDS)})
+            SELECT ?, ?, {', '.join(f'COALESCE(previous.{field}, 0)' for field in DIET_FIELDS)}
+            FROM (SELECT 1) LEFT JOIN (
+                SELECT * FROM diet_cumulative WHERE tortoise_id = ? AND day < ? ORDER BY day DESC LIMIT 1
+            ) previous
+        ''', (tortoise_id, day, tortoise_id, day))
+        grams = diet_grams(plants, plant_map)
+        conn.execute(f'''
+            UPDATE diet_cumulative SET {', '.join(f'{field} = {field} + ?' for field in DIET_FIELDS)}
+            WHERE tortoise_id = ? AND day >= ?
+        ''', (*(grams[field] for field in DIET_FIELDS), tortoise_id, day))
+    
+    def ensure_diet_aggregates(self):
+        """Recount the diet aggregates if plants have been reclassified since they were counted"""
+        version = self.get_table_version('plant_classification')
+        row = self.execute('SELECT classification_version FROM diet_aggregate_state', fetch='one')
+        if row is None or row[0] != version:
+            self.rebuild_diet_aggregates()
+    
+    def rebuild_diet_aggregates(self):
+        """Recount the diet aggregates from the feeding history, classifying plants as the catalogue does now"""
+        plant_map = self.get_plant_safety_map()
+        version = self.get_table_version('plant_classification')
+        conn = self.get_connection()
+        with conn:
+            for table in ('diet_daily', 'diet_cumulative', 'diet_plant_last'):
+                conn.execute(f'DELETE FROM {table}')
+            conn.execute('''
+                INSERT INTO diet_daily (tortoise_id, day, plant_id, safety_level, grams, servings)
+                SELECT f.tortoise_id, substr(f.feeding_date, 1, 10), i.plant_id, p.safety_level,
+                       SUM(i.weight), COUNT(*)
+                FROM feeding_records f
+                JOIN feeding_items i ON i.feeding_record_id = f.id
+                JOIN plants p ON p.id = i.plant_id
+                GROUP BY f.tortoise_id, substr(f.feeding_date, 1, 10), i.plant_id
+            ''')
+            conn.execute('''
+                INSERT INTO diet_plant_last (tortoise_id, plant_id, last_day)
+                SELECT tortoise_id, plant_id, MAX(day) FROM diet_daily GROUP BY tortoise_id, plant_id
+            ''')
+            
+            # Running sums per tortoise, one row per feeding day
+            rows, running, current = [], None, None
+            for row in conn.execute('SELECT tortoise_id, day, plant_id, grams FROM diet_daily ORDER BY tortoise_id, day'):
+                if row[0] != current:
+                    current, running = row[0], {field: 0.0 for field in DIET_FIELDS}
+                day_grams = diet_grams([{'plant_id': row[2], 'weight': row[3]}], plant_map)
+                for field in DIET_FIELDS:
+                    running[field] += day_grams[field]
+                if rows and rows[-1][:2] == (row[0], row[1]):
+                    rows[-1] = (row[0], row[1], *(running[field] for field in DIET_FIELDS))
+                else:
+                    rows.append((row[0], row[1], *(running[field] for field in DIET_FIELDS)))
+            conn.executemany(f'''
+                INSERT INTO diet_cumulative (tortoise_id, day, {', '.join(DIET_FIELDS)})
+                VALUES (?, ?, {', '.join('?' * len(DIET_FIELDS))})
+            ''', rows)
+            conn.execute('INSERT OR REPLACE INTO diet_aggregate_state (id, classification_version) VALUES (1, ?)',
+                         (version,))
+    
+    def get_diet_totals(self, day: str, tortoise_id: Optional[int] = None) -> Dict[int, Dict[str, float]]:
+        """
+        Grams per DIET_FIELDS each active tortoise has been fed up to and including a day
+        
+        One primary key lookup per tortoise, however long the feeding history is.
+        
+        Args:
+            day: 'YYYY-MM-DD'
+            tortoise_id: One tortoise, or every active tortoise if None
+            
+        Returns:
+            Dict[int, Dict]: Totals by tortoise ID (tortoises never fed by then are left out)
+        """
+        query = f'''
+            SELECT c.tortoise_id, {', '.join(f'c.{field}' for field in DIET_FIELDS)}
+            FROM tortoises t
+            JOIN diet_cumulative c ON c.tortoise_id = t.id AND c.day = (
+                SELECT day FROM diet_cumulative WHERE tortoise_id = t.id AND day <= ? ORDER BY day DESC LIMIT 1)
+            WHERE t.is_active = 1
+        '''
+        params = [day]
+        if tortoise_id is not None:
+            query += ' AND t.id = ?'
+            params.append(tortoise_id)
+        return {row['tortoise_id']: {field: row[field] for field in DIET_FIELDS}
+                for row in self.execute(query, params)}
+    
+    def get_diet_variety(self, since: str, until: Optional[str] = None,
+                         tortoise_id: Optional[int] = None) -> Dict[int, int]:
+        """
+        Number of different plants each active tortoise was fed in a window
         
-        # Get unresolved issues count
-        cursor.execute('SELECT COUNT(*) as unresolved FROM health_records WHERE tortoise_id = ? AND resolved = 0', (tortoise_id,))
-        unresolved_issues = cursor.fetchone()[0]
+        Windows ending today count the plants last fed since the start
+        (diet_plant_last); windows ending earlier count the window's daily rows.
         
-        # Get recent records (last 30 days)
+        Args:
+            since: First day of the window as 'YYYY-MM-DD'
+            until: Last day for a window that ends before today, None for today
+            tortoise_id: One tortoise, or every active tortoise if None
+        """
+        if until is None:
+            count = 'SELECT COUNT(*) FROM diet_plant_last WHERE tortoise_id = t.id AND last_day >= ?'
+            params = [since]
+        else:
+            count = '''SELECT COUNT(DISTINCT plant_id) FROM diet_daily
+                       WHERE tortoise_id = t.id AND day >= ? AND day <= ?'''
+            params = [since, until]
+        query = f'''
+            SELECT t.id as tortoise_id, ({count}) as plants
+            FROM tortoises t
+            WHERE t.is_active = 1
+        '''
+        if tortoise_id is not None:
+            query += ' AND t.id = ?'
+            params.append(tortoise_id)
+        return {row['tortoise_id']: row['plants'] for row in self.execute(query, params)}
+    
+    def get_diet_window(self, since: str, tortoise_id: Optional[int] = None,
+                        until: Optional[str] = None) -> List[Dict]:
+        """
+        Grams of each plant fed in a window, from the daily aggregates
+        
+        Reads one row per plant per feeding day in the window; the window
+        totals themselves come from get_diet_totals().
+        
+        Args:
+            since: First day of the window as 'YYYY-MM-DD'
+            tortoise_id: One tortoise, or every tortoise if None
+            until: Last day of the window (no end if None)
+            
+        Returns:
+            List[Dict]: tortoise_id, plant_id, safety_level, grams, servings and days (days it was fed)
+        """
+        query = '''
+            SELECT tortoise_id, plant_id, safety_level, SUM(grams) as grams, SUM(servings) as servings,
+                   COUNT(*) as days
+            FROM diet_daily
+            WHERE day >= ?
+        '''
+        params = [since]
+        if until is not None:
+            query += ' AND day <= ?'
+            params.append(until)
+        if tortoise_id is not None:
+            query += ' AND tortoise_id = ?'
+            params.append(tortoise_id)
+        query += ' GROUP BY tortoise_id, plant_id, safety_level'
+        return [dict(row) for row in self.execute(query, params)]
+    
+    def get_feeding_sessions(self, tortoise_id: int, limit: int = 10) -> List[Dict]:
+        """Most recent feeding sessions for a tortoise, with a summary of their items"""
+        rows = self.execute('''
+            SELECT f.id, f.feeding_date, f.total_weight, f.notes, f.ate_well, u.name as user_name,
+                   (SELECT GROUP_CONCAT(COALESCE(p.name, i.supplement_name), ', ')
+                    FROM feeding_items i LEFT JOIN plants p ON i.plant_id = p.id
+                    WHERE i.feeding_record_id = f.id) as items
+            FROM feeding_records f
+            LEFT JOIN users u ON f.user_id = u.id
+            WHERE f.tortoise_id = ?
+            ORDER BY f.feeding_date DESC, f.id DESC
+            LIMIT ?
+        ''', (tortoise_id, limit))
+        return [dict(row) for row in rows]
+    
+    # Dashboard Methods
+    def get_latest_feedings(self) -> List[Dict]:
+        """Get each active tortoise with its most recent feeding (None if never fed), latest first"""
+        rows = self.execute('''
+            SELECT t.id as tortoise_id, t.name as tortoise_name,
+                   (SELECT MAX(f.feeding_date) FROM feeding_records f
+                    WHERE f.tortoise_id = t.id) as feeding_date
+            FROM tortoises t
+            WHERE t.is_active = 1
+            ORDER BY feeding_date DESC
+        ''')
+        return [dict(row) for row in rows]
+    
+    def get_dashboard_counts(self, today: str, tomorrow: str) -> Dict[str, int]:
+        """
+        Count due reminders and open health issues in one query
+        
+        Args:
+            today: Start of today as 'YYYY-MM-DD'
+            tomorrow: Start of tomorrow as 'YYYY-MM-DD'
+            
+        Returns:
+            Dict[str, int]: reminders_overdue (due before today), reminders_due (due today),
+            health_unresolved and health_urgent
+        """
+        row = self.execute('''
+            SELECT
+                (SELECT COUNT(*) FROM care_reminders
+                 WHERE is_active = 1 AND next_due_date < :today) as reminders_overdue,
+                (SELECT COUNT(*) FROM care_reminders
+                 WHERE is_active = 1 AND next_due_date >= :today AND next_due_date < :tomorrow) as reminders_due,
+                (SELECT COUNT(*) FROM health_records WHERE resolved = 0) as health_unresolved,
+                (SELECT COUNT(*) FROM health_records
+                 WHERE resolved = 0 AND priority = 'urgent') as health_urgent
+        ''', {'today': today, 'tomorrow': tomorrow}, fetch='one')
+        return dict(row)
+    
+    # Growth Record Methods
+    def add_growth_record(self, tortoise_id: int, user_id: int, measurement_date: Optional[str] = None,
+                          weight: Optional[float] = None, length: Optional[float] = None,
+                          width: Optional[float] = None, height: Optional[float] = None,
+                          photo_path: Optional[str] = None, notes: str = '') -> int:
+        """Add a growth record (measurement_date defaults to now)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO growth_records (tortoise_id, user_id, measurement_date, weight, length, width, height, photo_path, notes)
+            VALUES (?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?, ?, ?, ?, ?, ?)
+        ''', (tortoise_id, user_id, measurement_date, weight, length, width, height, photo_path, notes))
+        conn.commit()
+        return cursor.lastrowid
+    
+    def add_growth_records(self, records: List[Dict]) -> int:
+        """Insert many growth records in one transaction"""
+        if not records:
+            return 0
+        conn = self.get_connection()
+        with conn:
+            conn.executemany('''
+                INSERT INTO growth_records (tortoise_id, user_id, measurement_date, weight, length, width, height, photo_path, notes)
+                VALUES (?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?, ?, ?, ?, ?, ?)
+            ''', [(r['tortoise_id'], r['user_id'], r.get('measurement_date'), r.get('weight'),
+                   r.get('length'), r.get('width'), r.get('height'), r.get('photo_path'),
+                   r.get('notes', '')) for r in records])
+        return len(records)
+    
+    def get_tortoise_ids_measured_on(self, day: str) -> List[int]:
+        """Get the tortoises that have a growth record on a date (YYYY-MM-DD)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
         cursor.execute('''
-            SELECT COUNT(*) as recent FROM health_records 
-            WHERE tortoise_id = ? AND record_date > datetime('now', '-30 days')
-        ''', (tortoise_id,))
-        recent_records = cursor.fetchone()[0]
-        
-        # Get urgent issues
-        cursor.execute('SELECT COUNT(*) as urgent FROM health_records WHERE tortoise_id = ? AND priority = "urgent" AND resolved = 0', (tortoise_id,))
-        urgent_issues = cursor.fetchone()[0]
-        
-        return {
-            'total_records': total_records,
-            'unresolved_issues': unresolved_issues,
-            'recent_records': recent_records,
-            'urgent_issues': urgent_issues
-        }
+            SELECT DISTINCT tortoise_id FROM growth_records
+            WHERE measurement_date >= ? AND measurement_date < date(?, '+1 day')
+        ''', (day, day))
+        return [row[0] for row in cursor.fetchall()]
+    
+    def get_existing_growth_photos(self, photo_paths: List[str]) -> set:
+        """Get which of the given photo paths already belong to a growth record"""
+        if not photo_paths:
+            return set()
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        placeholders = ','.join('?' * len(photo_paths))
+        cursor.execute(f'SELECT photo_path FROM growth_records WHERE photo_path IN ({placeholders})',
+                       photo_paths)
+        return {row[0] for row in cursor.fetchall()}
+    
+    # Photo Derivative Methods
+    def add_photo_derivatives(self, source_path: str, derivatives: List[Dict]):
+        """Record the derivatives generated for a photo, replacing older ones"""
+        conn = self.get_connection()
+        with conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO photo_derivatives (source_path, variant, format, path, width, height)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [(source_path, d['variant'], d['format'], d['path'], d['width'], d['height'])
+                  for d in derivatives])
+    
+    def get_photo_derivatives(self, source_path: str) -> List[Dict]:
+        """Get all derivatives for a photo, smallest first"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT * FROM photo_derivatives WHERE source_path = ?
+            ORDER BY MAX(width, height)
+        ''', (source_path,))
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def get_best_photo_path(self, source_path: str, size: int, image_format: str = 'jpeg') -> str:
+        """Get the smallest derivative that covers size pixels, falling back to the original"""
+        if not source_path:
+            return source_path
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT path FROM photo_derivatives
+            WHERE source_path = ? AND format = ? AND MAX(width, height) >= ?
+            ORDER BY MAX(width, height) LIMIT 1
+        ''', (source_path, image_format, size))
+        row = cursor.fetchone()
+        if row is None:
+            # No variant is big enough - use the largest one
+            cursor.execute('''
+                SELECT path FROM photo_derivatives
+                WHERE source_path = ? AND format = ?
+                ORDER BY MAX(width, height) DESC LIMIT 1
+            ''', (source_path, image_format))
+            row = cursor.fetchone()
+        if row and os.path.exists(row[0]):
+            return row[0]
+        return source_path
     
     # Settings Management Methods
     def get_setting(self, key: str) -> Optional[str]:
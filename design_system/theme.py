@@ -0,0 +1,286 @@
+"""
+Tortoise Care Touch - Application stylesheet
+Builds one stylesheet from APP_COLORS and installs it on the QApplication.
+
+Widgets pick their look with an object name or a dynamic property instead of
+calling setStyleSheet with their own string, so Qt parses the rules once at
+startup rather than every time a widget is built or changes state:
+
+    button.setProperty('variant', 'primary')      # QPushButton[variant="primary"]
+    label.setObjectName('statusLabel')            # QLabel#statusLabel
+    set_style_property(label, 'status', 'error')  # QLabel#statusLabel[status="error"]
+"""
+
+from design_system.colors import APP_COLORS
+
+# Button variants: property value -> (background, hover, pressed)
+BUTTON_VARIANTS = {
+    'primary': ('core.blue_gray', 'blue_gray_family.dark', 'blue_gray_family.darker'),
+    'secondary': ('core.teal_gray', 'teal_gray_family.dark', 'teal_gray_family.darker'),
+    'warning': ('core.purple_gray', 'purple_gray_family.dark', 'purple_gray_family.darker'),
+    'danger': ('extended.error', '#c82333', '#a71e2a'),
+    'default': ('text.secondary', 'text.muted', 'blue_gray_family.darker'),
+}
+
+# Large home screen navigation buttons
+NAV_VARIANTS = {
+    'primary': ('core.blue_gray', 'blue_gray_family.dark', 'blue_gray_family.darker'),
+    'danger': ('core.teal_gray', 'teal_gray_family.dark', 'teal_gray_family.darker'),
+    'secondary': ('analogous.blue_neighbors.0', 'analogous.blue_neighbors.1', 'analogous.blue_neighbors.2'),
+    'warning': ('core.purple_gray', 'purple_gray_family.dark', 'purple_gray_family.darker'),
+}
+
+# Status label states: property value -> (border color, background, border width)
+STATUS_STATES = {
+    'ok': ('extended.success', 'backgrounds.safe_light', 1),
+    'low': ('core.blue_gray', 'blue_gray_family.lightest', 1),
+    'error': ('extended.error', 'backgrounds.danger_light', 1),
+    'late': ('extended.warning', 'backgrounds.neutral_light', 1),
+    'stale': ('extended.warning', 'backgrounds.caution_light', 2),
+    'muted': ('text.muted', 'backgrounds.neutral_light', 1),
+}
+
+# Plant safety levels used by the plant cards
+SAFETY_COLORS = {
+    'safe': 'extended.success',
+    'caution': 'extended.warning',
+    'toxic': 'extended.error',
+}
+
+
+def color(name, colors=APP_COLORS):
+    """Look up a dotted palette name such as 'core.blue_gray' (plain '#rrggbb' values pass through)"""
+    if name.startswith('#'):
+        return name
+    value = colors
+    for part in name.split('.'):
+        value = value[int(part)] if isinstance(value, list) else value[part]
+    return value
+
+
+def build_stylesheet(colors=APP_COLORS):
+    """
+    Generate the application stylesheet
+
+    Args:
+        colors: Palette in the APP_COLORS layout
+
+    Returns:
+        str: Stylesheet for QApplication.setStyleSheet
+    """
+    c = lambda name: color(name, colors)
+    rules = []
+
+    # Buttons created by BaseScreen.create_button
+    for variant, (background, hover, pressed) in BUTTON_VARIANTS.items():
+        rules.append(f"""
+QPushButton[variant="{variant}"] {{
+    background-color: {c(background)};
+    color: white;
+    border: none;
+    border-radius: 10px;
+    padding: 12px;
+    font-weight: bold;
+}}
+QPushButton[variant="{variant}"]:hover {{ background-color: {c(hover)}; }}
+QPushButton[variant="{variant}"]:pressed {{ background-color: {c(pressed)}; }}""")
+
+    # Header back button and the home screen's icon buttons
+    rules.append(f"""
+QPushButton[variant="back"], QPushButton[variant="settings"], QPushButton[variant="quit"] {{
+    color: white;
+    border: none;
+    border-radius: 10px;
+    padding: 12px;
+    font-weight: bold;
+    text-align: left;
+    padding-left: 18px;
+}}
+QPushButton[variant="back"] {{ background-color: {c('text.secondary')}; font-size: 14px; }}
+QPushButton[variant="back"]:hover {{ background-color: {c('text.muted')}; }}
+QPushButton[variant="back"]:pressed {{ background-color: {c('blue_gray_family.darker')}; }}
+QPushButton[variant="settings"] {{ background-color: {c('extended.nav_secondary')}; font-size: 16px; }}
+QPushButton[variant="settings"]:hover {{ background-color: {c('purple_gray_family.dark')}; }}
+QPushButton[variant="settings"]:pressed {{ background-color: {c('purple_gray_family.darker')}; }}
+QPushButton[variant="quit"] {{ background-color: {c('extended.error')}; font-size: 16px; }}
+QPushButton[variant="quit"]:hover {{ background-color: #c82333; }}
+QPushButton[variant="quit"]:pressed {{ background-color: #a71e2a; }}""")
+
+    for variant, (background, hover, pressed) in NAV_VARIANTS.items():
+        rules.append(f"""
+QPushButton[nav="{variant}"] {{
+    background-color: {c(background)};
+    color: white;
+    border: none;
+    border-radius: 12px;
+    padding: 15px;
+    font-weight: bold;
+    font-size: 18px;
+    text-align: left;
+    padding-left: 25px;
+}}
+QPushButton[nav="{variant}"]:hover {{ background-color: {c(hover)}; }}
+QPushButton[nav="{variant}"]:pressed {{ background-color: {c(pressed)}; }}""")
+
+    # Screen titles (font size is set on the label's font)
+    rules.append(f"""
+QLabel[role="title"] {{ color: {c('core.blue_gray')}; margin: 10px; }}
+QLabel[role="clock"] {{ color: {c('text.secondary')}; margin: 5px; }}""")
+
+    # Home screen status labels
+    rules.append(f"""
+QLabel#statusLabel {{
+    background-color: {c('backgrounds.neutral_light')};
+    border: 1px solid {c('core.blue_gray')};
+    border-radius: 8px;
+    padding: 12px;
+    margin: 5px;
+    font-size: 14px;
+    font-weight: 500;
+    min-height: 20px;
+}}""")
+    for state, (border, background, width) in STATUS_STATES.items():
+        rules.append(f"""
+QLabel#statusLabel[status="{state}"] {{
+    background-color: {c(background)};
+    border: {width}px solid {c(border)};
+    color: {c('text.primary')};
+    font-weight: bold;
+}}""")
+
+    # Plant database grid cards (QLabel is a QFrame, so the card's labels have
+    # always picked up its border and margin; the descendant rules keep that look)
+    rules.append(f"""
+QWidget#plantGrid {{ background-color: #f8f8f8; }}
+QFrame#plantCard {{
+    background-color: white;
+    border-radius: 8px;
+    margin: 4px;
+}}
+QFrame#plantCard:hover {{ background-color: {c('backgrounds.app_bg')}; }}
+QFrame#plantCard QLabel {{ margin: 4px; }}
+QLabel#plantCardPhoto {{ border-radius: 8px; background-color: {c('backgrounds.app_bg')}; }}
+QFrame#plantCard QLabel#plantCardPhoto[placeholder="true"] {{
+    border: 1px solid {c('extended.border_light')};
+    border-radius: 6px;
+    color: {c('text.muted')};
+    font-size: 10px;
+    font-weight: 500;
+}}
+QLabel#plantCardName {{
+    background-color: rgba(255, 255, 255, 0.95);
+    color: #000;
+    font-size: 16px;
+    font-weight: bold;
+    padding: 8px;
+    border-radius: 6px;
+}}
+QLabel#plantCardScientific {{
+    background-color: rgba(255, 255, 255, 0.9);
+    color: #333;
+    font-size: 14px;
+    font-style: italic;
+    padding: 8px;
+    border-radius: 6px;
+}}
+QLabel#plantCardBadge {{
+    color: white;
+    font-size: 18px;
+    font-weight: bold;
+    padding: 8px;
+    border-radius: 6px;
+}}""")
+    for safety, name in SAFETY_COLORS.items():
+        rules.append(f"""
+QFrame#plantCard[safety="{safety}"], QFrame#plantCard[safety="{safety}"] QLabel {{ border: 1px solid {c(name)}; }}
+QLabel#plantCardBadge[safety="{safety}"] {{ background-color: {c(name)}; }}""")
+
+    # Text inputs on form screens
+    rules.append("""
+QComboBox[role="input"], QDoubleSpinBox[role="input"], QLineEdit[role="input"] {
+    font-size: 14px;
+    padding: 8px;
+    border: 2px solid #ccc;
+    border-radius: 5px;
+}
+QComboBox[role="input"]:focus, QDoubleSpinBox[role="input"]:focus, QLineEdit[role="input"]:focus {
+    border-color: #4CAF50;
+}""")
+
+    # Feeding screen
+    rules.append("""
+QFrame#feedingPanel {
+    background-color: #fafafa;
+    border: 1px solid #ddd;
+    border-radius: 8px;
+}
+QCheckBox#feedingAteWell { font-size: 14px; margin: 0 10px; }
+QListWidget#feedingItems {
+    font-size: 15px;
+    border: 1px solid #ddd;
+    border-radius: 5px;
+    background-color: white;
+}
+QListWidget#feedingItems::item { padding: 8px; }
+QLabel#feedingTitle { font-size: 16px; font-weight: bold; color: #333; }
+QLabel#feedingColumnHeader { font-weight: bold; color: #666; }
+QLabel#feedingTotal { font-size: 14px; }
+QLabel#feedingRunningNote { color: #666; font-size: 12px; margin-top: 5px; }
+QLabel#feedingRecentTitle { font-size: 14px; font-weight: bold; color: #333; margin-top: 10px; }
+QListWidget#feedingRecent { font-size: 12px; border: none; background: transparent; }""")
+
+    # Diagnostics screen
+    rules.append("""
+QPushButton[variant="category"] {
+    background-color: #757575;
+    color: white;
+    border: none;
+    border-radius: 5px;
+    padding: 8px 16px;
+    font-size: 14px;
+    font-weight: bold;
+}
+QPushButton[variant="category"]:hover { background-color: #616161; }
+QPushButton[variant="category"]:checked { background-color: #4CAF50; }
+QTableWidget#diagnosticsTable {
+    border: 1px solid #ddd;
+    border-radius: 5px;
+    background-color: #fafafa;
+    font-size: 13px;
+}
+QTableWidget#diagnosticsTable QHeaderView::section {
+    background-color: #eeeeee;
+    padding: 6px;
+    border: none;
+    font-weight: bold;
+}
+QLabel#diagnosticsStatus { color: #666; font-size: 12px; margin: 5px; }""")
+
+    return '\n'.join(rule.strip('\n') for rule in rules) + '\n'
+
+
+def apply_theme(app, colors=APP_COLORS):
+    """Install the application stylesheet on a QApplication"""
+    app.setStyleSheet(build_stylesheet(colors))
+
+
+def set_style_property(widget, name, value):
+    """
+    Change a property used by a stylesheet selector and restyle the widget
+
+    Args:
+        widget: Widget to update
+        name: Property name
+        value: New value
+
+    Returns:
+        bool: True if the value changed
+    """
+    if widget.property(name) == value:
+        return False
+    widget.setProperty(name, value)
+    # Qt only re-evaluates property selectors when the widget is repolished
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    return True
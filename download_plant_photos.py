@@ -6,7 +6,10 @@ Create local photo library for offline plant identification
 
 import os
 import requests
+from requests.adapters import HTTPAdapter
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
 import time
@@ -20,86 +23,227 @@ PHOTOS_DIR.mkdir(exist_ok=True)
 # Photo attribution file for CC compliance
 ATTRIBUTION_FILE = PHOTOS_DIR / "attribution.json"
 
+# Append-only record of finished downloads, used to resume interrupted harvests
+MANIFEST_FILE = PHOTOS_DIR / "download_manifest.jsonl"
+
+# Streaming and concurrency limits
+CHUNK_SIZE = 64 * 1024
+DEFAULT_WORKERS = 4
+
 class PlantPhotoDownloader:
     """Download and manage plant photos from The Tortoise Table"""
     
-    def __init__(self):
-        self.base_url = "https://www.thetortoisetable.org.uk"
-        self.session = requests.Session()
+    def __init__(self, photos_dir=PHOTOS_DIR, session=None, max_workers=DEFAULT_WORKERS,
+                 base_url="https://www.thetortoisetable.org.uk"):
+        self.base_url = base_url
+        self.photos_dir = Path(photos_dir)
+        self.photos_dir.mkdir(parents=True, exist_ok=True)
+        self.attribution_file = self.photos_dir / ATTRIBUTION_FILE.name
+        self.manifest_file = self.photos_dir / MANIFEST_FILE.name
+        self.max_workers = max_workers
+        
+        self.session = session or requests.Session()
+        if session is None:
+            # One pooled connection per worker
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        
+        self.lock = threading.Lock()
         self.attribution_data = {}
+        self.manifest = {}
         self.load_existing_attribution()
+        self.load_manifest()
         
     def load_existing_attribution(self):
         """Load existing attribution data"""
-        if ATTRIBUTION_FILE.exists():
-            with open(ATTRIBUTION_FILE, 'r') as f:
-                self.attribution_data = json.load(f)
+        if self.attribution_file.exists():
+            with open(self.attribution_file, 'r') as f:
+                self.attribution_data = json.load(f).get('plants', {})
+    
+    def load_manifest(self):
+        """Load the resume manifest - the last entry for each URL wins"""
+        if not self.manifest_file.exists():
+            return
+        with open(self.manifest_file, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Torn last line from an interrupted run
+                self.manifest[entry['source_url']] = entry
+    
+    def record_download(self, entry):
+        """Append a finished download to the manifest and attribution data"""
+        with self.lock:
+            self.manifest[entry['source_url']] = entry
+            with open(self.manifest_file, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+            self.attribution_data[entry['plant_name']] = {
+                "photo_file": entry['photo_file'],
+                "source_url": entry['source_url'],
+                "photo_type": entry['photo_type'],
+                "download_date": entry['download_date']
+            }
     
     def save_attribution(self):
         """Save attribution data for CC compliance"""
-        attribution_info = {
+        attribution_info = {}
+        if self.attribution_file.exists():
+            with open(self.attribution_file, 'r') as f:
+                attribution_info = json.load(f)
+        attribution_info.update({
             "license": "CC Attribution-NoDerivs 2.0 Generic",
             "source": "The Tortoise Table (thetortoisetable.org.uk)",
             "download_date": time.strftime("%Y-%m-%d"),
             "plants": self.attribution_data
-        }
+        })
         
-        with open(ATTRIBUTION_FILE, 'w') as f:
+        temp_file = self.attribution_file.with_suffix('.json.tmp')
+        with open(temp_file, 'w') as f:
             json.dump(attribution_info, f, indent=2)
+        os.replace(temp_file, self.attribution_file)
+    
+    def get_photo_path(self, photo_url, plant_name, photo_type="main"):
+        """Get the local path a photo URL is saved to"""
+        # Create safe filename
+        safe_name = "".join(c for c in plant_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        safe_name = safe_name.replace(' ', '_').lower()
+        
+        # Get file extension from URL
+        parsed_url = urlparse(photo_url)
+        file_ext = Path(parsed_url.path).suffix or '.jpg'
+        
+        return self.photos_dir / f"{safe_name}_{photo_type}{file_ext}"
     
     def download_photo(self, photo_url, plant_name, photo_type="main"):
-        """Download a single plant photo"""
+        """Download a single plant photo, streaming it to disk
+        
+        Completed files are revalidated with ETag/Last-Modified, and an
+        interrupted .part file is continued with a Range request guarded by
+        If-Range, so a photo that changed in between is fetched whole.
+        """
         try:
-            # Create safe filename
-            safe_name = "".join(c for c in plant_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-            safe_name = safe_name.replace(' ', '_').lower()
+            file_path = self.get_photo_path(photo_url, plant_name, photo_type)
+            part_path = file_path.with_name(file_path.name + '.part')
+            validator_path = file_path.with_name(file_path.name + '.part.json')
+            filename = file_path.name
             
-            # Get file extension from URL
-            parsed_url = urlparse(photo_url)
-            file_ext = Path(parsed_url.path).suffix or '.jpg'
-            
-            # Create filename
-            filename = f"{safe_name}_{photo_type}{file_ext}"
-            file_path = PHOTOS_DIR / filename
-            
-            # Skip if already exists
-            if file_path.exists():
+            headers = {}
+            previous = self.manifest.get(photo_url)
+            if file_path.exists() and not previous:
+                # Added by hand - nothing to revalidate against
                 print(f"  Photo already exists: {filename}")
-                return str(file_path.relative_to(Path.cwd()))
-            
-            # Download photo
-            response = self.session.get(photo_url, timeout=30)
-            response.raise_for_status()
+                return str(file_path).replace('\\', '/')
+            if previous and file_path.exists():
+                # Only fetch again if the server copy changed
+                if previous.get('etag'):
+                    headers['If-None-Match'] = previous['etag']
+                if previous.get('last_modified'):
+                    headers['If-Modified-Since'] = previous['last_modified']
+            elif part_path.exists():
+                if_range = self.load_part_validator(validator_path)
+                if if_range:
+                    headers['Range'] = f"bytes={part_path.stat().st_size}-"
+                    headers['If-Range'] = if_range
+                else:
+                    # Nothing to tell whether the partial still matches - start over
+                    part_path.unlink()
             
-            # Verify it's an image
-            content_type = response.headers.get('content-type', '').lower()
-            if not any(img_type in content_type for img_type in ['image/', 'jpeg', 'jpg', 'png', 'gif']):
-                print(f"  Skipping non-image content: {content_type}")
-                return None
+            with self.session.get(photo_url, headers=headers, stream=True, timeout=30) as response:
+                if response.status_code == 304:
+                    print(f"  Photo unchanged: {filename}")
+                    return str(file_path).replace('\\', '/')
+                if response.status_code == 416:
+                    # Partial file is unusable - start over on the next run
+                    part_path.unlink()
+                    if validator_path.exists():
+                        validator_path.unlink()
+                    print(f"  Discarded stale partial download: {filename}")
+                    return None
+                response.raise_for_status()
+                
+                # Verify it's an image
+                content_type = response.headers.get('content-type', '').lower()
+                if not any(img_type in content_type for img_type in ['image/', 'jpeg', 'jpg', 'png', 'gif']):
+                    print(f"  Skipping non-image content: {content_type}")
+                    return None
+                
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+                
+                # Append only if the server sent the rest of the same file (If-Range
+                # matched); a 200 is the whole, possibly changed, file
+                if response.status_code == 206:
+                    mode = 'ab'
+                else:
+                    mode = 'wb'
+                    self.save_part_validator(validator_path, etag, last_modified)
+                with open(part_path, mode) as f:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        f.write(chunk)
             
-            # Save photo
-            with open(file_path, 'wb') as f:
-                f.write(response.content)
+            # Publish the finished file atomically
+            os.replace(part_path, file_path)
+            if validator_path.exists():
+                validator_path.unlink()
+            size = file_path.stat().st_size
+            print(f"  Downloaded: {filename} ({size} bytes)")
             
-            print(f"  Downloaded: {filename} ({len(response.content)} bytes)")
-            
-            # Add to attribution
-            self.attribution_data[plant_name] = {
-                "photo_file": filename,
+            self.record_download({
                 "source_url": photo_url,
+                "plant_name": plant_name,
                 "photo_type": photo_type,
+                "photo_file": filename,
+                "bytes": size,
+                "etag": etag,
+                "last_modified": last_modified,
                 "download_date": time.strftime("%Y-%m-%d")
-            }
+            })
             
-            return str(file_path.relative_to(Path.cwd()))
+            return str(file_path).replace('\\', '/')
             
         except Exception as e:
             print(f"  Error downloading {photo_url}: {e}")
             return None
     
+    def save_part_validator(self, validator_path, etag, last_modified):
+        """Remember which version of a photo a .part file holds"""
+        with open(validator_path, 'w') as f:
+            json.dump({'etag': etag, 'last_modified': last_modified}, f)
+    
+    def load_part_validator(self, validator_path):
+        """If-Range value for resuming a .part file, or None if it can't be resumed safely"""
+        try:
+            with open(validator_path, 'r') as f:
+                validator = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # If-Range needs a strong ETag; fall back to the date
+        etag = validator.get('etag')
+        if etag and not etag.startswith('W/'):
+            return etag
+        return validator.get('last_modified')
+    
+    def download_many(self, jobs):
+        """Download many photos with a bounded worker pool
+        
+        Args:
+            jobs: Iterable of (photo_url, plant_name, photo_type) tuples
+            
+        Returns:
+            Dict mapping each job tuple to its local path (None on failure)
+        """
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.download_photo, *job): job for job in jobs}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        return results
+    
     def get_plant_photo_urls(self, plant_page_url):
         """Extract photo URLs from a plant's individual page"""
         try:
@@ -205,23 +349,28 @@ def download_sample_plant_photos():
     
     conn.commit()
     
-    downloaded_count = 0
-    
+    jobs = []
     for plant in sample_plants:
-        print(f"\nProcessing {plant['name']} ({plant['scientific_name']}):")
-        
         for i, photo_url in enumerate(plant['photo_urls']):
             photo_type = "main" if i == 0 else f"alt_{i}"
-            photo_path = downloader.download_photo(photo_url, plant['name'], photo_type)
-            
-            if photo_path:
-                # Update database with photo path
-                cursor.execute('''
-                    UPDATE plants 
-                    SET plant_photo_path = ? 
-                    WHERE name = ?
-                ''', (photo_path, plant['name']))
-                downloaded_count += 1
+            jobs.append((photo_url, plant['name'], photo_type))
+    
+    print(f"Downloading {len(jobs)} photos with {downloader.max_workers} workers...")
+    results = downloader.download_many(jobs)
+    
+    # Update database with photo paths in one transaction. As when photos were
+    # downloaded one by one, each plant ends up with its last downloaded photo
+    latest = {}
+    for job in jobs:
+        if results.get(job):
+            latest[job[1]] = results[job]
+    updates = [(photo_path, plant_name) for plant_name, photo_path in latest.items()]
+    cursor.executemany('''
+        UPDATE plants 
+        SET plant_photo_path = ? 
+        WHERE name = ?
+    ''', updates)
+    downloaded_count = sum(1 for photo_path in results.values() if photo_path)
     
     conn.commit()
     conn.close()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Load test for the photo upload server
+Simulates several phones uploading photos at once while a Qt timer ticks at
+60 FPS, and reports how late the UI ticks were. Run it once per server mode
+to compare the in-process development server with the production server:
+
+    python load_test_photo_server.py --mode thread
+    python load_test_photo_server.py --mode process
+
+The server runs against a temporary photo root and database, deleted
+afterwards, so the real photos/ store and tortoise_care.db are never
+touched. Uploads go to tortoise ID 0 (no tortoise is updated).
+
+Every upload is a different generated image, so each one is hashed, gets
+derivatives and a database row - the ingest load the modes are compared
+on. --transfer-only sends one image for every upload instead; after the
+first, content deduplication skips the ingest, leaving mostly the transfer:
+
+    python load_test_photo_server.py --mode process --transfer-only
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+# Before photo_server is imported: the photo root is read at import time, and
+# the server opens tortoise_care.db in the working directory. The spawned
+# server process re-runs this module, so it reuses the directory from the
+# environment rather than making its own.
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+if 'PHOTO_LOAD_TEST_DIR' not in os.environ:
+    os.environ['PHOTO_LOAD_TEST_DIR'] = tempfile.mkdtemp(prefix='photo_load_test_')
+LOAD_TEST_DIR = os.environ['PHOTO_LOAD_TEST_DIR']
+os.environ['TORTOISE_PHOTOS_DIR'] = os.path.join(LOAD_TEST_DIR, 'photos')
+os.chdir(LOAD_TEST_DIR)
+
+import requests
+from PIL import Image
+from PySide6.QtCore import QCoreApplication, QTimer
+
+import photo_server
+from database.db_manager import DatabaseManager
+
+FRAME_INTERVAL_MS = 16
+LOAD_TEST_PORT = 5599
+
+
+def make_test_photos(count, size=(3000, 2000)):
+    """
+    Write phone-sized JPEGs to the load test directory, each with different content
+
+    The noise background is generated once; each photo gets its own noise
+    patch, so their hashes differ. Written before timing starts so the
+    encoding doesn't compete with the UI timer.
+
+    Returns:
+        List[str]: Paths of the photos
+    """
+    background = Image.effect_noise(size, 64).convert('RGB')
+    folder = os.path.join(LOAD_TEST_DIR, 'uploads')
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for number in range(count):
+        image = background.copy()
+        corner = (64 * (number % 40), 64 * (number // 40 % 30))
+        image.paste(Image.effect_noise((64, 64), 64).convert('RGB'), corner)
+        path = os.path.join(folder, f"load_test_{number}.jpg")
+        image.save(path, 'JPEG', quality=90)
+        paths.append(path)
+    return paths
+
+
+def wait_for_server(url, timeout=15):
+    """Poll the server until it answers"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return True
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    return False
+
+
+def upload_worker(url, photos, latencies, errors):
+    """Upload photos one after another, like one phone"""
+    session = requests.Session()
+    for path in photos:
+        start = time.perf_counter()
+        try:
+            with open(path, 'rb') as photo:
+                response = session.post(url, data={'tortoise_id': '0'},
+                                        files={'photo': ('load_test.jpg', photo, 'image/jpeg')},
+                                        allow_redirects=False, timeout=60)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+        except requests.RequestException as e:
+            errors.append(str(e))
+        latencies.append(time.perf_counter() - start)
+
+
+def run_load_test(mode, clients, uploads, transfer_only=False):
+    """Run the uploads and measure UI timer lateness"""
+    url = f"http://127.0.0.1:{LOAD_TEST_PORT}/"
+    server = None
+
+    if mode == 'process':
+        server = photo_server.PhotoServerProcess(host='127.0.0.1', port=LOAD_TEST_PORT)
+        server.start()
+    else:
+        threading.Thread(target=photo_server.app.run,
+                         kwargs={'host': '127.0.0.1', 'port': LOAD_TEST_PORT, 'threaded': True},
+                         daemon=True).start()
+
+    if not wait_for_server(url):
+        print("ERROR: server did not start")
+        if server:
+            server.stop()
+        return
+
+    photos = make_test_photos(1 if transfer_only else clients * uploads)
+    size = sum(os.path.getsize(path) for path in photos) / len(photos)
+    print(f"Mode: {mode} - {clients} clients x {uploads} uploads of {size / 1024:.0f} KB "
+          f"({'one shared image, transfer only' if transfer_only else 'distinct images'})")
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    intervals = []
+    last_tick = [time.perf_counter()]
+
+    def tick():
+        now = time.perf_counter()
+        intervals.append((now - last_tick[0]) * 1000)
+        last_tick[0] = now
+
+    timer = QTimer()
+    timer.timeout.connect(tick)
+    timer.start(FRAME_INTERVAL_MS)
+
+    latencies, errors = [], []
+    if transfer_only:
+        batches = [photos * uploads for _ in range(clients)]
+    else:
+        batches = [photos[client * uploads:(client + 1) * uploads] for client in range(clients)]
+    workers = [threading.Thread(target=upload_worker, args=(url, batch, latencies, errors))
+               for batch in batches]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+
+    def check_done():
+        if not any(worker.is_alive() for worker in workers):
+            app.quit()
+
+    done_timer = QTimer()
+    done_timer.timeout.connect(check_done)
+    done_timer.start(100)
+    app.exec()
+    elapsed = time.perf_counter() - start
+
+    timer.stop()
+    if server:
+        server.stop()
+
+    intervals.sort()
+    late = sum(1 for interval in intervals if interval > FRAME_INTERVAL_MS * 2)
+    print(f"\nUploads: {len(latencies)} in {elapsed:.1f}s ({len(errors)} errors)")
+    if latencies:
+        print(f"Upload latency: median {statistics.median(latencies) * 1000:.0f} ms, "
+              f"max {max(latencies) * 1000:.0f} ms")
+    if intervals:
+        p95 = intervals[int(len(intervals) * 0.95) - 1]
+        print(f"UI ticks: {len(intervals)}, effective {len(intervals) / elapsed:.1f} FPS")
+        print(f"Tick interval: median {statistics.median(intervals):.1f} ms, "
+              f"p95 {p95:.1f} ms, max {intervals[-1]:.1f} ms")
+        print(f"Dropped frames (>{FRAME_INTERVAL_MS * 2} ms): {late}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Photo server load test')
+    parser.add_argument('--mode', choices=['thread', 'process'], default='process',
+                        help='thread = dev server inside this process, process = production server')
+    parser.add_argument('--clients', type=int, default=6, help='Concurrent uploading phones')
+    parser.add_argument('--uploads', type=int, default=10, help='Uploads per phone')
+    parser.add_argument('--transfer-only', action='store_true',
+                        help='Send the same image every time (deduplicated, so no ingest work)')
+    args = parser.parse_args()
+
+    try:
+        db = DatabaseManager()
+        db.initialize_database()
+        db.close()
+        run_load_test(args.mode, args.clients, args.uploads, args.transfer_only)
+    finally:
+        shutil.rmtree(LOAD_TEST_DIR, ignore_errors=True)
@@ -8,7 +8,7 @@ import sys
 import os
 from pathlib import Path
 from PySide6.QtWidgets import QApplication, QMainWindow, QStackedWidget
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont
 
 # Import screens
@@ -25,12 +25,33 @@ from qt_screens.placeholder_screen import PlaceholderScreen
 from qt_screens.settings_users_screen import SettingsUsersScreen
 from qt_screens.settings_tortoises_screen import SettingsTortoisesScreen
 from qt_screens.tortoise_selection_screen import TortoiseSelectionScreen
+from qt_screens.diagnostics_screen import DiagnosticsScreen
+from qt_screens.feeding_screen import FeedingScreen
 
 # Import database
 from database.db_manager import DatabaseManager
 
+# Import the application stylesheet
+from design_system.theme import apply_theme
+
+# Import icon atlas preloading
+from qt_screens.icon_manager import preload_icons
+
 # Import photo server
-from photo_server import run_photo_server_background
+from photo_server import PhotoServerProcess
+
+# Import background photo folder import
+from utils.photo_import import get_photo_watcher
+
+# Import plant name lookup (indexed in the background)
+from utils.plant_lookup import get_plant_lookup
+
+# Import runtime instrumentation
+from utils.instrumentation import instrumentation, snapshot_path
+from utils.query_stats import query_stats, enable_log_file, SLOW_LOG_FILE
+
+# How often the instrumentation summary is written for the photo server's /api/diagnostics
+DIAGNOSTICS_SNAPSHOT_MS = 10000
 
 class TortoiseCareApp(QMainWindow):
     """Main application window with screen management"""
@@ -48,13 +69,38 @@ class TortoiseCareApp(QMainWindow):
         except Exception as e:
             print(f"Database initialization error: {e}")
         
-        # Start photo upload server in background
+        # Runtime instrumentation (TORTOISE_INSTRUMENTATION=1 or the diagnostics screen)
+        if instrumentation.configure(self.db_manager):
+            # Reopen the connection so its queries are timed too
+            self.db_manager.close()
+            print("Instrumentation enabled")
+        self.diagnostics_path = snapshot_path(self.db_manager.db_path)
+        # Slow queries (with their query plans) go to a log next to the database
+        enable_log_file(os.path.join(os.path.dirname(self.diagnostics_path), SLOW_LOG_FILE))
+        self.diagnostics_timer = QTimer(self)
+        self.diagnostics_timer.timeout.connect(self.write_diagnostics)
+        self.diagnostics_timer.start(DIAGNOSTICS_SNAPSHOT_MS)
+        
+        # Start photo upload server in its own process
+        self.photo_server = None
         try:
-            self.photo_server_thread = run_photo_server_background()
+            self.photo_server = PhotoServerProcess()
+            self.photo_server.start()
             print("Photo upload server started successfully")
         except Exception as e:
             print(f"Warning: Could not start photo server: {e}")
         
+        # Watch the photo import folder for new growth photos
+        self.photo_watcher = None
+        import_folder = self.db_manager.get_setting('photo_import_folder')
+        if import_folder and os.path.isdir(import_folder):
+            self.photo_watcher = get_photo_watcher(import_folder, self.db_manager.db_path)
+            self.photo_watcher.start()
+            print(f"Watching {import_folder} for new photos")
+        
+        # Build the plant name index in the background before anyone types a name
+        get_plant_lookup(self.db_manager).warm()
+        
         # Initialize UI
         self.init_ui()
         self.setup_screens()
@@ -124,22 +170,8 @@ class TortoiseCareApp(QMainWindow):
         )
         self.stacked_widget.addWidget(self.screens['select_tortoise_care'])
         
-        # Placeholder screens for unimplemented features
-        
         # Feeding screen
-        self.screens['feeding'] = PlaceholderScreen(
-            self.db_manager, self,
-            'Feed Tortoise',
-            'Complete feeding tracking system with plant safety integration.',
-            [
-                'Weight-based feeding sessions',
-                'Plant safety indicators (green/yellow/red)',
-                'Supplement tracking (calcium, vitamins)',
-                'Multi-user feeding logs',
-                'Behavior notes and observations',
-                'Integration with plant database'
-            ]
-        )
+        self.screens['feeding'] = FeedingScreen(self.db_manager, self)
         self.stacked_widget.addWidget(self.screens['feeding'])
         
         # Habitat monitoring screen
@@ -174,6 +206,10 @@ class TortoiseCareApp(QMainWindow):
         )
         self.stacked_widget.addWidget(self.screens['about'])
         
+        # Diagnostics screen
+        self.screens['diagnostics'] = DiagnosticsScreen(self.db_manager, self)
+        self.stacked_widget.addWidget(self.screens['diagnostics'])
+        
         # Set home as default screen
         self.show_screen('home')
         
@@ -185,12 +221,26 @@ class TortoiseCareApp(QMainWindow):
             
             # Refresh screen if it has an on_enter method
             if hasattr(screen, 'on_enter'):
-                screen.on_enter()
+                with instrumentation.timed('screen', f"{type(screen).__name__}.on_enter"):
+                    screen.on_enter()
         else:
             print(f"Warning: Screen '{screen_name}' not found")
     
+    def write_diagnostics(self):
+        """Share the instrumentation summary with the photo server process"""
+        if instrumentation.enabled:
+            instrumentation.write_snapshot(self.diagnostics_path,
+                                           {'queries': query_stats.summary(),
+                                            'slow_queries': list(query_stats.slow_queries)})
+    
     def closeEvent(self, event):
         """Handle application close event"""
+        # Let in-flight uploads and imports finish before exiting
+        if self.photo_server:
+            self.photo_server.stop()
+        if self.photo_watcher:
+            self.photo_watcher.stop()
+        
         # Close database connection
         if self.db_manager:
             self.db_manager.close()
@@ -205,6 +255,12 @@ def main():
     app.setApplicationName("Tortoise Care Touch")
     app.setApplicationVersion("0.3.0-alpha")
     
+    # One stylesheet for the whole app, parsed once
+    apply_theme(app)
+    
+    # Decode the icon atlases before the screens are built
+    preload_icons()
+    
     # Enable high DPI scaling for touch displays (Qt 6.0+ handles this automatically)
     # app.setAttribute(Qt.AA_EnableHighDpiScaling, True)  # Deprecated in Qt 6+
     
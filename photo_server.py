@@ -5,24 +5,215 @@ Allows phones to upload tortoise photos via web interface
 """
 
 import os
+import re
+import queue
+import signal
 import threading
-from flask import Flask, request, render_template_string, redirect, url_for, jsonify
-from werkzeug.utils import secure_filename
+import multiprocessing
+import time
+import uuid
+from collections import OrderedDict
+from flask import Flask, Request, request, redirect, url_for, jsonify, abort
 from database.db_manager import DatabaseManager
+from utils import photo_store
+from utils.photo_pipeline import get_ingest_queue, generate_derivatives, photo_taken_date
+from utils.instrumentation import instrumentation, snapshot_path, read_snapshot
+
+# Batch uploads get a larger body limit than single photo posts
+BATCH_UPLOAD_PATH = '/api/uploads'
+BATCH_MAX_CONTENT_LENGTH = 256 * 1024 * 1024
+MAX_BATCH_FILES = 200
+
+class PhotoRequest(Request):
+    """Request that streams uploaded files to disk while hashing them"""
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return photo_store.HashingFile()
+    
+    @property
+    def max_content_length(self):
+        if self.path == BATCH_UPLOAD_PATH:
+            return BATCH_MAX_CONTENT_LENGTH
+        return super().max_content_length
 
 app = Flask(__name__)
+app.request_class = PhotoRequest
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 
-# Photo storage directory
-PHOTOS_DIR = os.path.join(os.path.dirname(__file__), 'photos')
+# Photo storage directory (content-addressed, shared with the Qt screens)
+PHOTOS_DIR = photo_store.PHOTOS_DIR
 os.makedirs(PHOTOS_DIR, exist_ok=True)
 
+# Production server settings (waitress in a separate process)
+PHOTO_SERVER_HOST = '0.0.0.0'
+PHOTO_SERVER_PORT = 5555
+SERVER_THREADS = 4          # Concurrent requests handled at once
+CONNECTION_LIMIT = 32       # Further connections wait in the listen backlog
+CHANNEL_TIMEOUT = 30        # Seconds before an idle/stalled connection is dropped
+SHUTDOWN_TIMEOUT = 10       # Seconds to wait for in-flight uploads on stop
+
+# Content-addressed files never change, so browsers may cache them for a year
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+# Matches <aa>/<sha256>.<ext> and <aa>/derivatives/<sha256>_<variant>_<size>q<quality>.<ext>
+# (derivatives made before the settings were in the name have no _<size>q<quality>)
+CONTENT_PATH_RE = re.compile(
+    r'^[0-9a-f]{2}/(?:derivatives/)?([0-9a-f]{64})(?:_([a-z]+)(?:_(\d+q\d+))?)?\.[a-z0-9]+$')
+
+# CSS width of the current photo on the upload page
+UPLOAD_PAGE_PHOTO_SIZE = 150
+
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+@app.template_filter('photo_url')
+def photo_url_filter(photo_path):
+    """URL of a stored photo relative to the photo root"""
+    return url_for('serve_photo', filename=photo_relative_path(photo_path))
+
+def photo_relative_path(photo_path):
+    """Path of a stored photo relative to the photo root, as used in /photo/ URLs"""
+    relative_path = os.path.relpath(photo_path, PHOTOS_DIR).replace(os.sep, '/')
+    if relative_path.startswith('..'):
+        relative_path = os.path.basename(photo_path)
+    return relative_path
+
+# One DatabaseManager per server thread, so requests reuse an open connection
+_thread_state = threading.local()
+
+def get_db():
+    """Get this thread's database manager"""
+    db = getattr(_thread_state, 'db', None)
+    if db is None:
+        db = DatabaseManager()
+        _thread_state.db = db
+    return db
+
+class VersionedCache:
+    """Values cached until the table_versions counters they were built from change"""
+    
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+    
+    def get(self, key, version, loader):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] == version:
+                return entry[1]
+        value = loader()
+        with self.lock:
+            self.entries[key] = (version, value)
+        return value
+
+listing_cache = VersionedCache()
+
+class BatchUploadQueue:
+    """Processes batch uploads on a worker thread and tracks per-file progress"""
+    
+    def __init__(self, max_jobs=50):
+        self.jobs = OrderedDict()
+        self.max_jobs = max_jobs
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.worker = None
+    
+    def submit(self, files, purpose):
+        """
+        Queue stored photos for processing
+        
+        Args:
+            files: List of dicts with name, tortoise_id, path, is_new and status
+            purpose: 'profile' to set the tortoise photo, 'growth' to add growth records
+            
+        Returns:
+            str: Job ID
+        """
+        job_id = uuid.uuid4().hex[:12]
+        job = {'id': job_id, 'purpose': purpose, 'created': time.time(), 'files': files}
+        with self.lock:
+            self.jobs[job_id] = job
+            # Forget the oldest finished jobs so a long-running server doesn't grow
+            # forever; queued and running jobs are kept so their status can be polled
+            excess = len(self.jobs) - self.max_jobs
+            if excess > 0:
+                finished = [old_id for old_id, old_job in self.jobs.items()
+                            if not any(f['status'] in ('queued', 'processing') for f in old_job['files'])]
+                for old_id in finished[:excess]:
+                    del self.jobs[old_id]
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = threading.Thread(target=self._run, name='batch-upload', daemon=True)
+                self.worker.start()
+        self.queue.put(job)
+        return job_id
+    
+    def get_job(self, job_id):
+        """Get a snapshot of a job's progress, or None if unknown"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            files = [dict(f) for f in job['files']]
+        counts = {status: sum(1 for f in files if f['status'] == status)
+                  for status in ('queued', 'processing', 'done', 'duplicate', 'error', 'rejected')}
+        return {
+            'id': job['id'],
+            'purpose': job['purpose'],
+            'total': len(files),
+            'completed': counts['done'] + counts['duplicate'] + counts['error'] + counts['rejected'],
+            'finished': counts['queued'] == 0 and counts['processing'] == 0,
+            'counts': counts,
+            'files': files,
+        }
+    
+    def set_status(self, item, status, error=None):
+        with self.lock:
+            item['status'] = status
+            item['error'] = error
+    
+    def _run(self):
+        # The worker owns its own connection - SQLite connections can't cross threads
+        db = DatabaseManager()
+        try:
+            while True:
+                job = self.queue.get()
+                # Looked up per job, so users added or removed while the server runs are seen
+                user = next(iter(db.get_users()), None) if job['purpose'] == 'growth' else None
+                for item in job['files']:
+                    if item['status'] != 'queued':
+                        continue
+                    self.set_status(item, 'processing')
+                    try:
+                        self.set_status(item, self._process(db, job['purpose'], item, user))
+                    except Exception as e:
+                        self.set_status(item, 'error', str(e))
+                self.queue.task_done()
+        finally:
+            db.close()
+    
+    def _process(self, db, purpose, item, user):
+        """Process one stored photo and return its final status ('done' or 'duplicate')"""
+        if item['is_new']:
+            db.add_photo_derivatives(item['path'], generate_derivatives(item['path']))
+        
+        if purpose == 'growth':
+            if user is None:
+                raise ValueError('No user available to record growth photos')
+            # Same content is stored at the same path - don't record it twice
+            if db.get_existing_growth_photos([item['path']]):
+                return 'duplicate'
+            db.add_growth_record(item['tortoise_id'], user['id'],
+                                 measurement_date=photo_taken_date(item['path']),
+                                 photo_path=item['path'], notes='Uploaded from phone')
+        else:
+            db.update_tortoise_photo(item['tortoise_id'], item['path'])
+        return 'done'
+
+batch_queue = BatchUploadQueue()
+
 # HTML template for upload interface
 UPLOAD_TEMPLATE = """
 <!DOCTYPE html>
@@ -97,6 +288,19 @@ UPLOAD_TEMPLATE = """
             border-radius: 5px;
             margin: 10px 0;
         }
+        .batch-list {
+            list-style: none;
+            padding: 0;
+            font-size: 14px;
+        }
+        .batch-list li {
+            padding: 4px 0;
+            border-bottom: 1px solid #eee;
+        }
+        .batch-progress {
+            width: 100%;
+            margin: 10px 0;
+        }
         .error {
             background-color: #f8d7da;
             color: #721c24;
@@ -116,6 +320,28 @@ UPLOAD_TEMPLATE = """
         <div class="{{ 'success' if success else 'error' }}">{{ message }}</div>
     {% endif %}
     
+    {% if tortoises %}
+        <div class="tortoise-card">
+            <div class="tortoise-name">Upload Many Photos</div>
+            <form id="batch-form" class="upload-form">
+                <select name="tortoise_id" class="file-input">
+                    {% for tortoise in tortoises %}
+                        <option value="{{ tortoise.id }}">{{ tortoise.name }}</option>
+                    {% endfor %}
+                </select>
+                <select name="purpose" class="file-input">
+                    <option value="growth">Growth photos (one record per photo)</option>
+                    <option value="profile">Profile photo</option>
+                </select>
+                <input type="file" name="photos" accept="image/*" multiple class="file-input" required>
+                <button type="submit" class="upload-btn">Upload Photos</button>
+            </form>
+            <progress id="batch-progress" class="batch-progress" value="0" max="100" hidden></progress>
+            <div id="batch-summary" class="tortoise-info"></div>
+            <ul id="batch-files" class="batch-list"></ul>
+        </div>
+    {% endif %}
+    
     {% for tortoise in tortoises %}
         <div class="tortoise-card">
             <div class="tortoise-name">{{ tortoise.name }}</div>
@@ -126,7 +352,7 @@ UPLOAD_TEMPLATE = """
             </div>
             
             {% if tortoise.photo_path %}
-                <img src="/photo/{{ tortoise.photo_path.split('/')[-1] }}" class="current-photo" alt="Current photo">
+                <img src="{{ tortoise.photo_path | photo_url }}" class="current-photo" alt="Current photo">
             {% endif %}
             
             <form method="post" enctype="multipart/form-data" class="upload-form">
@@ -142,24 +368,86 @@ UPLOAD_TEMPLATE = """
             <p>No tortoises found. Please add tortoises in the main application first.</p>
         </div>
     {% endif %}
+    
+    <script>
+        const form = document.getElementById('batch-form');
+        const progress = document.getElementById('batch-progress');
+        const summary = document.getElementById('batch-summary');
+        const fileList = document.getElementById('batch-files');
+        
+        function showJob(job) {
+            summary.textContent = job.completed + ' of ' + job.total + ' processed';
+            fileList.innerHTML = '';
+            job.files.forEach(function (file) {
+                const item = document.createElement('li');
+                item.textContent = file.name + ': ' + file.status + (file.error ? ' - ' + file.error : '');
+                fileList.appendChild(item);
+            });
+            progress.value = job.total ? 100 * job.completed / job.total : 100;
+            if (!job.finished) {
+                setTimeout(function () {
+                    fetch(job.status_url).then(function (r) { return r.json(); }).then(showJob);
+                }, 1000);
+            }
+        }
+        
+        if (form) {
+            form.addEventListener('submit', function (event) {
+                event.preventDefault();
+                const request = new XMLHttpRequest();
+                request.open('POST', '/api/uploads');
+                progress.hidden = false;
+                request.upload.onprogress = function (e) {
+                    if (e.lengthComputable) {
+                        progress.value = 100 * e.loaded / e.total;
+                        summary.textContent = 'Uploading... ' + Math.round(progress.value) + '%';
+                    }
+                };
+                request.onload = function () {
+                    const job = JSON.parse(request.responseText);
+                    if (request.status >= 400) {
+                        summary.textContent = job.error;
+                    } else {
+                        showJob(job);
+                    }
+                };
+                request.onerror = function () { summary.textContent = 'Upload failed'; };
+                request.send(new FormData(form));
+            });
+        }
+    </script>
 </body>
 </html>
 """
 
+# Compiled once; render_template_string would look the source up on every request
+UPLOAD_PAGE = app.jinja_env.from_string(UPLOAD_TEMPLATE)
+
 @app.route('/')
 def upload_page():
     """Main upload page showing all tortoises"""
-    db = DatabaseManager()
-    try:
+    db = get_db()
+    image_format = 'webp' if 'image/webp' in request.headers.get('Accept', '') else 'jpeg'
+    version = (db.get_table_version('tortoises'), db.get_table_version('photo_derivatives'))
+    
+    def load_tortoises():
+        # Point the page at small derivatives instead of full-size originals
         tortoises = db.get_all_tortoises()
-        message = request.args.get('message')
-        success = request.args.get('success') == 'true'
-        return render_template_string(UPLOAD_TEMPLATE, 
-                                    tortoises=tortoises, 
-                                    message=message, 
-                                    success=success)
-    finally:
-        db.close()
+        for tortoise in tortoises:
+            if tortoise.get('photo_path'):
+                tortoise['photo_path'] = db.get_best_photo_path(
+                    tortoise['photo_path'], UPLOAD_PAGE_PHOTO_SIZE, image_format)
+        return tortoises
+    
+    tortoises = listing_cache.get(('page', image_format), version, load_tortoises)
+    message = request.args.get('message')
+    success = request.args.get('success') == 'true'
+    response = app.make_response(UPLOAD_PAGE.render(tortoises=tortoises,
+                                                    message=message,
+                                                    success=success))
+    # The photo URLs on the page depend on whether the browser accepts WebP
+    response.vary.add('Accept')
+    return response
 
 @app.route('/', methods=['POST'])
 def upload_photo():
@@ -177,26 +465,22 @@ def upload_photo():
         return redirect(url_for('upload_page', message='No tortoise selected', success='false'))
     
     if file and allowed_file(file.filename):
-        # Create secure filename
-        original_filename = secure_filename(file.filename)
-        filename = f"tortoise_{tortoise_id}_{original_filename}"
-        filepath = os.path.join(PHOTOS_DIR, filename)
-        
         try:
-            # Save the file
-            file.save(filepath)
+            # Move the already hashed upload into the store (no-op for duplicates)
+            filepath, is_new = photo_store.store_upload(file)
+            
+            # Resize off the request thread - viewers fall back to the original until done
+            db = get_db()
+            if is_new:
+                get_ingest_queue(db.db_path).submit(filepath)
             
             # Update database with photo path
-            db = DatabaseManager()
-            try:
-                db.update_tortoise_photo(int(tortoise_id), filepath)
-                tortoise = db.get_tortoise_by_id(int(tortoise_id))
-                tortoise_name = tortoise['name'] if tortoise else 'Unknown'
-                return redirect(url_for('upload_page', 
-                               message=f'Photo uploaded successfully for {tortoise_name}!', 
-                               success='true'))
-            finally:
-                db.close()
+            db.update_tortoise_photo(int(tortoise_id), filepath)
+            tortoise = db.get_tortoise_by_id(int(tortoise_id))
+            tortoise_name = tortoise['name'] if tortoise else 'Unknown'
+            return redirect(url_for('upload_page', 
+                           message=f'Photo uploaded successfully for {tortoise_name}!', 
+                           success='true'))
                 
         except Exception as e:
             return redirect(url_for('upload_page', 
@@ -207,48 +491,214 @@ def upload_photo():
                        message='Invalid file type. Please upload PNG, JPG, JPEG, GIF, or WebP files.', 
                        success='false'))
 
-@app.route('/photo/<filename>')
+@app.route(BATCH_UPLOAD_PATH, methods=['POST'])
+def batch_upload():
+    """Accept many photos in one request and process them in the background"""
+    files = [f for f in request.files.getlist('photos') if f.filename]
+    tortoise_ids = request.form.getlist('tortoise_id')
+    purpose = request.form.get('purpose', 'profile')
+    
+    if purpose not in ('profile', 'growth'):
+        return jsonify({'error': 'purpose must be profile or growth'}), 400
+    if not files:
+        return jsonify({'error': 'No files selected'}), 400
+    if len(files) > MAX_BATCH_FILES:
+        return jsonify({'error': f'At most {MAX_BATCH_FILES} photos per batch'}), 400
+    if len(tortoise_ids) not in (1, len(files)):
+        return jsonify({'error': 'Send one tortoise_id, or one per photo'}), 400
+    
+    active_ids = {t['id'] for t in get_db().get_all_tortoises()}
+    items = []
+    for index, file in enumerate(files):
+        item = {'name': file.filename, 'tortoise_id': None, 'path': None,
+                'is_new': False, 'status': 'queued', 'error': None}
+        raw_id = tortoise_ids[index] if len(tortoise_ids) > 1 else tortoise_ids[0]
+        tortoise_id = int(raw_id) if raw_id.isdigit() else None
+        
+        if tortoise_id not in active_ids:
+            item.update(status='rejected', error='Unknown tortoise')
+        elif not allowed_file(file.filename):
+            item.update(status='rejected', error='Invalid file type')
+        else:
+            # Already streamed to disk while parsing - this is just a rename
+            path, is_new = photo_store.store_upload(file)
+            item.update(tortoise_id=tortoise_id, path=path, is_new=is_new)
+        items.append(item)
+    
+    job_id = batch_queue.submit(items, purpose)
+    response = jsonify(job_status_json(batch_queue.get_job(job_id)))
+    response.status_code = 202
+    response.headers['Location'] = url_for('batch_upload_status', job_id=job_id)
+    return response
+
+@app.route(BATCH_UPLOAD_PATH + '/<job_id>')
+def batch_upload_status(job_id):
+    """Per-file progress and results of a batch upload"""
+    job = batch_queue.get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown upload job'}), 404
+    response = jsonify(job_status_json(job))
+    response.cache_control.no_store = True
+    return response
+
+def job_status_json(job):
+    """Public view of a job snapshot - photo URLs instead of filesystem paths"""
+    for item in job['files']:
+        path = item.pop('path')
+        item.pop('is_new')
+        item['photo_url'] = photo_url_filter(path) if path else None
+    job['status_url'] = url_for('batch_upload_status', job_id=job['id'])
+    return job
+
+def content_etag(filename):
+    """
+    Strong ETag for a photo whose bytes never change under its name, None for anything else
+
+    Originals are named by their hash and derivatives also by their size and
+    quality. Older derivative names without the settings can be regenerated
+    with different bytes, so they get None and are revalidated.
+    """
+    match = CONTENT_PATH_RE.match(filename)
+    if not match:
+        return None
+    digest, variant, settings = match.groups()
+    if variant:
+        return f"{digest}-{variant}-{settings}" if settings else None
+    return digest
+
+@app.route('/photo/<path:filename>')
 def serve_photo(filename):
-    """Serve uploaded photos"""
+    """Serve uploaded photos with caching, 304 and Range support"""
     from flask import send_from_directory
-    return send_from_directory(PHOTOS_DIR, filename)
+    # Hidden paths such as a legacy .incoming folder are never photos
+    if any(part.startswith('.') for part in filename.split('/')):
+        abort(404)
+    etag = content_etag(filename)
+    if etag:
+        response = send_from_directory(PHOTOS_DIR, filename, conditional=True,
+                                       etag=etag, max_age=IMMUTABLE_MAX_AGE)
+        response.cache_control.immutable = True
+    else:
+        # Legacy filenames can be overwritten - always revalidate
+        response = send_from_directory(PHOTOS_DIR, filename, conditional=True)
+        response.cache_control.no_cache = True
+    return response
 
 @app.route('/api/tortoises')
 def api_tortoises():
-    """API endpoint to get tortoise list"""
-    db = DatabaseManager()
+    """API endpoint to get tortoise list (ETag lets polling clients get 304s)"""
+    db = get_db()
+    version = db.get_table_version('tortoises')
+    tortoises = listing_cache.get('api', version, lambda: [{
+        'id': t['id'],
+        'name': t['name'],
+        'species': t['species'],
+        'has_photo': bool(t.get('photo_path'))
+    } for t in db.get_all_tortoises()])
+    
+    response = jsonify(tortoises)
+    response.set_etag(f"tortoises-{version}")
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+@app.route('/api/diagnostics')
+def api_diagnostics():
+    """Instrumentation summaries for this server process and the app (from its last snapshot)"""
+    response = jsonify({
+        'server': instrumentation.summary(),
+        'app': read_snapshot(snapshot_path(get_db().db_path)),
+    })
+    response.cache_control.no_store = True
+    return response
+
+def print_access_urls(port=PHOTO_SERVER_PORT):
+    """Print the URLs the upload page can be reached on"""
+    import socket
     try:
-        tortoises = db.get_all_tortoises()
-        return jsonify([{
-            'id': t['id'],
-            'name': t['name'],
-            'species': t['species'],
-            'has_photo': bool(t.get('photo_path'))
-        } for t in tortoises])
-    finally:
-        db.close()
+        local_ip = socket.gethostbyname(socket.gethostname())
+    except OSError:
+        local_ip = 'localhost'
+    print(f"Access from phone: http://{local_ip}:{port}")
+    print(f"Local access: http://localhost:{port}")
 
 def start_photo_server():
-    """Start the photo upload server in background"""
+    """Start the Flask development server (blocks)"""
     try:
-        # Get local IP address
-        import socket
-        hostname = socket.gethostname()
-        local_ip = socket.gethostbyname(hostname)
-        
-        print(f"Photo upload server starting...")
-        print(f"Access from phone: http://{local_ip}:5555")
-        print(f"Local access: http://localhost:5555")
+        photo_store.sweep_incoming()
+        print(f"Photo upload server starting (development mode)...")
+        print_access_urls()
         
-        app.run(host='0.0.0.0', port=5555, debug=False, threaded=True)
+        app.run(host=PHOTO_SERVER_HOST, port=PHOTO_SERVER_PORT, debug=False, threaded=True)
     except Exception as e:
         print(f"Error starting photo server: {e}")
 
 def run_photo_server_background():
-    """Run photo server in a background thread"""
+    """Run the development server in a background thread"""
     server_thread = threading.Thread(target=start_photo_server, daemon=True)
     server_thread.start()
     return server_thread
 
+def serve_production(host=PHOTO_SERVER_HOST, port=PHOTO_SERVER_PORT):
+    """Serve the app with waitress until SIGTERM/SIGINT (blocks)"""
+    from waitress import create_server
+    
+    server = create_server(app, host=host, port=port,
+                           threads=SERVER_THREADS,
+                           connection_limit=CONNECTION_LIMIT,
+                           channel_timeout=CHANNEL_TIMEOUT,
+                           max_request_body_size=BATCH_MAX_CONTENT_LENGTH,
+                           ident='tortoise-care-photos')
+    
+    # waitress shuts its worker threads down cleanly on SystemExit
+    def handle_stop(signum, frame):
+        raise SystemExit(0)
+    signal.signal(signal.SIGTERM, handle_stop)
+    
+    # This process has its own instrumentation; turn it on the same way the app does
+    settings_db = DatabaseManager()
+    if instrumentation.configure(settings_db):
+        print("Photo server instrumentation enabled")
+    settings_db.close()
+    
+    photo_store.sweep_incoming()
+    print(f"Photo upload server starting ({SERVER_THREADS} worker threads)...")
+    print_access_urls(port)
+    server.run()
+
+class PhotoServerProcess:
+    """Runs the production photo server in its own process, away from the UI's GIL"""
+    
+    def __init__(self, host=PHOTO_SERVER_HOST, port=PHOTO_SERVER_PORT):
+        self.host = host
+        self.port = port
+        self.process = None
+    
+    def start(self):
+        """Start the server process"""
+        # spawn rather than fork - forking a running Qt process is unsafe
+        context = multiprocessing.get_context('spawn')
+        self.process = context.Process(target=serve_production, args=(self.host, self.port),
+                                       name='photo-server', daemon=True)
+        self.process.start()
+        return self.process
+    
+    def is_running(self):
+        return self.process is not None and self.process.is_alive()
+    
+    def stop(self, timeout=SHUTDOWN_TIMEOUT):
+        """Ask the server to finish in-flight requests and exit, killing it after timeout"""
+        if not self.is_running():
+            return
+        self.process.terminate()
+        self.process.join(timeout)
+        if self.process.is_alive():
+            print("Photo server did not stop in time, killing it")
+            self.process.kill()
+            self.process.join()
+
 if __name__ == '__main__':
-    start_photo_server()
\ No newline at end of file
+    import sys
+    if '--dev' in sys.argv:
+        start_photo_server()
+    else:
+        serve_production()
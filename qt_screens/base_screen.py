@@ -4,28 +4,11 @@ Base screen class for PySide6 screens with common functionality
 
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QFont
+from PySide6.QtGui import QFont, QPixmap
 
-# Import our sophisticated design system
-try:
-    from design_system.colors import APP_COLORS
-except ImportError:
-    # Fallback colors if design system not available
-    APP_COLORS = {
-        'core': {
-            'blue_gray': '#5a7a8a',
-            'purple_gray': '#6b5a8a', 
-            'teal_gray': '#5a8a7a',
-        },
-        'extended': {
-            'success': '#28a745',
-            'warning': '#ffc107',
-            'error': '#dc3545',
-        },
-        'text': {
-            'secondary': '#333333'
-        }
-    }
+# Button looks come from the application stylesheet
+from design_system.theme import BUTTON_VARIANTS
+from utils.instrumentation import instrumentation
 
 class BaseScreen(QWidget):
     """Base class for all application screens with common UI elements"""
@@ -37,7 +20,8 @@ class BaseScreen(QWidget):
         
         # Initialize UI
         self.init_base_ui()
-        self.build_ui()
+        with instrumentation.timed('screen', f"{type(self).__name__}.build_ui"):
+            self.build_ui()
         
     def init_base_ui(self):
         """Initialize common UI elements"""
@@ -63,92 +47,8 @@ class BaseScreen(QWidget):
         # Set minimum height for touch interface
         button.setMinimumHeight(65)  # Touch-friendly height
         
-        # Apply styling with design system colors - optimized for touch
-        if style_class == 'primary':
-            button.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {APP_COLORS['core']['blue_gray']};
-                    color: white;
-                    border: none;
-                    border-radius: 10px;
-                    padding: 12px;
-                    font-weight: bold;
-                }}
-                QPushButton:hover {{
-                    background-color: {APP_COLORS['blue_gray_family']['dark']};
-                }}
-                QPushButton:pressed {{
-                    background-color: {APP_COLORS['blue_gray_family']['darker']};
-                }}
-            """)
-        elif style_class == 'secondary':
-            button.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {APP_COLORS['core']['teal_gray']};
-                    color: white;
-                    border: none;
-                    border-radius: 10px;
-                    padding: 12px;
-                    font-weight: bold;
-                }}
-                QPushButton:hover {{
-                    background-color: {APP_COLORS['teal_gray_family']['dark']};
-                }}
-                QPushButton:pressed {{
-                    background-color: {APP_COLORS['teal_gray_family']['darker']};
-                }}
-            """)
-        elif style_class == 'warning':
-            button.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {APP_COLORS['core']['purple_gray']};
-                    color: white;
-                    border: none;
-                    border-radius: 10px;
-                    padding: 12px;
-                    font-weight: bold;
-                }}
-                QPushButton:hover {{
-                    background-color: {APP_COLORS['purple_gray_family']['dark']};
-                }}
-                QPushButton:pressed {{
-                    background-color: {APP_COLORS['purple_gray_family']['darker']};
-                }}
-            """)
-        elif style_class == 'danger':
-            button.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {APP_COLORS['extended']['error']};
-                    color: white;
-                    border: none;
-                    border-radius: 10px;
-                    padding: 12px;
-                    font-weight: bold;
-                }}
-                QPushButton:hover {{
-                    background-color: #c82333;
-                }}
-                QPushButton:pressed {{
-                    background-color: #a71e2a;
-                }}
-            """)
-        else:  # default
-            button.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {APP_COLORS['text']['secondary']};
-                    color: white;
-                    border: none;
-                    border-radius: 10px;
-                    padding: 12px;
-                    font-weight: bold;
-                }}
-                QPushButton:hover {{
-                    background-color: {APP_COLORS['text']['muted']};
-                }}
-                QPushButton:pressed {{
-                    background-color: {APP_COLORS['blue_gray_family']['darker']};
-                }}
-            """)
+        # Styled by the application stylesheet (design_system/theme.py)
+        button.setProperty('variant', style_class if style_class in BUTTON_VARIANTS else 'default')
         
         # Connect callback
         button.clicked.connect(callback)
@@ -164,25 +64,7 @@ class BaseScreen(QWidget):
             from .icon_manager import create_icon_button
             back_button = create_icon_button("back", "Back", (24, 24), self.go_back)
             back_button.setMaximumWidth(120)
-            back_button.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {APP_COLORS['text']['secondary']};
-                    color: white;
-                    border: none;
-                    border-radius: 10px;
-                    padding: 12px;
-                    font-weight: bold;
-                    text-align: left;
-                    padding-left: 18px;
-                    font-size: 14px;
-                }}
-                QPushButton:hover {{
-                    background-color: {APP_COLORS['text']['muted']};
-                }}
-                QPushButton:pressed {{
-                    background-color: {APP_COLORS['blue_gray_family']['darker']};
-                }}
-            """)
+            back_button.setProperty('variant', 'back')
             header_layout.addWidget(back_button)
             
         # Title label
@@ -192,7 +74,7 @@ class BaseScreen(QWidget):
         title_font.setBold(True)
         title_label.setFont(title_font)
         title_label.setAlignment(Qt.AlignCenter)
-        title_label.setStyleSheet(f"color: {APP_COLORS['core']['blue_gray']}; margin: 10px;")
+        title_label.setProperty('role', 'title')
         
         if show_back_button:
             header_layout.addWidget(title_label, 1)
@@ -217,10 +99,16 @@ class BaseScreen(QWidget):
         font.setBold(True)
         label.setFont(font)
         label.setAlignment(Qt.AlignCenter)
-        label.setStyleSheet(f"color: {APP_COLORS['core']['blue_gray']}; margin: 10px;")
+        label.setProperty('role', 'title')
         
         return label
         
+    def load_photo_pixmap(self, photo_path, size):
+        """Load the smallest stored variant of a photo that covers size pixels"""
+        best_path = self.db_manager.get_best_photo_path(photo_path, size)
+        with instrumentation.timed('image', f"{type(self).__name__} photo"):
+            return QPixmap(best_path)
+        
     def go_back(self):
         """Navigate back to home screen"""
         self.main_window.show_screen('home')
@@ -3,15 +3,21 @@ Care Reminders Screen - Task scheduling and notification system for daily tortoi
 """
 
 from PySide6.QtWidgets import (QVBoxLayout, QHBoxLayout, QGridLayout, QPushButton, 
-                              QLabel, QScrollArea, QWidget, QMessageBox,
+                              QLabel, QMessageBox,
                               QDialog, QFormLayout, QDialogButtonBox, QComboBox, 
                               QDateTimeEdit, QSpinBox, QTextEdit, QCheckBox, QFrame)
-from PySide6.QtCore import Qt, QDateTime, QDate, QTimer
+from PySide6.QtCore import Qt, QDateTime, QDate
 from PySide6.QtGui import QFont
 from .base_screen import BaseScreen
+from .record_list import RecordListView
 from .icon_manager import create_icon_button
+from utils.reminder_scheduler import get_reminder_scheduler
+from utils.recurrence import expand_reminders
 import datetime
 
+# How far ahead the 'Next 30 Days' view expands recurring reminders
+CALENDAR_DAYS = 30
+
 class AddReminderDialog(QDialog):
     """Dialog for adding new care reminders"""
     
@@ -141,6 +147,15 @@ class AddReminderDialog(QDialog):
         """)
         frequency_layout.addRow('Next Due:', self.next_due_input)
         
+        # What happens when the reminder is completed late
+        self.catch_up_combo = QComboBox()
+        self.catch_up_combo.addItem('Skip missed occurrences', 'skip')
+        self.catch_up_combo.addItem('Catch up one at a time', 'next')
+        self.catch_up_combo.addItem('Restart from completion', 'from_completion')
+        self.catch_up_combo.setStyleSheet(self.tortoise_combo.styleSheet())
+        self.catch_up_label = QLabel('If Missed:')
+        frequency_layout.addRow(self.catch_up_label, self.catch_up_combo)
+        
         layout.addWidget(frequency_group)
         
         # Set initial frequency options
@@ -180,6 +195,11 @@ class AddReminderDialog(QDialog):
         """Update frequency options based on reminder type"""
         reminder_type = self.reminder_type_combo.currentText()
         
+        # One-time reminders can't be missed more than once
+        if hasattr(self, 'catch_up_combo'):
+            self.catch_up_label.setVisible(reminder_type != 'once')
+            self.catch_up_combo.setVisible(reminder_type != 'once')
+        
         if reminder_type == 'daily':
             self.frequency_days_input.setValue(1)
             self.frequency_days_label.setVisible(False)
@@ -234,7 +254,8 @@ class AddReminderDialog(QDialog):
             'reminder_type': reminder_type,
             'frequency_days': frequency_days,
             'next_due_date': self.next_due_input.dateTime().toString(Qt.ISODate),
-            'priority': self.priority_combo.currentText()
+            'priority': self.priority_combo.currentText(),
+            'catch_up': self.catch_up_combo.currentData()
         }
 
 # Import QLineEdit at the top
@@ -284,12 +305,14 @@ class CareRemindersScreen(BaseScreen):
         # Reminders list area
         self.create_reminders_list_area()
         
-        # Setup auto-refresh timer
-        self.setup_refresh_timer()
-        
         # Load initial reminders
         self.current_filter = 'due'
+        self.calendar_occurrences = []
+        self.needs_refresh = False
         self.refresh_reminders()
+        
+        # Refresh when a reminder becomes due instead of polling
+        self.setup_scheduler()
     
     def create_quick_task_buttons(self, parent_layout):
         """Create quick task creation buttons"""
@@ -327,11 +350,12 @@ class CareRemindersScreen(BaseScreen):
         self.filter_due_btn = QPushButton('Due Today')
         self.filter_overdue_btn = QPushButton('Overdue')
         self.filter_upcoming_btn = QPushButton('Upcoming')
+        self.filter_calendar_btn = QPushButton('Next 30 Days')
         self.filter_all_btn = QPushButton('All Active')
         self.filter_completed_btn = QPushButton('Completed')
         
-        filter_buttons = [self.filter_due_btn, self.filter_overdue_btn, 
-                         self.filter_upcoming_btn, self.filter_all_btn, self.filter_completed_btn]
+        filter_buttons = [self.filter_due_btn, self.filter_overdue_btn, self.filter_upcoming_btn,
+                         self.filter_calendar_btn, self.filter_all_btn, self.filter_completed_btn]
         
         for btn in filter_buttons:
             btn.setMinimumHeight(40)
@@ -361,6 +385,7 @@ class CareRemindersScreen(BaseScreen):
         self.filter_due_btn.clicked.connect(lambda: self.apply_filter('due'))
         self.filter_overdue_btn.clicked.connect(lambda: self.apply_filter('overdue'))
         self.filter_upcoming_btn.clicked.connect(lambda: self.apply_filter('upcoming'))
+        self.filter_calendar_btn.clicked.connect(lambda: self.apply_filter('calendar'))
         self.filter_all_btn.clicked.connect(lambda: self.apply_filter('all'))
         self.filter_completed_btn.clicked.connect(lambda: self.apply_filter('completed'))
         
@@ -368,38 +393,34 @@ class CareRemindersScreen(BaseScreen):
         self.main_layout.addLayout(filter_layout)
     
     def create_reminders_list_area(self):
-        """Create scrollable reminders list area"""
-        # Create scroll area
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
-                border: 1px solid #ddd;
-                border-radius: 5px;
-                background-color: white;
-            }
-        """)
-        
-        # Container widget for reminders
-        self.reminders_container = QWidget()
-        self.reminders_layout = QVBoxLayout(self.reminders_container)
-        self.reminders_layout.setSpacing(10)
-        self.reminders_layout.setContentsMargins(10, 10, 10, 10)
-        
-        self.scroll_area.setWidget(self.reminders_container)
-        self.main_layout.addWidget(self.scroll_area)
+        """Create the virtualized reminders list"""
+        self.reminders_view = RecordListView(self.get_reminders_page, self.format_reminder)
+        self.reminders_view.actionTriggered.connect(self.handle_reminder_action)
+        self.main_layout.addWidget(self.reminders_view)
     
-    def setup_refresh_timer(self):
-        """Setup automatic refresh timer"""
-        self.refresh_timer = QTimer()
-        self.refresh_timer.timeout.connect(self.refresh_reminders)
-        self.refresh_timer.start(60000)  # Refresh every minute
+    def setup_scheduler(self):
+        """Listen for reminders becoming due"""
+        self.scheduler = get_reminder_scheduler(self.db_manager)
+        self.scheduler.reminderDue.connect(self.on_schedule_changed)
+        self.scheduler.dayChanged.connect(self.on_schedule_changed)
+    
+    def on_schedule_changed(self, *args):
+        """Refresh now if the screen is showing, otherwise when it is next shown"""
+        if self.isVisible():
+            self.refresh_reminders()
+        else:
+            self.needs_refresh = True
+    
+    def on_enter(self):
+        """Called when screen becomes active"""
+        if self.needs_refresh:
+            self.refresh_reminders()
     
     def apply_filter(self, filter_type):
         """Apply reminder filter"""
         # Update button states
-        filter_buttons = [self.filter_due_btn, self.filter_overdue_btn, 
-                         self.filter_upcoming_btn, self.filter_all_btn, self.filter_completed_btn]
+        filter_buttons = [self.filter_due_btn, self.filter_overdue_btn, self.filter_upcoming_btn,
+                         self.filter_calendar_btn, self.filter_all_btn, self.filter_completed_btn]
         for btn in filter_buttons:
             btn.setChecked(False)
             
@@ -409,6 +430,8 @@ class CareRemindersScreen(BaseScreen):
             self.filter_overdue_btn.setChecked(True)
         elif filter_type == 'upcoming':
             self.filter_upcoming_btn.setChecked(True)
+        elif filter_type == 'calendar':
+            self.filter_calendar_btn.setChecked(True)
         elif filter_type == 'all':
             self.filter_all_btn.setChecked(True)
         elif filter_type == 'completed':
@@ -419,101 +442,44 @@ class CareRemindersScreen(BaseScreen):
     
     def refresh_reminders(self):
         """Refresh the reminders list"""
-        # Clear existing reminders
-        for i in reversed(range(self.reminders_layout.count())):
-            child = self.reminders_layout.itemAt(i).widget()
-            if child:
-                child.setParent(None)
-        
-        try:
-            # Get reminders based on current filter
-            reminders = self.get_filtered_reminders(self.current_filter)
-            
-            if not reminders:
-                # No reminders message
-                no_reminders_label = QLabel(f'No {self.current_filter} reminders found.')
-                no_reminders_label.setAlignment(Qt.AlignCenter)
-                no_reminders_label.setStyleSheet("""
-                    QLabel {
-                        font-size: 16px;
-                        color: #666;
-                        padding: 40px;
-                        background-color: #f5f5f5;
-                        border-radius: 8px;
-                        border: 2px dashed #ccc;
-                    }
-                """)
-                self.reminders_layout.addWidget(no_reminders_label)
-            else:
-                # Display reminders
-                for reminder in reminders:
-                    reminder_widget = self.create_reminder_widget(reminder)
-                    self.reminders_layout.addWidget(reminder_widget)
-                    
-        except Exception as e:
-            error_label = QLabel(f'Error loading reminders: {str(e)}')
-            error_label.setStyleSheet("""
-                QLabel {
-                    color: #d32f2f;
-                    font-size: 14px;
-                    padding: 20px;
-                    background-color: #ffebee;
-                    border-radius: 5px;
-                }
-            """)
-            self.reminders_layout.addWidget(error_label)
-        
-        # Add stretch to push content to top
-        self.reminders_layout.addStretch()
+        self.needs_refresh = False
+        if self.current_filter == 'calendar':
+            self.reminders_view.refresh(empty_text=f'No reminders due in the next {CALENDAR_DAYS} days.')
+        else:
+            self.reminders_view.refresh(empty_text=f'No {self.current_filter} reminders found.')
     
-    def get_filtered_reminders(self, filter_type):
-        """Get filtered reminders from database"""
+    def get_filtered_reminders(self, filter_type, limit=None, offset=0):
+        """Get a page of filtered reminders from database"""
+        if filter_type == 'completed':
+            # Only the 20 most recently completed are shown
+            limit = max(0, min(limit if limit is not None else 20, 20 - offset))
         try:
-            conn = self.db_manager.get_connection()
-            cursor = conn.cursor()
-            
-            now = datetime.datetime.now()
-            today = now.date()
-            
-            base_query = '''
-                SELECT cr.*, t.name as tortoise_name, u.name as user_name
-                FROM care_reminders cr
-                LEFT JOIN tortoises t ON cr.tortoise_id = t.id
-                LEFT JOIN users u ON cr.assigned_user_id = u.id
-                WHERE cr.is_active = 1
-            '''
-            
-            if filter_type == 'due':
-                cursor.execute(base_query + ' AND DATE(cr.next_due_date) <= DATE(?) ORDER BY cr.next_due_date ASC', (today,))
-            elif filter_type == 'overdue':
-                cursor.execute(base_query + ' AND DATE(cr.next_due_date) < DATE(?) ORDER BY cr.next_due_date ASC', (today,))
-            elif filter_type == 'upcoming':
-                cursor.execute(base_query + ' AND DATE(cr.next_due_date) > DATE(?) ORDER BY cr.next_due_date ASC', (today,))
-            elif filter_type == 'completed':
-                cursor.execute('''
-                    SELECT cr.*, t.name as tortoise_name, u.name as user_name
-                    FROM care_reminders cr
-                    LEFT JOIN tortoises t ON cr.tortoise_id = t.id
-                    LEFT JOIN users u ON cr.assigned_user_id = u.id
-                    WHERE cr.last_completed IS NOT NULL
-                    ORDER BY cr.last_completed DESC LIMIT 20
-                ''')
-            else:  # all
-                cursor.execute(base_query + ' ORDER BY cr.next_due_date ASC')
-            
-            return [dict(row) for row in cursor.fetchall()]
-            
+            return self.db_manager.get_care_reminders(filter_type, limit=limit, offset=offset)
         except Exception:
             return []
     
-    def create_reminder_widget(self, reminder):
-        """Create a widget for displaying reminder information"""
-        reminder_widget = QWidget()
-        
+    def get_calendar_occurrences(self):
+        """Overdue reminders, then every occurrence from the start of today until CALENDAR_DAYS ahead"""
+        start = datetime.datetime.combine(datetime.date.today(), datetime.time())
+        end = start + datetime.timedelta(days=CALENDAR_DAYS)
+        reminders = self.db_manager.get_care_reminders_due_before(end.isoformat())
+        return expand_reminders(reminders, start, end, include_overdue=True)
+    
+    def get_reminders_page(self, offset, limit):
+        """Fetch one page of reminders for the list view"""
+        if self.current_filter == 'calendar':
+            if offset == 0:
+                self.calendar_occurrences = self.get_calendar_occurrences()
+            return self.calendar_occurrences[offset:offset + limit]
+        return self.get_filtered_reminders(self.current_filter, limit, offset)
+    
+    def format_reminder(self, reminder):
+        """Describe how a reminder is drawn in the list"""
         # Determine color based on status
         now = datetime.datetime.now().date()
+        occurrence = reminder.get('occurrence')
         try:
-            due_date = datetime.datetime.fromisoformat(reminder['next_due_date']).date()
+            due_date = (occurrence or datetime.datetime.fromisoformat(reminder['next_due_date'])).date()
             if due_date < now:
                 bg_color = '#ffebee'  # Light red for overdue
                 border_color = '#f44336'
@@ -533,34 +499,6 @@ class CareRemindersScreen(BaseScreen):
         elif reminder['priority'] == 'low':
             border_color = '#4caf50'
         
-        reminder_widget.setStyleSheet(f"""
-            QWidget {{
-                background-color: {bg_color};
-                border: 2px solid {border_color};
-                border-radius: 8px;
-                padding: 5px;
-            }}
-        """)
-        
-        layout = QVBoxLayout(reminder_widget)
-        layout.setContentsMargins(15, 15, 15, 15)
-        
-        # Header layout
-        header_layout = QHBoxLayout()
-        
-        # Title and info
-        title_layout = QVBoxLayout()
-        
-        title_label = QLabel(reminder['title'])
-        title_label.setStyleSheet("""
-            QLabel {
-                font-size: 16px;
-                font-weight: bold;
-                color: #2E7D32;
-            }
-        """)
-        title_layout.addWidget(title_label)
-        
         # Details
         details = []
         if reminder.get('tortoise_name'):
@@ -575,125 +513,39 @@ class CareRemindersScreen(BaseScreen):
         
         details.append(f"Type: {reminder['reminder_type'].title()}")
         
-        details_label = QLabel(' • '.join(details))
-        details_label.setStyleSheet("""
-            QLabel {
-                font-size: 12px;
-                color: #666;
-                font-style: italic;
-            }
-        """)
-        title_layout.addWidget(details_label)
-        
-        header_layout.addLayout(title_layout)
-        header_layout.addStretch()
-        
-        # Due date and priority
-        status_layout = QVBoxLayout()
-        
-        # Due date
-        due_date_label = QLabel(f"Due: {reminder['next_due_date'][:10]}")
-        due_date_label.setStyleSheet("""
-            QLabel {
-                font-size: 12px;
-                color: #333;
-                font-weight: bold;
-            }
-        """)
-        status_layout.addWidget(due_date_label)
-        
-        # Priority
-        priority_label = QLabel(reminder['priority'].title())
         priority_color = {
             'high': '#f44336',
             'medium': '#ff9800',
             'low': '#4caf50'
         }.get(reminder['priority'], '#757575')
         
-        priority_label.setStyleSheet(f"""
-            QLabel {{
-                font-size: 11px;
-                font-weight: bold;
-                padding: 3px 6px;
-                border-radius: 10px;
-                color: white;
-                background-color: {priority_color};
-            }}
-        """)
-        status_layout.addWidget(priority_label)
-        
-        header_layout.addLayout(status_layout)
-        layout.addLayout(header_layout)
-        
-        # Description
+        lines = []
         if reminder.get('description'):
-            desc_label = QLabel(reminder['description'])
-            desc_label.setStyleSheet("""
-                QLabel {
-                    font-size: 12px;
-                    color: #555;
-                    margin: 10px 0;
-                }
-            """)
-            desc_label.setWordWrap(True)
-            layout.addWidget(desc_label)
-        
-        # Action buttons
-        button_layout = QHBoxLayout()
-        
-        # Complete button
-        complete_btn = QPushButton('Mark Complete')
-        complete_btn.clicked.connect(lambda: self.complete_reminder(reminder['id']))
-        complete_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 5px 10px;
-                font-size: 11px;
-                font-weight: bold;
-            }
-            QPushButton:hover { background-color: #45a049; }
-        """)
-        button_layout.addWidget(complete_btn)
-        
-        # Edit button
-        edit_btn = QPushButton('Edit')
-        edit_btn.clicked.connect(lambda: self.edit_reminder(reminder['id']))
-        edit_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2196F3;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 5px 10px;
-                font-size: 11px;
-            }
-            QPushButton:hover { background-color: #1976D2; }
-        """)
-        button_layout.addWidget(edit_btn)
-        
-        # Deactivate button
-        deactivate_btn = QPushButton('Deactivate')
-        deactivate_btn.clicked.connect(lambda: self.deactivate_reminder(reminder['id']))
-        deactivate_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #757575;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 5px 10px;
-                font-size: 11px;
-            }
-            QPushButton:hover { background-color: #616161; }
-        """)
-        button_layout.addWidget(deactivate_btn)
-        
-        button_layout.addStretch()
-        layout.addLayout(button_layout)
+            lines.append((reminder['description'], '#555', False))
         
-        return reminder_widget
+        return {
+            'title': reminder['title'],
+            'subtitle': ' • '.join(details),
+            'date': f"Due: {occurrence:%a %d %b %H:%M}" if occurrence else f"Due: {reminder['next_due_date'][:10]}",
+            'lines': lines,
+            'badges': [(reminder['priority'].title(), priority_color)],
+            'background': bg_color,
+            'border': border_color,
+            'actions': [
+                ('complete', 'Mark Complete', '#4CAF50'),
+                ('edit', 'Edit', '#2196F3'),
+                ('deactivate', 'Deactivate', '#757575'),
+            ],
+        }
+    
+    def handle_reminder_action(self, action, reminder):
+        """Handle a button clicked on a reminder card"""
+        if action == 'complete':
+            self.complete_reminder(reminder['id'])
+        elif action == 'edit':
+            self.edit_reminder(reminder['id'])
+        elif action == 'deactivate':
+            self.deactivate_reminder(reminder['id'])
     
     def add_reminder(self):
         """Show add reminder dialog"""
@@ -713,18 +565,13 @@ class CareRemindersScreen(BaseScreen):
                     QMessageBox.critical(self, 'Error', f'Failed to add reminder: {str(e)}')
     
     def add_reminder_to_db(self, title, description, assigned_user_id, tortoise_id, 
-                          reminder_type, frequency_days, next_due_date, priority):
-        """Add reminder to database"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO care_reminders (title, description, assigned_user_id, tortoise_id, 
-                                      reminder_type, frequency_days, next_due_date, priority) 
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (title, description, assigned_user_id, tortoise_id, reminder_type, 
-              frequency_days, next_due_date, priority))
-        conn.commit()
-        return cursor.lastrowid
+                          reminder_type, frequency_days, next_due_date, priority, catch_up='skip'):
+        """Add reminder to database and schedule it"""
+        reminder_id = self.db_manager.add_care_reminder(title, description, assigned_user_id, tortoise_id,
+                                                        reminder_type, frequency_days, next_due_date, priority,
+                                                        catch_up)
+        self.scheduler.schedule(reminder_id, next_due_date)
+        return reminder_id
     
     def add_daily_feeding(self):
         """Add quick daily feeding reminder"""
@@ -786,29 +633,12 @@ class CareRemindersScreen(BaseScreen):
     def complete_reminder(self, reminder_id):
         """Mark reminder as complete and schedule next occurrence"""
         try:
-            conn = self.db_manager.get_connection()
-            cursor = conn.cursor()
-            
-            # Get reminder details
-            cursor.execute('SELECT * FROM care_reminders WHERE id = ?', (reminder_id,))
-            reminder = dict(cursor.fetchone())
-            
-            # Update last completed
-            now = datetime.datetime.now()
-            cursor.execute('UPDATE care_reminders SET last_completed = ? WHERE id = ?', 
-                          (now.isoformat(), reminder_id))
-            
-            # Calculate next due date if recurring
-            if reminder['reminder_type'] != 'once' and reminder['frequency_days'] > 0:
-                current_due = datetime.datetime.fromisoformat(reminder['next_due_date'])
-                next_due = current_due + datetime.timedelta(days=reminder['frequency_days'])
-                cursor.execute('UPDATE care_reminders SET next_due_date = ? WHERE id = ?', 
-                              (next_due.isoformat(), reminder_id))
+            next_due = self.db_manager.complete_care_reminder(reminder_id)
+            if next_due:
+                self.scheduler.schedule(reminder_id, next_due)
             else:
-                # Deactivate one-time reminders
-                cursor.execute('UPDATE care_reminders SET is_active = 0 WHERE id = ?', (reminder_id,))
+                self.scheduler.remove(reminder_id)
             
-            conn.commit()
             QMessageBox.information(self, 'Success', 'Reminder marked as complete!')
             self.refresh_reminders()
             
@@ -830,24 +660,14 @@ class CareRemindersScreen(BaseScreen):
         
         if reply == QMessageBox.Yes:
             try:
-                conn = self.db_manager.get_connection()
-                cursor = conn.cursor()
-                cursor.execute('UPDATE care_reminders SET is_active = 0 WHERE id = ?', (reminder_id,))
-                conn.commit()
+                self.db_manager.deactivate_care_reminder(reminder_id)
+                self.scheduler.remove(reminder_id)
                 
                 QMessageBox.information(self, 'Success', 'Reminder deactivated successfully!')
                 self.refresh_reminders()
             except Exception as e:
                 QMessageBox.critical(self, 'Error', f'Failed to deactivate reminder: {str(e)}')
     
-    def closeEvent(self, event):
-        """Clean up when screen closes"""
-        if hasattr(self, 'refresh_timer'):
-            self.refresh_timer.stop()
-        event.accept()
-    
     def go_back(self):
         """Return to home screen"""
-        if hasattr(self, 'refresh_timer'):
-            self.refresh_timer.stop()
         self.main_window.show_screen('home')
\ No newline at end of file
@@ -0,0 +1,166 @@
+"""
+Diagnostics screen showing where time goes at runtime
+Displays the instrumentation aggregates for database queries, Adafruit.IO
+calls, image decodes and screen builds/refreshes, plus the latency
+percentiles DatabaseManager.execute keeps per query fingerprint.
+"""
+
+from datetime import datetime
+from PySide6.QtWidgets import (QHBoxLayout, QPushButton, QLabel, QTableWidget,
+                              QTableWidgetItem, QHeaderView, QAbstractItemView)
+from PySide6.QtCore import Qt, QTimer
+from .base_screen import BaseScreen
+from utils.instrumentation import instrumentation, SETTING_KEY, CATEGORIES
+from utils.query_stats import query_stats
+
+# How often the table refreshes while the screen is open
+REFRESH_INTERVAL_MS = 2000
+
+CATEGORY_LABELS = {
+    'db': 'Database',
+    'network': 'Adafruit.IO',
+    'image': 'Images',
+    'screen': 'Screens',
+    'queries': 'Query Latency',
+}
+
+COLUMNS = ['Operation', 'Calls', 'Avg ms', 'Max ms', 'Total ms', 'Errors', 'Rows']
+
+# Latency percentiles are recorded whether or not instrumentation is on
+QUERY_COLUMNS = ['Query', 'Calls', 'p50 ms', 'p95 ms', 'p99 ms', 'Max ms', 'Slow']
+
+
+class DiagnosticsScreen(BaseScreen):
+    """Runtime timing aggregates with an on/off switch"""
+
+    def __init__(self, db_manager, main_window):
+        self.current_category = 'db'
+        super().__init__(db_manager, main_window)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def build_ui(self):
+        """Build diagnostics screen UI"""
+        header = self.create_header('Diagnostics', show_back_button=True)
+        self.main_layout.addLayout(header)
+
+        # Category buttons
+        category_layout = QHBoxLayout()
+        self.category_buttons = {}
+        for category in CATEGORIES + ('queries',):
+            btn = QPushButton(CATEGORY_LABELS[category])
+            btn.setMinimumHeight(45)
+            btn.setCheckable(True)
+            btn.setProperty('variant', 'category')
+            btn.clicked.connect(lambda checked, c=category: self.show_category(c))
+            self.category_buttons[category] = btn
+            category_layout.addWidget(btn)
+        category_layout.addStretch()
+
+        self.toggle_button = self.create_button('', self.toggle_instrumentation, 'primary')
+        self.toggle_button.setMinimumHeight(45)
+        category_layout.addWidget(self.toggle_button)
+
+        reset_button = self.create_button('Reset', self.reset_stats, 'warning')
+        reset_button.setMinimumHeight(45)
+        category_layout.addWidget(reset_button)
+        self.main_layout.addLayout(category_layout)
+
+        # Aggregates table
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionMode(QAbstractItemView.NoSelection)
+        self.table.setWordWrap(False)
+        header_view = self.table.horizontalHeader()
+        header_view.setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in range(1, len(COLUMNS)):
+            header_view.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        self.table.setObjectName('diagnosticsTable')
+        self.main_layout.addWidget(self.table, 1)
+
+        # Status line
+        self.status_label = QLabel()
+        self.status_label.setObjectName('diagnosticsStatus')
+        self.main_layout.addWidget(self.status_label)
+
+        self.show_category('db')
+
+    def show_category(self, category):
+        """Switch the table to another category"""
+        self.current_category = category
+        for name, btn in self.category_buttons.items():
+            btn.setChecked(name == category)
+        self.refresh()
+
+    def refresh(self):
+        """Reload the aggregates into the table"""
+        summary = instrumentation.summary(recent=0)
+        self.toggle_button.setText('Disable' if summary['enabled'] else 'Enable')
+        if self.current_category == 'queries':
+            self.refresh_queries()
+            return
+
+        entries = summary['categories'].get(self.current_category, [])
+        rows = [[entry['name'], entry['calls'], f"{entry['avg_ms']:.2f}", f"{entry['max_ms']:.2f}",
+                 f"{entry['total_ms']:.1f}", entry['errors'], entry['rows']] for entry in entries]
+        self.fill_table(COLUMNS, rows, highlight_column=5)
+
+        since = datetime.fromtimestamp(summary['since']).strftime('%H:%M:%S')
+        if summary['enabled']:
+            self.status_label.setText(f"Recording since {since} - {len(entries)} operations")
+        else:
+            self.status_label.setText('Instrumentation is off. Enable it to start recording.')
+
+    def refresh_queries(self):
+        """Show latency percentiles per query fingerprint, worst p95 first"""
+        entries = query_stats.summary()
+        rows = [[entry['fingerprint'], entry['calls'], f"{entry['p50_ms']:.2f}", f"{entry['p95_ms']:.2f}",
+                 f"{entry['p99_ms']:.2f}", f"{entry['max_ms']:.2f}", entry['slow']] for entry in entries]
+        self.fill_table(QUERY_COLUMNS, rows, highlight_column=6)
+        self.status_label.setText(f"{len(entries)} distinct queries - "
+                                  f"{len(query_stats.slow_queries)} recent over {query_stats.slow_query_ms} ms "
+                                  f"(logged with their query plans)")
+
+    def fill_table(self, columns, rows, highlight_column):
+        """Replace the table contents; non-zero values in highlight_column are shown in red"""
+        self.table.setUpdatesEnabled(False)
+        self.table.setHorizontalHeaderLabels(columns)
+        self.table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                if column == 0:
+                    item.setToolTip(str(value))
+                else:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                if column == highlight_column and value:
+                    item.setForeground(Qt.red)
+                self.table.setItem(row, column, item)
+        self.table.setUpdatesEnabled(True)
+
+    def toggle_instrumentation(self):
+        """Turn instrumentation on or off and remember the choice"""
+        enabled = not instrumentation.enabled
+        instrumentation.set_enabled(enabled)
+        self.db_manager.set_setting(SETTING_KEY, 'true' if enabled else 'false')
+        # Reopen the connection so queries switch to (or away from) the instrumented cursor
+        self.db_manager.close()
+        self.refresh()
+
+    def reset_stats(self):
+        """Clear the aggregates, recent events and query latencies"""
+        instrumentation.reset()
+        query_stats.reset()
+        self.refresh()
+
+    def on_enter(self):
+        """Called when screen becomes active"""
+        self.refresh()
+        self.refresh_timer.start(REFRESH_INTERVAL_MS)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
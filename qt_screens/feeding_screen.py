@@ -0,0 +1,340 @@
+"""
+Feeding Screen - Record feeding sessions with plant safety and nutrition totals
+"""
+
+from datetime import datetime
+from PySide6.QtWidgets import (QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QComboBox, QCompleter,
+                              QDoubleSpinBox, QListWidget, QListWidgetItem, QLineEdit, QCheckBox,
+                              QMessageBox, QFrame)
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor
+from .base_screen import BaseScreen
+from design_system.theme import SAFETY_COLORS, color
+from utils.feeding import (SUPPLEMENTS, NUTRITION_CLASSES, NUTRITION_LABELS, session_totals,
+                           add_totals, empty_totals, share)
+from utils.plant_lookup import get_plant_lookup
+
+SAFETY_ICONS = {'safe': '🟢', 'caution': '🟡', 'toxic': '🔴'}
+
+# Rows of the totals table: (label, totals field)
+TOTAL_ROWS = [(NUTRITION_LABELS[name], name) for name in NUTRITION_CLASSES] + [
+    ('Caution plants', 'caution'),
+    ('Toxic plants', 'toxic'),
+]
+
+
+class FeedingScreen(BaseScreen):
+    """Feeding session entry with this session's and the running nutrition totals"""
+
+    def __init__(self, db_manager, main_window):
+        self.items = []
+        self.running_totals = empty_totals()
+        self.loaded_plant_map = None
+        super().__init__(db_manager, main_window)
+
+    def build_ui(self):
+        """Build feeding screen UI"""
+        header = self.create_header('🥬 Feed Tortoise', show_back_button=True)
+        self.main_layout.addLayout(header)
+
+        # Who is fed, and by whom
+        who_layout = QHBoxLayout()
+        who_layout.addWidget(QLabel('Tortoise:'))
+        self.tortoise_combo = QComboBox()
+        self.tortoise_combo.setProperty('role', 'input')
+        self.tortoise_combo.currentIndexChanged.connect(self.refresh_totals)
+        who_layout.addWidget(self.tortoise_combo, 1)
+        who_layout.addWidget(QLabel('Fed by:'))
+        self.user_combo = QComboBox()
+        self.user_combo.setProperty('role', 'input')
+        who_layout.addWidget(self.user_combo, 1)
+        self.main_layout.addLayout(who_layout)
+
+        columns = QHBoxLayout()
+        columns.addWidget(self.create_entry_panel(), 3)
+        columns.addWidget(self.create_totals_panel(), 2)
+        self.main_layout.addLayout(columns, 1)
+
+        # Session details and save
+        save_layout = QHBoxLayout()
+        self.notes_input = QLineEdit()
+        self.notes_input.setPlaceholderText('Notes and behaviour observations...')
+        self.notes_input.setProperty('role', 'input')
+        save_layout.addWidget(self.notes_input, 1)
+        self.ate_well_check = QCheckBox('Ate well')
+        self.ate_well_check.setChecked(True)
+        self.ate_well_check.setObjectName('feedingAteWell')
+        save_layout.addWidget(self.ate_well_check)
+        self.save_button = self.create_button('Save Session', self.save_session, 'primary')
+        self.save_button.setMinimumWidth(200)
+        save_layout.addWidget(self.save_button)
+        self.main_layout.addLayout(save_layout)
+
+    def create_entry_panel(self):
+        """Plant and supplement entry plus the session's item list"""
+        panel = QFrame()
+        panel.setObjectName('feedingPanel')
+        layout = QVBoxLayout(panel)
+
+        # Plant row
+        plant_layout = QHBoxLayout()
+        self.plant_combo = QComboBox()
+        self.plant_combo.setEditable(True)
+        self.plant_combo.setInsertPolicy(QComboBox.NoInsert)
+        self.plant_combo.completer().setFilterMode(Qt.MatchContains)
+        self.plant_combo.completer().setCompletionMode(QCompleter.PopupCompletion)
+        self.plant_combo.setProperty('role', 'input')
+        self.plant_combo.lineEdit().setPlaceholderText('Type a plant name...')
+        plant_layout.addWidget(self.plant_combo, 1)
+        self.plant_weight = self.create_weight_input(10.0)
+        plant_layout.addWidget(self.plant_weight)
+        add_plant_btn = self.create_button('Add Plant', self.add_plant_item, 'primary')
+        add_plant_btn.setMinimumHeight(45)
+        plant_layout.addWidget(add_plant_btn)
+        layout.addLayout(plant_layout)
+
+        # Supplement row
+        supplement_layout = QHBoxLayout()
+        self.supplement_combo = QComboBox()
+        self.supplement_combo.addItems(SUPPLEMENTS)
+        self.supplement_combo.setProperty('role', 'input')
+        supplement_layout.addWidget(self.supplement_combo, 1)
+        self.supplement_weight = self.create_weight_input(0.5)
+        supplement_layout.addWidget(self.supplement_weight)
+        add_supplement_btn = self.create_button('Add Supplement', self.add_supplement_item, 'secondary')
+        add_supplement_btn.setMinimumHeight(45)
+        supplement_layout.addWidget(add_supplement_btn)
+        layout.addLayout(supplement_layout)
+
+        # Items in this session
+        self.items_list = QListWidget()
+        self.items_list.setObjectName('feedingItems')
+        layout.addWidget(self.items_list, 1)
+
+        remove_btn = self.create_button('Remove Selected', self.remove_selected_item, 'warning')
+        remove_btn.setMinimumHeight(45)
+        layout.addWidget(remove_btn)
+        return panel
+
+    def create_weight_input(self, default):
+        """Grams spin box"""
+        spin = QDoubleSpinBox()
+        spin.setRange(0.1, 2000.0)
+        spin.setDecimals(1)
+        spin.setSuffix(' g')
+        spin.setValue(default)
+        spin.setMinimumWidth(110)
+        spin.setProperty('role', 'input')
+        return spin
+
+    def create_totals_panel(self):
+        """Totals for this session next to the tortoise's running totals"""
+        panel = QFrame()
+        panel.setObjectName('feedingPanel')
+        layout = QVBoxLayout(panel)
+
+        title = QLabel('Nutrition Totals')
+        title.setObjectName('feedingTitle')
+        layout.addWidget(title)
+
+        grid = QGridLayout()
+        for column, text in enumerate(['', 'This session', 'Running total']):
+            label = QLabel(text)
+            label.setObjectName('feedingColumnHeader')
+            grid.addWidget(label, 0, column, Qt.AlignRight if column else Qt.AlignLeft)
+
+        self.total_labels = {}
+        rows = [('Food weight', 'total_weight')] + TOTAL_ROWS + [('Supplements', 'supplements')]
+        for row, (text, field) in enumerate(rows, start=1):
+            grid.addWidget(QLabel(text), row, 0)
+            session_label = QLabel()
+            running_label = QLabel()
+            for column, label in enumerate((session_label, running_label), start=1):
+                label.setObjectName('feedingTotal')
+                grid.addWidget(label, row, column, Qt.AlignRight)
+            self.total_labels[field] = (session_label, running_label)
+        layout.addLayout(grid)
+
+        self.running_label = QLabel()
+        self.running_label.setWordWrap(True)
+        self.running_label.setObjectName('feedingRunningNote')
+        layout.addWidget(self.running_label)
+
+        recent_title = QLabel('Recent Sessions')
+        recent_title.setObjectName('feedingRecentTitle')
+        layout.addWidget(recent_title)
+        self.recent_list = QListWidget()
+        self.recent_list.setSelectionMode(QListWidget.NoSelection)
+        self.recent_list.setObjectName('feedingRecent')
+        layout.addWidget(self.recent_list, 1)
+        return panel
+
+    def load_choices(self):
+        """Fill the tortoise, user and plant pickers"""
+        selected = getattr(self.main_window, 'selected_tortoise', None)
+        current_id = selected['id'] if selected else self.tortoise_combo.currentData()
+        self.tortoise_combo.blockSignals(True)
+        self.tortoise_combo.clear()
+        for tortoise in self.db_manager.get_tortoises():
+            self.tortoise_combo.addItem(tortoise['name'], tortoise['id'])
+        index = self.tortoise_combo.findData(current_id)
+        self.tortoise_combo.setCurrentIndex(max(index, 0))
+        self.tortoise_combo.blockSignals(False)
+
+        current_user = self.user_combo.currentData()
+        self.user_combo.clear()
+        for user in self.db_manager.get_users():
+            self.user_combo.addItem(user['name'], user['id'])
+        self.user_combo.setCurrentIndex(max(self.user_combo.findData(current_user), 0))
+
+        # The map is cached by the database manager, so this only rebuilds after catalogue changes
+        plant_map = self.db_manager.get_plant_safety_map()
+        if plant_map is not self.loaded_plant_map:
+            self.plant_combo.clear()
+            for plant_id, plant in sorted(plant_map.items(), key=lambda p: p[1]['name'].lower()):
+                self.plant_combo.addItem(f"{SAFETY_ICONS.get(plant['safety_level'], '⚪')} {plant['name']}", plant_id)
+            self.plant_combo.setCurrentIndex(-1)
+            self.loaded_plant_map = plant_map
+
+    def add_plant_item(self):
+        """Add the chosen plant to the session"""
+        text = self.plant_combo.currentText()
+        index = self.plant_combo.findText(text, Qt.MatchFixedString)
+        plant_id = self.plant_combo.itemData(index) if index >= 0 else self.resolve_typed_plant(text)
+        plant = self.loaded_plant_map.get(plant_id) if plant_id is not None else None
+        if plant is None:
+            QMessageBox.warning(self, 'Unknown Plant', 'Choose a plant from the plant database.')
+            return
+        if plant['safety_level'] == 'toxic':
+            reply = QMessageBox.warning(self, 'Toxic Plant',
+                                        f"{plant['name']} is toxic to tortoises.\n\nAdd it anyway?",
+                                        QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                return
+        self.items.append({'plant_id': plant_id, 'weight': self.plant_weight.value()})
+        self.plant_combo.setCurrentIndex(-1)
+        self.refresh_items()
+
+    def resolve_typed_plant(self, text):
+        """Plant ID for a name typed without picking it from the list (scientific names and typos allowed)"""
+        if not text.strip():
+            return None
+        index = get_plant_lookup(self.db_manager).get_index(wait=False)
+        if index is None:
+            # Still indexing at startup: only exact names, without blocking the UI
+            name = text.strip().lower()
+            return next((plant_id for plant_id, plant in (self.loaded_plant_map or {}).items()
+                         if plant['name'].lower() == name), None)
+        plant = index.find(text)
+        if plant:
+            return plant['id']
+        matches = index.fuzzy(text, limit=1)
+        if not matches:
+            return None
+        plant = matches[0][0]
+        reply = QMessageBox.question(self, 'Unknown Plant', f"No plant called \"{text.strip()}\".\n\n"
+                                     f"Did you mean {plant['name']}?", QMessageBox.Yes | QMessageBox.No)
+        return plant['id'] if reply == QMessageBox.Yes else None
+
+    def add_supplement_item(self):
+        """Add the chosen supplement to the session"""
+        self.items.append({'supplement_name': self.supplement_combo.currentText(),
+                           'weight': self.supplement_weight.value()})
+        self.refresh_items()
+
+    def remove_selected_item(self):
+        """Remove the selected item from the session"""
+        row = self.items_list.currentRow()
+        if row >= 0:
+            del self.items[row]
+            self.refresh_items()
+
+    def refresh_items(self):
+        """Redraw the session's items and totals"""
+        self.items_list.clear()
+        for item in self.items:
+            plant = self.loaded_plant_map.get(item.get('plant_id')) if item.get('plant_id') is not None else None
+            if plant:
+                text = f"{SAFETY_ICONS.get(plant['safety_level'], '⚪')} {plant['name']} - {item['weight']:.1f} g"
+                tags = [NUTRITION_LABELS[name] for name in NUTRITION_CLASSES if name in plant['nutrition']]
+                if tags:
+                    text += f"  ({', '.join(tags)})"
+            else:
+                text = f"💊 {item['supplement_name']} - {item['weight']:.1f} g"
+            list_item = QListWidgetItem(text)
+            if plant and plant['safety_level'] in ('caution', 'toxic'):
+                list_item.setForeground(QColor(color(SAFETY_COLORS[plant['safety_level']])))
+            self.items_list.addItem(list_item)
+        self.update_totals()
+
+    def refresh_totals(self):
+        """Reload the selected tortoise's running totals and recent sessions"""
+        tortoise_id = self.tortoise_combo.currentData()
+        self.recent_list.clear()
+        if tortoise_id is None:
+            self.running_totals = empty_totals()
+        else:
+            self.running_totals = self.db_manager.get_nutrition_totals(tortoise_id)
+            for session in self.db_manager.get_feeding_sessions(tortoise_id, limit=5):
+                when = session['feeding_date'][:16] if session['feeding_date'] else '?'
+                weight = session['total_weight'] or 0
+                self.recent_list.addItem(f"{when}  {weight:.0f} g  {session['items'] or ''}")
+        self.update_totals()
+
+    def update_totals(self):
+        """Show this session's totals and the running totals including it"""
+        session = session_totals(self.items, self.loaded_plant_map or {})
+        running = add_totals(self.running_totals, session) if self.items else self.running_totals
+        for field, (session_label, running_label) in self.total_labels.items():
+            session_label.setText(self.format_amount(session, field))
+            running_label.setText(self.format_amount(running, field))
+
+        sessions = running.get('sessions') or 0
+        last = self.running_totals.get('last_feeding')
+        text = f"{sessions} session{'s' if sessions != 1 else ''} recorded"
+        if last:
+            text += f", last on {last[:16]}"
+        if running.get('total_weight') and share(running, 'oxalate') > share(running, 'calcium_rich'):
+            text += ". More oxalate-heavy than calcium-rich food overall - consider more calcium-rich greens."
+        self.running_label.setText(text)
+        self.save_button.setEnabled(bool(self.items))
+
+    def format_amount(self, totals, field):
+        """Grams, with the share of the food weight for plant classes"""
+        grams = totals.get(field) or 0
+        if field in ('total_weight', 'supplements') or not totals.get('total_weight'):
+            return f"{grams:.1f} g"
+        return f"{grams:.1f} g ({share(totals, field):.0%})"
+
+    def save_session(self):
+        """Record the session and its items"""
+        tortoise_id = self.tortoise_combo.currentData()
+        user_id = self.user_combo.currentData()
+        if tortoise_id is None or user_id is None or not self.items:
+            QMessageBox.warning(self, 'Incomplete Session', 'Choose a tortoise and add at least one item.')
+            return
+
+        try:
+            self.db_manager.record_feeding_session(
+                tortoise_id, user_id, self.items,
+                feeding_date=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                notes=self.notes_input.text().strip(),
+                ate_well=self.ate_well_check.isChecked(),
+                # Toxic plants were already confirmed when they were added
+                allow_toxic=True)
+        except Exception as e:
+            QMessageBox.critical(self, 'Error', f'Failed to save feeding session: {str(e)}')
+            return
+
+        self.items = []
+        self.notes_input.clear()
+        self.ate_well_check.setChecked(True)
+        self.refresh_items()
+        self.refresh_totals()
+        QMessageBox.information(self, 'Saved', 'Feeding session recorded.')
+
+    def on_enter(self):
+        """Called when screen becomes active"""
+        self.load_choices()
+        self.refresh_items()
+        self.refresh_totals()
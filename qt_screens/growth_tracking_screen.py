@@ -3,16 +3,23 @@ Growth Tracking Screen - Photo documentation and measurement tracking system
 """
 
 from PySide6.QtWidgets import (QVBoxLayout, QHBoxLayout, QGridLayout, QPushButton, 
-                              QLabel, QScrollArea, QWidget, QMessageBox,
+                              QLabel, QMessageBox,
                               QDialog, QFormLayout, QDialogButtonBox, QComboBox, 
                               QDateEdit, QSpinBox, QDoubleSpinBox, QTextEdit, QFileDialog,
                               QFrame)
-from PySide6.QtCore import Qt, QDate
-from PySide6.QtGui import QFont, QPixmap
+from PySide6.QtCore import Qt, QDate, QTimer
+from PySide6.QtGui import QFont
 from .base_screen import BaseScreen
+from .record_list import RecordListView
 from .icon_manager import create_icon_button
+from utils import photo_store
+from utils.photo_pipeline import get_ingest_queue
+from utils.photo_import import get_photo_watcher, current_photo_watcher
+from utils.growth_analytics import GrowthAnalytics, NUMPY_AVAILABLE
 import os
-import shutil
+
+# How often the screen checks for photos imported by the folder watcher
+IMPORT_CHECK_INTERVAL_MS = 3000
 
 class AddGrowthRecordDialog(QDialog):
     """Dialog for adding new growth records"""
@@ -321,6 +328,22 @@ class GrowthTrackingScreen(BaseScreen):
         # Filter section
         self.create_filter_section()
         
+        # Growth analytics for the selected tortoise
+        self.analytics = GrowthAnalytics(self.db_manager)
+        self.analytics_label = QLabel()
+        self.analytics_label.setWordWrap(True)
+        self.analytics_label.setStyleSheet("""
+            QLabel {
+                font-size: 13px;
+                color: #333;
+                padding: 10px;
+                background-color: #E8F5E9;
+                border-radius: 5px;
+            }
+        """)
+        self.analytics_label.hide()
+        self.main_layout.addWidget(self.analytics_label)
+        
         # Records list area
         self.create_records_list_area()
         
@@ -330,6 +353,11 @@ class GrowthTrackingScreen(BaseScreen):
         # Load initial records (after UI is fully built)
         self.refresh_records()
         
+        # Pick up records added by the background folder import (only while shown)
+        self.last_import_count = 0
+        self.import_timer = QTimer(self)
+        self.import_timer.timeout.connect(self.check_photo_imports)
+        
     def create_filter_section(self):
         """Create filter controls"""
         filter_layout = QHBoxLayout()
@@ -362,26 +390,12 @@ class GrowthTrackingScreen(BaseScreen):
         self.update_tortoise_filter()
     
     def create_records_list_area(self):
-        """Create scrollable growth records list area"""
-        # Create scroll area
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
-                border: 1px solid #ddd;
-                border-radius: 5px;
-                background-color: white;
-            }
-        """)
-        
-        # Container widget for records
-        self.records_container = QWidget()
-        self.records_layout = QVBoxLayout(self.records_container)
-        self.records_layout.setSpacing(10)
-        self.records_layout.setContentsMargins(10, 10, 10, 10)
-        
-        self.scroll_area.setWidget(self.records_container)
-        self.main_layout.addWidget(self.scroll_area)
+        """Create the virtualized growth records list"""
+        self.records_view = RecordListView(self.get_growth_records_page, self.format_growth_record,
+                                           pixmap_loader=self.load_photo_pixmap,
+                                           empty_text='No growth records found. Click "Add Growth Record" to get started.')
+        self.records_view.actionTriggered.connect(self.handle_record_action)
+        self.main_layout.addWidget(self.records_view)
     
     def update_tortoise_filter(self):
         """Update tortoise filter dropdown"""
@@ -409,141 +423,78 @@ class GrowthTrackingScreen(BaseScreen):
     
     def refresh_records(self):
         """Refresh the growth records list"""
-        # Clear existing records
-        for i in reversed(range(self.records_layout.count())):
-            child = self.records_layout.itemAt(i).widget()
-            if child:
-                child.setParent(None)
+        self.records_view.refresh()
         
-        try:
-            # Get records from database (we need to add this method)
-            records = self.get_growth_records(self.current_tortoise_filter)
-            
-            if not records:
-                # No records message
-                no_records_label = QLabel('No growth records found. Click "Add Growth Record" to get started.')
-                no_records_label.setAlignment(Qt.AlignCenter)
-                no_records_label.setStyleSheet("""
-                    QLabel {
-                        font-size: 16px;
-                        color: #666;
-                        padding: 40px;
-                        background-color: #f5f5f5;
-                        border-radius: 8px;
-                        border: 2px dashed #ccc;
-                    }
-                """)
-                self.records_layout.addWidget(no_records_label)
-            else:
-                # Display records
-                for record in records:
-                    record_widget = self.create_growth_record_widget(record)
-                    self.records_layout.addWidget(record_widget)
-                    
-        except Exception as e:
-            error_label = QLabel(f'Error loading growth records: {str(e)}')
-            error_label.setStyleSheet("""
-                QLabel {
-                    color: #d32f2f;
-                    font-size: 14px;
-                    padding: 20px;
-                    background-color: #ffebee;
-                    border-radius: 5px;
-                }
-            """)
-            self.records_layout.addWidget(error_label)
-        
-        # Add stretch to push content to top
-        self.records_layout.addStretch()
+        self.update_analytics_summary()
         
         # Update filter options
         self.update_tortoise_filter()
     
-    def get_growth_records(self, tortoise_id=None):
-        """Get growth records from database"""
+    def update_analytics_summary(self):
+        """Show growth rate, condition and anomalies for the selected tortoise"""
+        if not NUMPY_AVAILABLE or not self.current_tortoise_filter:
+            self.analytics_label.hide()
+            return
+        
         try:
-            conn = self.db_manager.get_connection()
-            cursor = conn.cursor()
-            
+            analytics = self.analytics.analyze(self.current_tortoise_filter)
+        except Exception as e:
+            self.analytics_label.setText(f'Growth analytics unavailable: {str(e)}')
+            self.analytics_label.show()
+            return
+        
+        if not analytics:
+            self.analytics_label.hide()
+            return
+        
+        parts = []
+        if analytics['weight_rate_per_month'] is not None:
+            parts.append(f"Weight: {analytics['weight_rate_per_month']:+.1f}g/month")
+        if analytics['length_rate_per_month'] is not None:
+            parts.append(f"Length: {analytics['length_rate_per_month']:+.2f}cm/month")
+        if analytics['condition_index'] is not None:
+            parts.append(f"Condition index: {analytics['condition_index']:.3f}")
+        if analytics['length_curve']:
+            parts.append(f"Projected adult length: {analytics['length_curve']['l_inf']:.1f}cm")
+        
+        text = '📈 ' + ' | '.join(parts) if parts else '📈 Not enough measurements yet'
+        for anomaly in analytics['anomalies'][-3:]:
+            text += f"\n⚠️ {anomaly['date']}: {anomaly['message']}"
+        self.analytics_label.setText(text)
+        self.analytics_label.show()
+    
+    def get_growth_records(self, tortoise_id=None, limit=None, offset=0):
+        """Get a page of growth records from database, newest first"""
+        try:
+            query = '''
+                SELECT gr.*, t.name as tortoise_name, u.name as user_name
+                FROM growth_records gr
+                JOIN tortoises t ON gr.tortoise_id = t.id
+                JOIN users u ON gr.user_id = u.id
+            '''
+            params = []
             if tortoise_id:
-                cursor.execute('''
-                    SELECT gr.*, t.name as tortoise_name, u.name as user_name
-                    FROM growth_records gr
-                    JOIN tortoises t ON gr.tortoise_id = t.id
-                    JOIN users u ON gr.user_id = u.id
-                    WHERE gr.tortoise_id = ?
-                    ORDER BY gr.measurement_date DESC
-                ''', (tortoise_id,))
-            else:
-                cursor.execute('''
-                    SELECT gr.*, t.name as tortoise_name, u.name as user_name
-                    FROM growth_records gr
-                    JOIN tortoises t ON gr.tortoise_id = t.id
-                    JOIN users u ON gr.user_id = u.id
-                    ORDER BY gr.measurement_date DESC
-                ''')
+                query += ' WHERE gr.tortoise_id = ?'
+                params.append(tortoise_id)
+            query += ' ORDER BY gr.measurement_date DESC, gr.id DESC'
+            if limit is not None:
+                query += ' LIMIT ? OFFSET ?'
+                params.extend([limit, offset])
             
-            return [dict(row) for row in cursor.fetchall()]
+            return [dict(row) for row in self.db_manager.execute(query, params)]
         except Exception:
             return []
     
-    def create_growth_record_widget(self, record):
-        """Create a widget for displaying growth record information"""
-        record_widget = QWidget()
-        record_widget.setStyleSheet("""
-            QWidget {
-                background-color: white;
-                border: 2px solid #e0e0e0;
-                border-radius: 8px;
-                padding: 5px;
-            }
-        """)
-        
-        layout = QHBoxLayout(record_widget)
-        layout.setContentsMargins(15, 15, 15, 15)
-        
-        # Record info
-        info_layout = QVBoxLayout()
-        
-        # Header
-        header_layout = QHBoxLayout()
-        
-        title_label = QLabel(f"{record['tortoise_name']} - Growth Record")
-        title_label.setStyleSheet("""
-            QLabel {
-                font-size: 16px;
-                font-weight: bold;
-                color: #2E7D32;
-            }
-        """)
-        header_layout.addWidget(title_label)
-        
-        header_layout.addStretch()
-        
-        date_label = QLabel(record['measurement_date'])
-        date_label.setStyleSheet("""
-            QLabel {
-                font-size: 12px;
-                color: #666;
-                font-style: italic;
-            }
-        """)
-        header_layout.addWidget(date_label)
-        
-        info_layout.addLayout(header_layout)
-        
-        # User info
-        user_label = QLabel(f"Recorded by: {record['user_name']}")
-        user_label.setStyleSheet("""
-            QLabel {
-                font-size: 12px;
-                color: #777;
-                margin-bottom: 10px;
-            }
-        """)
-        info_layout.addWidget(user_label)
-        
-        # Measurements
+    def get_growth_records_page(self, offset, limit):
+        """Fetch one page of records for the list view"""
+        records = self.get_growth_records(self.current_tortoise_filter, limit, offset)
+        for record in records:
+            # Checked once per fetch rather than on every repaint
+            record['has_photo'] = bool(record.get('photo_path')) and os.path.exists(record['photo_path'])
+        return records
+    
+    def format_growth_record(self, record):
+        """Describe how a growth record is drawn in the list"""
         measurements = []
         if record.get('weight'):
             measurements.append(f"Weight: {record['weight']}g")
@@ -554,97 +505,33 @@ class GrowthTrackingScreen(BaseScreen):
         if record.get('height'):
             measurements.append(f"Height: {record['height']}cm")
         
+        lines = []
         if measurements:
-            measurements_label = QLabel(' • '.join(measurements))
-            measurements_label.setStyleSheet("""
-                QLabel {
-                    font-size: 13px;
-                    color: #333;
-                    font-weight: bold;
-                    margin: 5px 0;
-                }
-            """)
-            info_layout.addWidget(measurements_label)
-        
-        # Notes
+            lines.append((' • '.join(measurements), '#333', True))
         if record.get('notes'):
             notes_preview = record['notes'][:100] + '...' if len(record['notes']) > 100 else record['notes']
-            notes_label = QLabel(f"Notes: {notes_preview}")
-            notes_label.setStyleSheet("""
-                QLabel {
-                    font-size: 12px;
-                    color: #555;
-                    margin: 5px 0;
-                    font-style: italic;
-                }
-            """)
-            notes_label.setWordWrap(True)
-            info_layout.addWidget(notes_label)
-        
-        layout.addLayout(info_layout)
-        
-        # Photo section
-        if record.get('photo_path') and os.path.exists(record['photo_path']):
-            photo_layout = QVBoxLayout()
-            
-            # Photo thumbnail
-            photo_label = QLabel()
-            pixmap = QPixmap(record['photo_path'])
-            if not pixmap.isNull():
-                scaled_pixmap = pixmap.scaled(120, 120, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                photo_label.setPixmap(scaled_pixmap)
-                photo_label.setAlignment(Qt.AlignCenter)
-                photo_label.setStyleSheet("""
-                    QLabel {
-                        border: 1px solid #ddd;
-                        border-radius: 5px;
-                        padding: 2px;
-                    }
-                """)
-                photo_layout.addWidget(photo_label)
-                
-                # View photo button
-                view_btn = QPushButton('View Photo')
-                view_btn.clicked.connect(lambda: self.view_photo(record['photo_path']))
-                view_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #2196F3;
-                        color: white;
-                        border: none;
-                        border-radius: 5px;
-                        padding: 5px 10px;
-                        font-size: 11px;
-                        margin-top: 5px;
-                    }
-                    QPushButton:hover { background-color: #1976D2; }
-                """)
-                photo_layout.addWidget(view_btn)
-            
-            layout.addLayout(photo_layout)
+            lines.append((f"Notes: {notes_preview}", '#555', False))
         
-        # Action buttons
-        action_layout = QVBoxLayout()
+        actions = []
+        if record['has_photo']:
+            actions.append(('view_photo', 'View Photo', '#2196F3'))
+        actions.append(('delete', 'Delete', '#f44336'))
         
-        # Delete button
-        delete_btn = QPushButton('Delete')
-        delete_btn.clicked.connect(lambda: self.delete_record(record['id']))
-        delete_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #f44336;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 5px 10px;
-                font-size: 11px;
-            }
-            QPushButton:hover { background-color: #d32f2f; }
-        """)
-        action_layout.addWidget(delete_btn)
-        
-        action_layout.addStretch()
-        layout.addLayout(action_layout)
-        
-        return record_widget
+        return {
+            'title': f"{record['tortoise_name']} - Growth Record",
+            'subtitle': f"Recorded by: {record['user_name']}",
+            'date': record['measurement_date'],
+            'lines': lines,
+            'photo': record['photo_path'] if record['has_photo'] else None,
+            'actions': actions,
+        }
+    
+    def handle_record_action(self, action, record):
+        """Handle a button clicked on a growth record card"""
+        if action == 'view_photo':
+            self.view_photo(record['photo_path'])
+        elif action == 'delete':
+            self.delete_record(record['id'])
     
     def add_growth_record(self):
         """Show add growth record dialog"""
@@ -677,20 +564,14 @@ class GrowthTrackingScreen(BaseScreen):
                                        f'Failed to add growth record: {str(e)}')
     
     def copy_photo(self, source_path, tortoise_id):
-        """Copy photo to growth photos directory"""
+        """Copy photo into the shared content-addressed photo store"""
         try:
-            # Create photos directory if it doesn't exist
-            photos_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'growth_photos')
-            os.makedirs(photos_dir, exist_ok=True)
-            
-            # Generate unique filename
-            import datetime
-            timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"tortoise_{tortoise_id}_growth_{timestamp}{os.path.splitext(source_path)[1]}"
-            dest_path = os.path.join(photos_dir, filename)
+            # Identical photos share one stored copy
+            dest_path, is_new = photo_store.store_file(source_path)
             
-            # Copy file
-            shutil.copy2(source_path, dest_path)
+            # Generate display/card/thumbnail variants in the background
+            if is_new:
+                get_ingest_queue(self.db_manager.db_path).submit(dest_path)
             
             return dest_path
             
@@ -700,20 +581,53 @@ class GrowthTrackingScreen(BaseScreen):
     def add_growth_record_to_db(self, tortoise_id, user_id, measurement_date, weight=None, 
                               length=None, width=None, height=None, photo_path=None, notes=''):
         """Add growth record to database"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
+        cursor = self.db_manager.execute('''
             INSERT INTO growth_records (tortoise_id, user_id, measurement_date, weight, length, width, height, photo_path, notes) 
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (tortoise_id, user_id, measurement_date, weight, length, width, height, photo_path, notes))
-        conn.commit()
+        ''', (tortoise_id, user_id, measurement_date, weight, length, width, height, photo_path, notes),
+            fetch=None, commit=True)
         return cursor.lastrowid
     
     def import_photos(self):
-        """Import photos from directory"""
+        """Rescan the photo import folder in the background"""
+        folder = self.db_manager.get_setting('photo_import_folder')
+        if not folder or not os.path.isdir(folder):
+            QMessageBox.warning(self, 'Photo Import', 
+                              f'Photo import folder not found:\n{folder or "(not set)"}\n\n'
+                              'Create the folder or change the photo_import_folder setting.')
+            return
+        
+        watcher = get_photo_watcher(folder, self.db_manager.db_path)
+        watcher.start()
+        watcher.scan_now()
+        
+        metrics = watcher.get_metrics()
         QMessageBox.information(self, 'Photo Import', 
-                              'Bulk photo import feature coming soon!\n\n'
-                              'For now, use "Add Growth Record" to add photos individually.')
+                              f'Importing photos from {folder} in the background.\n\n'
+                              f'Name photos after the tortoise (e.g. "shelly_2024-05-01.jpg") '
+                              f'or "tortoise_<id>" to match them.\n\n'
+                              f'Imported so far: {metrics["imported"]}  '
+                              f'Unmatched: {metrics["unmatched"]}  '
+                              f'Duplicates: {metrics["duplicates"]}')
+    
+    def check_photo_imports(self):
+        """Refresh the list when the folder watcher has imported new photos"""
+        watcher = current_photo_watcher()
+        if watcher is None:
+            return
+        imported = watcher.get_metrics()['imported']
+        if imported != self.last_import_count:
+            self.refresh_records()
+            self.last_import_count = imported
+    
+    def on_enter(self):
+        """Called when screen becomes active - shows photos imported while it was hidden"""
+        self.check_photo_imports()
+        self.import_timer.start(IMPORT_CHECK_INTERVAL_MS)
+    
+    def hideEvent(self, event):
+        self.import_timer.stop()
+        super().hideEvent(event)
     
     def view_photo(self, photo_path):
         """View photo in larger dialog"""
@@ -729,7 +643,7 @@ class GrowthTrackingScreen(BaseScreen):
         
         # Photo display
         photo_label = QLabel()
-        pixmap = QPixmap(photo_path)
+        pixmap = self.load_photo_pixmap(photo_path, 600)
         if not pixmap.isNull():
             # Scale to reasonable size while maintaining aspect ratio
             scaled_pixmap = pixmap.scaled(600, 600, Qt.KeepAspectRatio, Qt.SmoothTransformation)
@@ -768,10 +682,8 @@ class GrowthTrackingScreen(BaseScreen):
         
         if reply == QMessageBox.Yes:
             try:
-                conn = self.db_manager.get_connection()
-                cursor = conn.cursor()
-                cursor.execute('DELETE FROM growth_records WHERE id = ?', (record_id,))
-                conn.commit()
+                self.db_manager.execute('DELETE FROM growth_records WHERE id = ?', (record_id,),
+                                        fetch=None, commit=True)
                 
                 QMessageBox.information(self, 'Success', 'Growth record deleted successfully!')
                 self.refresh_records()
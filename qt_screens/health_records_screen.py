@@ -3,13 +3,18 @@ Health Records Management Screen - Track vet visits, observations, treatments
 """
 
 from PySide6.QtWidgets import (QVBoxLayout, QHBoxLayout, QGridLayout, QPushButton, 
-                              QLabel, QLineEdit, QScrollArea, QWidget, QMessageBox,
+                              QLabel, QLineEdit, QMessageBox,
                               QDialog, QFormLayout, QDialogButtonBox, QComboBox, 
-                              QDateEdit, QTextEdit, QCheckBox, QFrame)
+                              QDateEdit, QTextEdit, QCheckBox, QFrame, QFileDialog)
 from PySide6.QtCore import Qt, QDate
 from PySide6.QtGui import QFont
 from .base_screen import BaseScreen
+from .record_list import RecordListView
 from .icon_manager import create_icon_button
+from utils import photo_store
+from utils.photo_pipeline import get_ingest_queue
+from datetime import datetime, timedelta
+import os
 
 class AddHealthRecordDialog(QDialog):
     """Dialog for adding new health records"""
@@ -22,6 +27,7 @@ class AddHealthRecordDialog(QDialog):
         
         self.tortoises = tortoises or []
         self.users = users or []
+        self.selected_photo_path = None
         
         layout = QVBoxLayout(self)
         
@@ -151,6 +157,34 @@ class AddHealthRecordDialog(QDialog):
         
         layout.addWidget(vet_group)
         
+        # Photo selection
+        photo_button_layout = QHBoxLayout()
+        
+        self.select_photo_btn = QPushButton('Select Photo')
+        self.select_photo_btn.clicked.connect(self.select_photo)
+        self.select_photo_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #2196F3;
+                color: white;
+                border: none;
+                border-radius: 5px;
+                padding: 8px 16px;
+                font-size: 12px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #1976D2;
+            }
+        """)
+        photo_button_layout.addWidget(self.select_photo_btn)
+        
+        self.photo_info_label = QLabel('No photo selected')
+        self.photo_info_label.setStyleSheet("font-size: 12px; color: #666; margin-left: 10px;")
+        photo_button_layout.addWidget(self.photo_info_label)
+        
+        photo_button_layout.addStretch()
+        layout.addLayout(photo_button_layout)
+        
         # Buttons
         button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         button_box.setStyleSheet("""
@@ -181,6 +215,21 @@ class AddHealthRecordDialog(QDialog):
         button_box.rejected.connect(self.reject)
         layout.addWidget(button_box)
         
+    def select_photo(self):
+        """Open file dialog to select photo"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            'Select Photo',
+            '',
+            'Image Files (*.png *.jpg *.jpeg *.bmp *.gif);;All Files (*)'
+        )
+        
+        if file_path:
+            self.selected_photo_path = file_path
+            filename = os.path.basename(file_path)
+            self.photo_info_label.setText(f'Selected: {filename}')
+            self.photo_info_label.setStyleSheet("font-size: 12px; color: #4CAF50; margin-left: 10px; font-weight: bold;")
+        
     def get_record_data(self):
         """Get health record data from form"""
         if not self.title_input.text().strip():
@@ -211,7 +260,8 @@ class AddHealthRecordDialog(QDialog):
             'treatment': self.treatment_input.toPlainText().strip(),
             'medication': self.medication_input.text().strip(),
             'follow_up_date': follow_up_date,
-            'priority': self.priority_combo.currentText()
+            'priority': self.priority_combo.currentText(),
+            'photo_path': self.selected_photo_path
         }
 
 class HealthRecordsScreen(BaseScreen):
@@ -297,26 +347,11 @@ class HealthRecordsScreen(BaseScreen):
         self.refresh_records()
         
     def create_records_list_area(self):
-        """Create scrollable records list area"""
-        # Create scroll area
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
-                border: 1px solid #ddd;
-                border-radius: 5px;
-                background-color: white;
-            }
-        """)
-        
-        # Container widget for records
-        self.records_container = QWidget()
-        self.records_layout = QVBoxLayout(self.records_container)
-        self.records_layout.setSpacing(10)
-        self.records_layout.setContentsMargins(10, 10, 10, 10)
-        
-        self.scroll_area.setWidget(self.records_container)
-        self.main_layout.addWidget(self.scroll_area)
+        """Create the virtualized records list"""
+        self.page_cursors = {}
+        self.records_view = RecordListView(self.get_records_page, self.format_health_record)
+        self.records_view.actionTriggered.connect(self.handle_record_action)
+        self.main_layout.addWidget(self.records_view)
         
     def apply_filter(self, filter_type):
         """Apply record filter"""
@@ -340,78 +375,40 @@ class HealthRecordsScreen(BaseScreen):
         
     def refresh_records(self):
         """Refresh the health records list"""
-        # Clear existing records
-        for i in reversed(range(self.records_layout.count())):
-            child = self.records_layout.itemAt(i).widget()
-            if child:
-                child.setParent(None)
-        
-        try:
-            # Get records based on current filter
-            if self.current_filter == 'urgent':
-                records = self.db_manager.get_health_records(resolved=False)
-                records = [r for r in records if r['priority'] == 'urgent']
-            elif self.current_filter == 'unresolved':
-                records = self.db_manager.get_health_records(resolved=False)
-            elif self.current_filter == 'recent':
-                records = self.db_manager.get_health_records()
-                # Filter to last 30 days (simplified client-side filtering)
-                from datetime import datetime, timedelta
-                cutoff = datetime.now() - timedelta(days=30)
-                records = [r for r in records if datetime.fromisoformat(r['record_date'].replace('Z', '+00:00')) > cutoff]
-            else:  # all
-                records = self.db_manager.get_health_records()
-            
-            if not records:
-                # No records message
-                no_records_label = QLabel(f'No {self.current_filter} health records found.')
-                no_records_label.setAlignment(Qt.AlignCenter)
-                no_records_label.setStyleSheet("""
-                    QLabel {
-                        font-size: 16px;
-                        color: #666;
-                        padding: 40px;
-                        background-color: #f5f5f5;
-                        border-radius: 8px;
-                        border: 2px dashed #ccc;
-                    }
-                """)
-                self.records_layout.addWidget(no_records_label)
-            else:
-                # Display records
-                for record in records:
-                    record_widget = self.create_health_record_widget(record)
-                    self.records_layout.addWidget(record_widget)
-                    
-        except Exception as e:
-            error_label = QLabel(f'Error loading health records: {str(e)}')
-            error_label.setStyleSheet("""
-                QLabel {
-                    color: #d32f2f;
-                    font-size: 14px;
-                    padding: 20px;
-                    background-color: #ffebee;
-                    border-radius: 5px;
-                }
-            """)
-            self.records_layout.addWidget(error_label)
-        
-        # Add stretch to push content to top
-        self.records_layout.addStretch()
-        
-    def create_health_record_widget(self, record):
-        """Create a widget for displaying health record information"""
-        record_widget = QWidget()
-        
-        # Set background color based on priority
+        self.records_view.refresh(empty_text=f'No {self.current_filter} health records found.')
+    
+    def get_filter_params(self):
+        """Database filter arguments for the current filter"""
+        if self.current_filter == 'urgent':
+            return {'resolved': False, 'priority': 'urgent'}
+        elif self.current_filter == 'unresolved':
+            return {'resolved': False}
+        elif self.current_filter == 'recent':
+            cutoff = datetime.now() - timedelta(days=30)
+            return {'since': cutoff.strftime('%Y-%m-%d %H:%M:%S')}
+        else:  # all
+            return {}
+    
+    def get_records_page(self, offset, limit):
+        """Fetch one page of records for the list view"""
+        if offset == 0:
+            self.page_cursors = {}
+        records = self.db_manager.get_health_records(limit=limit, before=self.page_cursors.get(offset),
+                                                     **self.get_filter_params())
+        if records:
+            # Remember where this page ended so the next page continues from it
+            self.page_cursors[offset + len(records)] = (records[-1]['record_date'], records[-1]['id'])
+        return records
+    
+    def format_health_record(self, record):
+        """Describe how a health record is drawn in the list"""
+        # Background and border colors based on priority
         priority_colors = {
             'urgent': '#ffebee',  # Light red
             'high': '#fff3e0',    # Light orange
             'medium': '#f5f5f5',  # Light gray
             'low': '#e8f5e8'      # Light green
         }
-        
-        bg_color = priority_colors.get(record['priority'], '#f5f5f5')
         border_color = {
             'urgent': '#f44336',
             'high': '#ff9800',
@@ -419,101 +416,10 @@ class HealthRecordsScreen(BaseScreen):
             'low': '#4caf50'
         }.get(record['priority'], '#757575')
         
-        record_widget.setStyleSheet(f"""
-            QWidget {{
-                background-color: {bg_color};
-                border: 2px solid {border_color};
-                border-radius: 8px;
-                padding: 5px;
-            }}
-        """)
-        
-        layout = QVBoxLayout(record_widget)
-        layout.setContentsMargins(15, 15, 15, 15)
-        
-        # Header layout
-        header_layout = QHBoxLayout()
-        
-        # Title and basic info
-        title_layout = QVBoxLayout()
-        
-        title_label = QLabel(record['title'])
-        title_label.setStyleSheet("""
-            QLabel {
-                font-size: 16px;
-                font-weight: bold;
-                color: #2E7D32;
-            }
-        """)
-        title_layout.addWidget(title_label)
-        
-        # Record info
-        info_text = f"{record['tortoise_name']} • {record['record_type'].title()} • {record['user_name']}"
-        info_label = QLabel(info_text)
-        info_label.setStyleSheet("""
-            QLabel {
-                font-size: 12px;
-                color: #666;
-                font-style: italic;
-            }
-        """)
-        title_layout.addWidget(info_label)
-        
-        header_layout.addLayout(title_layout)
-        header_layout.addStretch()
-        
-        # Priority and status
-        status_layout = QVBoxLayout()
-        
-        priority_label = QLabel(record['priority'].title())
-        priority_label.setStyleSheet(f"""
-            QLabel {{
-                font-size: 11px;
-                font-weight: bold;
-                padding: 3px 6px;
-                border-radius: 10px;
-                color: white;
-                background-color: {border_color};
-            }}
-        """)
-        status_layout.addWidget(priority_label)
-        
-        resolved_label = QLabel('Resolved' if record['resolved'] else 'Active')
-        resolved_color = '#4CAF50' if record['resolved'] else '#FF9800'
-        resolved_label.setStyleSheet(f"""
-            QLabel {{
-                font-size: 11px;
-                font-weight: bold;
-                padding: 3px 6px;
-                border-radius: 10px;
-                color: white;
-                background-color: {resolved_color};
-            }}
-        """)
-        status_layout.addWidget(resolved_label)
-        
-        header_layout.addLayout(status_layout)
-        
-        layout.addLayout(header_layout)
-        
-        # Date
-        date_label = QLabel(f"Date: {record['record_date'][:10]}")
-        date_label.setStyleSheet("font-size: 12px; color: #666; margin: 5px 0;")
-        layout.addWidget(date_label)
-        
-        # Description
+        lines = []
         if record['description']:
             desc_preview = record['description'][:150] + '...' if len(record['description']) > 150 else record['description']
-            desc_label = QLabel(f"Description: {desc_preview}")
-            desc_label.setStyleSheet("""
-                QLabel {
-                    font-size: 12px;
-                    color: #333;
-                    margin: 5px 0;
-                }
-            """)
-            desc_label.setWordWrap(True)
-            layout.addWidget(desc_label)
+            lines.append((f"Description: {desc_preview}", '#333', False))
         
         # Vet info if applicable
         if record['vet_name'] or record['diagnosis']:
@@ -522,74 +428,34 @@ class HealthRecordsScreen(BaseScreen):
                 vet_text.append(f"Vet: {record['vet_name']}")
             if record['diagnosis']:
                 vet_text.append(f"Diagnosis: {record['diagnosis']}")
-            
-            vet_label = QLabel(' • '.join(vet_text))
-            vet_label.setStyleSheet("""
-                QLabel {
-                    font-size: 12px;
-                    color: #2196F3;
-                    font-weight: bold;
-                    margin: 5px 0;
-                }
-            """)
-            layout.addWidget(vet_label)
+            lines.append((' • '.join(vet_text), '#2196F3', True))
         
-        # Action buttons
-        button_layout = QHBoxLayout()
-        
-        # Mark resolved/unresolved button
-        resolve_text = 'Mark Unresolved' if record['resolved'] else 'Mark Resolved'
-        resolve_btn = QPushButton(resolve_text)
-        resolve_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 5px 10px;
-                font-size: 11px;
-            }
-            QPushButton:hover { background-color: #45a049; }
-        """)
-        resolve_btn.clicked.connect(lambda: self.toggle_resolved(record['id'], not record['resolved']))
-        button_layout.addWidget(resolve_btn)
-        
-        # Edit button
-        edit_btn = QPushButton('Edit')
-        edit_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2196F3;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 5px 10px;
-                font-size: 11px;
-            }
-            QPushButton:hover { background-color: #1976D2; }
-        """)
-        edit_btn.clicked.connect(lambda: self.edit_record(record['id']))
-        button_layout.addWidget(edit_btn)
-        
-        # Delete button
-        delete_btn = QPushButton('Delete')
-        delete_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #f44336;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 5px 10px;
-                font-size: 11px;
-            }
-            QPushButton:hover { background-color: #d32f2f; }
-        """)
-        delete_btn.clicked.connect(lambda: self.delete_record(record['id'], record['title']))
-        button_layout.addWidget(delete_btn)
-        
-        button_layout.addStretch()
-        layout.addLayout(button_layout)
-        
-        return record_widget
+        return {
+            'title': record['title'],
+            'subtitle': f"{record['tortoise_name']} • {record['record_type'].title()} • {record['user_name']}",
+            'date': f"Date: {record['record_date'][:10]}",
+            'lines': lines,
+            'badges': [
+                (record['priority'].title(), border_color),
+                ('Resolved' if record['resolved'] else 'Active', '#4CAF50' if record['resolved'] else '#FF9800'),
+            ],
+            'background': priority_colors.get(record['priority'], '#f5f5f5'),
+            'border': border_color,
+            'actions': [
+                ('toggle_resolved', 'Mark Unresolved' if record['resolved'] else 'Mark Resolved', '#4CAF50'),
+                ('edit', 'Edit', '#2196F3'),
+                ('delete', 'Delete', '#f44336'),
+            ],
+        }
+    
+    def handle_record_action(self, action, record):
+        """Handle a button clicked on a health record card"""
+        if action == 'toggle_resolved':
+            self.toggle_resolved(record['id'], not record['resolved'])
+        elif action == 'edit':
+            self.edit_record(record['id'])
+        elif action == 'delete':
+            self.delete_record(record['id'], record['title'])
     
     def add_health_record(self):
         """Show add health record dialog"""
@@ -603,6 +469,13 @@ class HealthRecordsScreen(BaseScreen):
             record_data = dialog.get_record_data()
             if record_data:
                 try:
+                    # Store the photo once, shared with growth/tortoise photos
+                    if record_data['photo_path']:
+                        photo_path, is_new = photo_store.store_file(record_data['photo_path'])
+                        if is_new:
+                            get_ingest_queue(self.db_manager.db_path).submit(photo_path)
+                        record_data['photo_path'] = photo_path
+                    
                     # Add record to database
                     record_id = self.db_manager.add_health_record(**record_data)
                     
@@ -8,30 +8,15 @@ from PySide6.QtWidgets import (QVBoxLayout, QHBoxLayout, QGridLayout,
 from PySide6.QtCore import Qt, QTimer
 from .base_screen import BaseScreen
 from .icon_manager import create_icon_button, set_button_icon
-from utils.adafruit_io_utils import create_adafruit_connector, get_sensor_thresholds
-
-# Import our sophisticated design system
-try:
-    from design_system.colors import APP_COLORS
-except ImportError:
-    # Fallback colors if design system not available
-    APP_COLORS = {
-        'core': {
-            'blue_gray': '#5a7a8a',
-            'purple_gray': '#6b5a8a', 
-            'teal_gray': '#5a8a7a',
-        },
-        'blue_gray_family': {
-            'lightest': '#e8edf0',
-            'base': '#5a7a8a',
-            'dark': '#4a6673',
-        }
-    }
+from utils.dashboard import get_dashboard_service
+from design_system.theme import set_style_property
+from utils.instrumentation import instrumentation
 
 class HomeScreen(BaseScreen):
     """Main home screen with navigation buttons and status display"""
     
     def __init__(self, db_manager, main_window):
+        self.dashboard = get_dashboard_service(db_manager)
         super().__init__(db_manager, main_window)
         
         # Setup timer for regular updates
@@ -55,7 +40,7 @@ class HomeScreen(BaseScreen):
         time_font.setPointSize(14)
         self.time_label.setFont(time_font)
         self.time_label.setAlignment(Qt.AlignCenter)
-        self.time_label.setStyleSheet(f"margin: 5px; color: {APP_COLORS['text']['secondary']};")
+        self.time_label.setProperty('role', 'clock')
         self.main_layout.addWidget(self.time_label)
         
         # Status area
@@ -82,21 +67,10 @@ class HomeScreen(BaseScreen):
         self.humidity_label = QLabel('Humidity: --%')
         self.last_feeding_label = QLabel('Last Feeding: --')
         
-        # Style status labels with design system colors
+        # Styled by QLabel#statusLabel in the application stylesheet
         for label in [self.temp_label, self.humidity_label, self.last_feeding_label]:
             label.setAlignment(Qt.AlignCenter)
-            label.setStyleSheet(f"""
-                QLabel {{
-                    background-color: {APP_COLORS['backgrounds']['neutral_light']};
-                    border: 1px solid {APP_COLORS['core']['blue_gray']};
-                    border-radius: 8px;
-                    padding: 12px;
-                    margin: 5px;
-                    font-size: 14px;
-                    font-weight: 500;
-                    min-height: 20px;
-                }}
-            """)
+            label.setObjectName('statusLabel')
             
         status_layout.addWidget(self.temp_label)
         status_layout.addWidget(self.humidity_label)
@@ -104,6 +78,24 @@ class HomeScreen(BaseScreen):
         
         self.main_layout.addLayout(status_layout)
         
+        # Care reminders due and open health issues
+        counts_layout = QHBoxLayout()
+        self.reminders_label = QLabel('Reminders: --')
+        self.health_label = QLabel('Health: --')
+        for label in [self.reminders_label, self.health_label]:
+            label.setAlignment(Qt.AlignCenter)
+            label.setObjectName('statusLabel')
+            counts_layout.addWidget(label)
+        self.main_layout.addLayout(counts_layout)
+        
+        # Diet warnings from the last weeks of feedings, hidden when there are none
+        self.diet_label = QLabel()
+        self.diet_label.setAlignment(Qt.AlignCenter)
+        self.diet_label.setObjectName('statusLabel')
+        self.diet_label.setWordWrap(True)
+        self.diet_label.hide()
+        self.main_layout.addWidget(self.diet_label)
+        
     def create_navigation_buttons(self):
         """Create main navigation button grid"""
         nav_layout = QGridLayout()
@@ -125,87 +117,7 @@ class HomeScreen(BaseScreen):
             # Create button with PNG icon
             button = create_icon_button(icon_name, text, (32, 32), callback)
             
-            # Apply styling with design system colors - optimized for touch
-            if style == 'primary':
-                button.setStyleSheet(f"""
-                    QPushButton {{
-                        background-color: {APP_COLORS['core']['blue_gray']};
-                        color: white;
-                        border: none;
-                        border-radius: 12px;
-                        padding: 15px;
-                        font-weight: bold;
-                        font-size: 18px;
-                        text-align: left;
-                        padding-left: 25px;
-                    }}
-                    QPushButton:hover {{
-                        background-color: {APP_COLORS['blue_gray_family']['dark']};
-                    }}
-                    QPushButton:pressed {{
-                        background-color: {APP_COLORS['blue_gray_family']['darker']};
-                    }}
-                """)
-            elif style == 'danger':
-                button.setStyleSheet(f"""
-                    QPushButton {{
-                        background-color: {APP_COLORS['core']['teal_gray']};
-                        color: white;
-                        border: none;
-                        border-radius: 12px;
-                        padding: 15px;
-                        font-weight: bold;
-                        font-size: 18px;
-                        text-align: left;
-                        padding-left: 25px;
-                    }}
-                    QPushButton:hover {{
-                        background-color: {APP_COLORS['teal_gray_family']['dark']};
-                    }}
-                    QPushButton:pressed {{
-                        background-color: {APP_COLORS['teal_gray_family']['darker']};
-                    }}
-                """)
-            elif style == 'secondary':
-                button.setStyleSheet(f"""
-                    QPushButton {{
-                        background-color: {APP_COLORS['analogous']['blue_neighbors'][0]};
-                        color: white;
-                        border: none;
-                        border-radius: 12px;
-                        padding: 15px;
-                        font-weight: bold;
-                        font-size: 18px;
-                        text-align: left;
-                        padding-left: 25px;
-                    }}
-                    QPushButton:hover {{
-                        background-color: {APP_COLORS['analogous']['blue_neighbors'][1]};
-                    }}
-                    QPushButton:pressed {{
-                        background-color: {APP_COLORS['analogous']['blue_neighbors'][2]};
-                    }}
-                """)
-            elif style == 'warning':
-                button.setStyleSheet(f"""
-                    QPushButton {{
-                        background-color: {APP_COLORS['core']['purple_gray']};
-                        color: white;
-                        border: none;
-                        border-radius: 12px;
-                        padding: 15px;
-                        font-weight: bold;
-                        font-size: 18px;
-                        text-align: left;
-                        padding-left: 25px;
-                    }}
-                    QPushButton:hover {{
-                        background-color: {APP_COLORS['purple_gray_family']['dark']};
-                    }}
-                    QPushButton:pressed {{
-                        background-color: {APP_COLORS['purple_gray_family']['darker']};
-                    }}
-                """)
+            button.setProperty('nav', style)
             
             button.setMinimumHeight(90)  # Touch-friendly height
             nav_layout.addWidget(button, row, col)
@@ -233,50 +145,14 @@ class HomeScreen(BaseScreen):
         # Settings button with PNG icon
         settings_button = create_icon_button('settings', 'Settings', (24, 24), 
                                            lambda: self.go_to_screen('settings_main'))
-        settings_button.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {APP_COLORS['extended']['nav_secondary']};
-                color: white;
-                border: none;
-                border-radius: 10px;
-                padding: 12px;
-                font-weight: bold;
-                font-size: 16px;
-                text-align: left;
-                padding-left: 18px;
-            }}
-            QPushButton:hover {{
-                background-color: {APP_COLORS['purple_gray_family']['dark']};
-            }}
-            QPushButton:pressed {{
-                background-color: {APP_COLORS['purple_gray_family']['darker']};
-            }}
-        """)
+        settings_button.setProperty('variant', 'settings')
         settings_button.setMinimumWidth(200)
         settings_button.setMinimumHeight(65)  # Touch-friendly height
         bottom_layout.addWidget(settings_button)
         
         # Quit button with icon
         quit_button = create_icon_button('x', 'Quit', (20, 20), self.quit_application)
-        quit_button.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {APP_COLORS['extended']['error']};
-                color: white;
-                border: none;
-                border-radius: 10px;
-                padding: 12px;
-                font-weight: bold;
-                font-size: 16px;
-                text-align: left;
-                padding-left: 18px;
-            }}
-            QPushButton:hover {{
-                background-color: #c82333;
-            }}
-            QPushButton:pressed {{
-                background-color: #a71e2a;
-            }}
-        """)
+        quit_button.setProperty('variant', 'quit')
         quit_button.setMinimumWidth(150)
         quit_button.setMinimumHeight(65)  # Touch-friendly height
         bottom_layout.addWidget(quit_button)
@@ -285,79 +161,70 @@ class HomeScreen(BaseScreen):
         
     def update_display(self):
         """Update time and status information"""
+        with instrumentation.timed('screen', 'HomeScreen.update_display'):
+            self.refresh_display()
+        
+    def refresh_display(self):
+        """Render the clock and the dashboard snapshot"""
         # Update time
         current_time = datetime.now().strftime('%A, %B %d, %Y - %I:%M %p')
         self.time_label.setText(current_time)
         
+        # Everything else comes from the cached dashboard snapshot
+        try:
+            snapshot = self.dashboard.get_snapshot()
+        except Exception:
+            self.set_status(self.last_feeding_label, 'Last Feeding: Database Error', 'error')
+            return
+        
         # Update habitat readings from Adafruit.IO
-        self.update_sensor_data()
+        self.update_sensor_data(snapshot['sensors'])
         
         # Update last feeding info
-        self.update_feeding_info()
+        self.update_feeding_info(snapshot['last_feeding'])
+        self.update_care_counts(snapshot)
+        self.update_diet_warnings(snapshot['diet_warnings'])
     
-    def update_sensor_data(self):
-        """Update sensor data from Adafruit.IO with stale data warnings"""
-        try:
-            # Create Adafruit.IO connector
-            connector = create_adafruit_connector(self.db_manager)
-            
-            if not connector:
-                # No configuration - show not configured message
-                self.temp_label.setText('Temperature: Not Configured')
-                self.temp_label.setStyleSheet(self.get_status_style(APP_COLORS['text']['muted']))
-                
-                self.humidity_label.setText('Humidity: Not Configured')
-                self.humidity_label.setStyleSheet(self.get_status_style(APP_COLORS['text']['muted']))
-                return
-            
-            # Get feed names from settings
-            temp_feed = self.db_manager.get_setting('temp_feed_name') or 'temperature'
-            humidity_feed = self.db_manager.get_setting('humidity_feed_name') or 'humidity'
-            
-            # Get sensor thresholds
-            thresholds = get_sensor_thresholds(self.db_manager)
-            
-            # Get temperature data
-            temp_success, temp_value, temp_msg = connector.get_feed_value(temp_feed)
-            if temp_success and temp_value is not None:
-                # Check if data is stale (older than 10 minutes)
-                is_stale, age_info = self.check_data_staleness(temp_msg)
-                temp_status = self.get_threshold_status(temp_value, thresholds['temperature'])
-                
-                if is_stale:
-                    self.temp_label.setText(f'Temperature: {temp_value:.1f}°C ⚠️ STALE')
-                    self.temp_label.setStyleSheet(self.get_status_style(APP_COLORS['extended']['warning'], warning=True))  # Warning orange for stale
-                else:
-                    self.temp_label.setText(f'Temperature: {temp_value:.1f}°C')
-                    self.temp_label.setStyleSheet(self.get_status_style(temp_status['color']))
-            else:
-                self.temp_label.setText(f'Temperature: Error')
-                self.temp_label.setStyleSheet(self.get_status_style(APP_COLORS['extended']['error']))  # Error red
-            
-            # Get humidity data
-            humidity_success, humidity_value, humidity_msg = connector.get_feed_value(humidity_feed)
-            if humidity_success and humidity_value is not None:
-                # Check if data is stale
-                is_stale, age_info = self.check_data_staleness(humidity_msg)
-                humidity_status = self.get_threshold_status(humidity_value, thresholds['humidity'])
-                
-                if is_stale:
-                    self.humidity_label.setText(f'Humidity: {humidity_value:.1f}% ⚠️ STALE')
-                    self.humidity_label.setStyleSheet(self.get_status_style(APP_COLORS['extended']['warning'], warning=True))  # Warning orange for stale
-                else:
-                    self.humidity_label.setText(f'Humidity: {humidity_value:.1f}%')
-                    self.humidity_label.setStyleSheet(self.get_status_style(humidity_status['color']))
-            else:
-                self.humidity_label.setText(f'Humidity: Error')
-                self.humidity_label.setStyleSheet(self.get_status_style(APP_COLORS['extended']['error']))  # Error red
-                
-        except Exception as e:
+    def set_status(self, label, text, state):
+        """Set a status label's text and state (see STATUS_STATES in design_system/theme.py)"""
+        if label.text() != text:
+            label.setText(text)
+        # Only repolishes the label when the state actually changes
+        set_style_property(label, 'status', state)
+    
+    def update_sensor_data(self, sensors):
+        """Update sensor readings with stale data warnings"""
+        if not sensors['configured']:
+            # No configuration - show not configured message
+            self.set_status(self.temp_label, 'Temperature: Not Configured', 'muted')
+            self.set_status(self.humidity_label, 'Humidity: Not Configured', 'muted')
+            return
+        
+        if 'error' in sensors:
             # Handle any errors gracefully
-            self.temp_label.setText('Temperature: Connection Error')
-            self.temp_label.setStyleSheet(self.get_status_style(APP_COLORS['extended']['error']))
-            
-            self.humidity_label.setText('Humidity: Connection Error')
-            self.humidity_label.setStyleSheet(self.get_status_style(APP_COLORS['extended']['error']))
+            self.set_status(self.temp_label, 'Temperature: Connection Error', 'error')
+            self.set_status(self.humidity_label, 'Humidity: Connection Error', 'error')
+            return
+        
+        self.update_sensor_label(self.temp_label, 'Temperature', '°C', sensors['temperature'],
+                                 sensors['thresholds']['temperature'])
+        self.update_sensor_label(self.humidity_label, 'Humidity', '%', sensors['humidity'],
+                                 sensors['thresholds']['humidity'])
+    
+    def update_sensor_label(self, label, name, unit, reading, thresholds):
+        """Show one sensor reading, colored by its thresholds"""
+        success, value, message = reading
+        if success and value is not None:
+            # Check if data is stale (older than 10 minutes)
+            is_stale, age_info = self.check_data_staleness(message)
+            if is_stale:
+                # Warning orange for stale
+                self.set_status(label, f'{name}: {value:.1f}{unit} ⚠️ STALE', 'stale')
+            else:
+                status = self.get_threshold_status(value, thresholds)
+                self.set_status(label, f'{name}: {value:.1f}{unit}', status['state'])
+        else:
+            self.set_status(label, f'{name}: Error', 'error')
     
     def check_data_staleness(self, timestamp_msg):
         """Check if data is stale based on timestamp"""
@@ -396,102 +263,76 @@ class HomeScreen(BaseScreen):
     def get_threshold_status(self, value, thresholds):
         """Get status based on threshold comparison"""
         if value < thresholds['min']:
-            return {'status': 'low', 'color': APP_COLORS['core']['blue_gray']}  # Blue-gray for low
+            return {'status': 'low', 'state': 'low'}  # Blue-gray for low
         elif value > thresholds['max']:
-            return {'status': 'high', 'color': APP_COLORS['extended']['error']}  # Error red for high
-        else:
-            return {'status': 'optimal', 'color': APP_COLORS['extended']['success']}  # Success green for optimal
-    
-    def get_status_style(self, color, warning=False):
-        """Get CSS style for status labels using design system colors"""
-        if warning:
-            return f"""
-                QLabel {{
-                    background-color: {APP_COLORS['backgrounds']['caution_light']};
-                    border: 2px solid {color};
-                    border-radius: 8px;
-                    padding: 12px;
-                    margin: 5px;
-                    font-size: 14px;
-                    font-weight: bold;
-                    color: {APP_COLORS['text']['primary']};
-                    min-height: 20px;
-                }}
-            """
+            return {'status': 'high', 'state': 'error'}  # Error red for high
         else:
-            # Determine background based on color using design system
-            if color == APP_COLORS['extended']['success']:  # Success green
-                bg_color = APP_COLORS['backgrounds']['safe_light']
-            elif color == APP_COLORS['core']['blue_gray']:  # Blue-gray - low
-                bg_color = APP_COLORS['blue_gray_family']['lightest']
-            elif color == APP_COLORS['extended']['error']:  # Error red
-                bg_color = APP_COLORS['backgrounds']['danger_light']
-            else:  # Muted/not configured
-                bg_color = APP_COLORS['backgrounds']['neutral_light']
-            
-            return f"""
-                QLabel {{
-                    background-color: {bg_color};
-                    border: 1px solid {color};
-                    border-radius: 8px;
-                    padding: 12px;
-                    margin: 5px;
-                    font-size: 14px;
-                    color: {APP_COLORS['text']['primary']};
-                    font-weight: bold;
-                    min-height: 20px;
-                }}
-            """
+            return {'status': 'optimal', 'state': 'ok'}  # Success green for optimal
     
-    def update_feeding_info(self):
-        """Update last feeding information from database"""
+    def update_feeding_info(self, last_feeding):
+        """Update last feeding information"""
+        if not last_feeding:
+            self.set_status(self.last_feeding_label, 'Last Feeding: No records', 'muted')
+            return
+        
         try:
-            # Get recent feeding records
-            conn = self.db_manager.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT f.feeding_date, f.notes, t.name as tortoise_name
-                FROM feeding_records f
-                JOIN tortoises t ON f.tortoise_id = t.id
-                ORDER BY f.feeding_date DESC
-                LIMIT 1
-            """)
-            
-            result = cursor.fetchone()
-            
-            if result:
-                feeding_date, notes, tortoise_name = result
-                # Parse the feeding date
-                feed_time = datetime.fromisoformat(feeding_date)
-                now = datetime.now()
-                time_diff = now - feed_time
-                
-                # Format time difference
-                if time_diff.days > 0:
-                    time_str = f"{time_diff.days}d ago"
-                elif time_diff.seconds > 3600:
-                    time_str = f"{int(time_diff.seconds/3600)}h ago"
-                else:
-                    time_str = f"{int(time_diff.seconds/60)}m ago"
-                
-                self.last_feeding_label.setText(f'Last Feeding: {tortoise_name} ({time_str})')
-                
-                # Color based on time since last feeding
-                if time_diff.days > 1:
-                    self.last_feeding_label.setStyleSheet(self.get_status_style(APP_COLORS['extended']['error']))  # Error red if >1 day
-                elif time_diff.days > 0:
-                    self.last_feeding_label.setStyleSheet(self.get_status_style(APP_COLORS['extended']['warning']))  # Warning orange if >12 hours
-                else:
-                    self.last_feeding_label.setStyleSheet(self.get_status_style(APP_COLORS['extended']['success']))  # Success green if recent
-            else:
-                self.last_feeding_label.setText('Last Feeding: No records')
-                self.last_feeding_label.setStyleSheet(self.get_status_style(APP_COLORS['text']['muted']))
-                
-        except Exception as e:
-            self.last_feeding_label.setText('Last Feeding: Database Error')
-            self.last_feeding_label.setStyleSheet(self.get_status_style(APP_COLORS['extended']['error']))
+            # Parse the feeding date
+            feed_time = datetime.fromisoformat(last_feeding['feeding_date'])
+        except (TypeError, ValueError):
+            self.set_status(self.last_feeding_label, 'Last Feeding: Database Error', 'error')
+            return
+        
+        now = datetime.now()
+        time_diff = now - feed_time
+        
+        # Format time difference
+        if time_diff.days > 0:
+            time_str = f"{time_diff.days}d ago"
+        elif time_diff.seconds > 3600:
+            time_str = f"{int(time_diff.seconds/3600)}h ago"
+        else:
+            time_str = f"{int(time_diff.seconds/60)}m ago"
+        
+        # Color based on time since last feeding
+        if time_diff.days > 1:
+            state = 'error'  # Error red if >1 day
+        elif time_diff.days > 0:
+            state = 'late'  # Warning orange if >12 hours
+        else:
+            state = 'ok'  # Success green if recent
         
+        self.set_status(self.last_feeding_label, f"Last Feeding: {last_feeding['tortoise_name']} ({time_str})", state)
+        
+    def update_care_counts(self, snapshot):
+        """Show overdue and due-today reminders and open health issues"""
+        overdue, due = snapshot['reminders_overdue'], snapshot['reminders_due']
+        if overdue or due:
+            parts = [f"{overdue} overdue"] if overdue else []
+            parts += [f"{due} due today"] if due else []
+            self.set_status(self.reminders_label, 'Reminders: ' + ', '.join(parts), 'error' if overdue else 'late')
+        else:
+            self.set_status(self.reminders_label, 'Reminders: None due today', 'ok')
+        
+        unresolved, urgent = snapshot['health_unresolved'], snapshot['health_urgent']
+        if urgent:
+            self.set_status(self.health_label, f"Health: {urgent} urgent, {unresolved} open", 'error')
+        elif unresolved:
+            self.set_status(self.health_label, f"Health: {unresolved} open", 'late')
+        else:
+            self.set_status(self.health_label, 'Health: No open issues', 'ok')
+        
+    def update_diet_warnings(self, warnings):
+        """Show the diet warnings, worst first (see utils/diet_analytics.py)"""
+        if not warnings:
+            self.diet_label.hide()
+            return
+        shown = [w['message'] for w in warnings[:3]]
+        if len(warnings) > 3:
+            shown.append(f"+{len(warnings) - 3} more")
+        state = 'error' if warnings[0]['level'] == 'error' else 'late'
+        self.set_status(self.diet_label, 'Diet: ' + ' • '.join(shown), state)
+        self.diet_label.show()
+    
     def on_enter(self):
         """Called when screen becomes active"""
         self.update_display()
@@ -3,18 +3,72 @@ Qt Icon Management System
 Handles PNG icon loading and integration with PySide6 widgets
 """
 
+import json
 import os
 from pathlib import Path
 from PySide6.QtGui import QIcon, QPixmap
 from PySide6.QtWidgets import QPushButton
-from PySide6.QtCore import QSize
+from PySide6.QtCore import QSize, QRect
+
+ICONS_DIR = Path(__file__).parent.parent / 'icons'
+
+# Pre-scaled icon atlases built by build_icon_atlas.py
+ATLAS_DIR = ICONS_DIR / 'atlas'
+ATLAS_MANIFEST = ATLAS_DIR / 'atlas.json'
+
+# Icon sizes used by the screens; each gets its own atlas
+ATLAS_SIZES = (16, 18, 20, 24, 28, 32)
 
 class QtIconManager:
     """Manages PNG icons for Qt widgets with fallbacks"""
     
-    def __init__(self):
-        self.icons_dir = Path(__file__).parent.parent / 'icons'
+    def __init__(self, icons_dir=ICONS_DIR, atlas_dir=None):
+        self.icons_dir = Path(icons_dir)
+        self.atlas_dir = Path(atlas_dir) if atlas_dir else self.icons_dir / 'atlas'
         self.icon_cache = {}
+        # size -> (atlas pixmap, {icon name: (x, y, width, height)}); loaded on first use
+        self.atlases = None
+        
+    def preload(self):
+        """Decode the icon atlases (needs a QApplication); returns the number of icons available"""
+        if self.atlases is None:
+            self.atlases = self.load_atlases()
+        return sum(len(rects) for _, rects in self.atlases.values())
+        
+    def load_atlases(self):
+        """Read the atlas manifest and decode each atlas image once"""
+        manifest_path = self.atlas_dir / 'atlas.json'
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Error reading icon atlas manifest: {e}")
+            return {}
+            
+        atlases = {}
+        for size, atlas in manifest.get('atlases', {}).items():
+            pixmap = QPixmap(str(self.atlas_dir / atlas['file']))
+            if pixmap.isNull():
+                print(f"Error loading icon atlas {atlas['file']}")
+                continue
+            atlases[int(size)] = (pixmap, atlas['icons'])
+        return atlases
+        
+    def load_atlas_icon(self, icon_name, size):
+        """Cut a square icon out of the atlas for its size, or None if it isn't there"""
+        if size[0] != size[1]:
+            return None
+        self.preload()
+        atlas = self.atlases.get(size[0])
+        if atlas is None:
+            return None
+        pixmap, rects = atlas
+        rect = rects.get(icon_name)
+        if rect is None:
+            return None
+        return QIcon(pixmap.copy(QRect(*rect)))
         
     def get_icon_path(self, icon_name):
         """Get the path to a PNG icon file"""
@@ -28,8 +82,14 @@ class QtIconManager:
         if cache_key in self.icon_cache:
             return self.icon_cache[cache_key]
             
+        # Pre-scaled atlas first, so screen construction does no disk I/O
+        icon = self.load_atlas_icon(icon_name, size)
+        if icon is not None:
+            self.icon_cache[cache_key] = icon
+            return icon
+            
         icon_path = self.get_icon_path(icon_name)
-        if icon_path and icon_path.exists():
+        if icon_path:
             try:
                 pixmap = QPixmap(str(icon_path))
                 if not pixmap.isNull():
@@ -100,4 +160,9 @@ def set_button_icon(button, icon_name, size=(24, 24)):
 
 def get_available_icons():
     """Convenience function to get available icons"""
-    return qt_icon_manager.get_available_icons()
\ No newline at end of file
+    return qt_icon_manager.get_available_icons()
+
+
+def preload_icons():
+    """Convenience function to decode the icon atlases at startup"""
+    return qt_icon_manager.preload()
\ No newline at end of file
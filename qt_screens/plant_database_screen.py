@@ -10,6 +10,7 @@ from PySide6.QtCore import Qt, QTimer, Signal
 from PySide6.QtGui import QPixmap
 from .base_screen import BaseScreen
 from .icon_manager import create_icon_button
+from utils.instrumentation import instrumentation
 
 # Centralized color scheme for consistency
 PLANT_COLORS = {
@@ -47,23 +48,13 @@ class PlantCard(QFrame):
         # Current database format has 7 values (with photo)
         name, sci_name, safety_level, nutrition_notes, frequency, description, photo_path = self.plant_data
         
-        # Use centralized colors
-        color = PLANT_COLORS['tile_badges'].get(safety_level, PLANT_COLORS['tile_badges']['safe'])
+        # Styled by the plantCard rules in the application stylesheet
+        safety = safety_level if safety_level in PLANT_COLORS['tile_badges'] else 'safe'
         
         # Card size reduced to prevent scrolling
         self.setFixedSize(200, 340)
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: white;
-                border: 1px solid {color['bg']};
-                border-radius: 8px;
-                margin: 4px;
-            }}
-            QFrame:hover {{
-                border: 1px solid {color['bg']};
-                background-color: #f8f9fa;
-            }}
-        """)
+        self.setObjectName('plantCard')
+        self.setProperty('safety', safety)
         
         # Use absolute positioning for centered layout
         self.setLayout(None)
@@ -72,12 +63,7 @@ class PlantCard(QFrame):
         self.photo_label = QLabel(self)
         self.photo_label.setGeometry(10, 10, 180, 180)  # Back at the top
         self.photo_label.setAlignment(Qt.AlignCenter)
-        self.photo_label.setStyleSheet("""
-            QLabel {
-                border-radius: 8px;
-                background-color: #f8f9fa;
-            }
-        """)
+        self.photo_label.setObjectName('plantCardPhoto')
         
         # Load photo or show placeholder
         if photo_path:
@@ -85,7 +71,8 @@ class PlantCard(QFrame):
                 from pathlib import Path
                 photo_file = Path(photo_path)
                 if photo_file.exists():
-                    pixmap = QPixmap(str(photo_file))
+                    with instrumentation.timed('image', 'PlantCard photo'):
+                        pixmap = QPixmap(str(photo_file))
                     if not pixmap.isNull():
                         scaled_pixmap = pixmap.scaled(180, 180, Qt.KeepAspectRatio, Qt.SmoothTransformation)
                         self.photo_label.setPixmap(scaled_pixmap)
@@ -105,16 +92,7 @@ class PlantCard(QFrame):
         self.name_label.setAlignment(Qt.AlignCenter)
         self.name_label.setWordWrap(True)
         self.name_label.setGeometry(10, 193, 180, 40)
-        self.name_label.setStyleSheet("""
-            QLabel {
-                background-color: rgba(255, 255, 255, 0.95);
-                color: #000;
-                font-size: 16px;
-                font-weight: bold;
-                padding: 8px;
-                border-radius: 6px;
-            }
-        """)
+        self.name_label.setObjectName('plantCardName')
         
         # Scientific name - 3px gap from plant name, truncate if too long
         # Truncate scientific name if longer than ~25 characters  
@@ -123,17 +101,7 @@ class PlantCard(QFrame):
         self.sci_label.setAlignment(Qt.AlignCenter)
         self.sci_label.setWordWrap(True) 
         self.sci_label.setGeometry(10, 236, 180, 50)
-        self.sci_label.setStyleSheet("""
-            QLabel {
-                background-color: rgba(255, 255, 255, 0.9);
-                color: #333;
-                font-size: 14px;
-                font-style: italic;
-                padding: 8px;
-                border-radius: 6px;
-                line-height: 1.3;
-            }
-        """)
+        self.sci_label.setObjectName('plantCardScientific')
         
         # Safety indicator - 3px gap from scientific name
         safety_text = {
@@ -145,16 +113,8 @@ class PlantCard(QFrame):
         self.safety_label = QLabel(safety_text, self)
         self.safety_label.setAlignment(Qt.AlignCenter)
         self.safety_label.setGeometry(10, 289, 180, 40)
-        self.safety_label.setStyleSheet(f"""
-            QLabel {{
-                background-color: {color['bg']};
-                color: white;
-                font-size: 18px;
-                font-weight: bold;
-                padding: 8px;
-                border-radius: 6px;
-            }}
-        """)
+        self.safety_label.setObjectName('plantCardBadge')
+        self.safety_label.setProperty('safety', safety)
         
         # Bring all text labels to front layer
         self.name_label.raise_()
@@ -164,17 +124,8 @@ class PlantCard(QFrame):
     def set_grid_placeholder(self, label, plant_name):
         """Set placeholder for grid cards"""
         label.setText(f"🌿\n{plant_name}\nNo photo")
-        label.setStyleSheet("""
-            QLabel {
-                border: 1px solid #e0e0e0;
-                border-radius: 6px;
-                background-color: #f8f9fa;
-                color: #6c757d;
-                font-size: 10px;
-                font-weight: 500;
-            }
-        """)
-        
+        label.setProperty('placeholder', True)
+
     def mousePressEvent(self, event):
         """Handle card click - go to detail view"""
         if event.button() == Qt.LeftButton:
@@ -369,7 +320,8 @@ class PlantDetailView(QWidget):
                 from pathlib import Path
                 photo_file = Path(photo_path)
                 if photo_file.exists():
-                    pixmap = QPixmap(str(photo_file))
+                    with instrumentation.timed('image', 'PlantDetailView photo'):
+                        pixmap = QPixmap(str(photo_file))
                     if not pixmap.isNull():
                         scaled_pixmap = pixmap.scaled(488, 508, Qt.KeepAspectRatio, Qt.SmoothTransformation)
                         self.main_photo_label.setPixmap(scaled_pixmap)
@@ -663,7 +615,8 @@ class FullscreenPhotoViewer(QWidget):
                 from pathlib import Path
                 photo_file = Path(photo_path)
                 if photo_file.exists():
-                    pixmap = QPixmap(str(photo_file))
+                    with instrumentation.timed('image', 'FullscreenPhotoViewer photo'):
+                        pixmap = QPixmap(str(photo_file))
                     if not pixmap.isNull():
                         # Scale to fit screen while maintaining aspect ratio
                         screen_size = self.screen().availableGeometry().size()
@@ -911,11 +864,7 @@ class PlantDatabaseScreen(BaseScreen):
         
         # Content widget for grid
         self.content_widget = QWidget()
-        self.content_widget.setStyleSheet("""
-            QWidget {
-                background-color: #f8f8f8;
-            }
-        """)
+        self.content_widget.setObjectName('plantGrid')
         
         # Grid layout for plant cards (4 columns)
         self.grid_layout = QGridLayout(self.content_widget)
@@ -1091,9 +1040,6 @@ class PlantDatabaseScreen(BaseScreen):
     def load_plants(self):
         """Load plants based on current search and filter"""
         try:
-            conn = self.db_manager.get_connection()
-            cursor = conn.cursor()
-            
             # Build query based on filters
             base_query = "FROM plants WHERE 1=1"
             params = []
@@ -1116,8 +1062,7 @@ class PlantDatabaseScreen(BaseScreen):
             
             # Get total count
             count_query = f"SELECT COUNT(*) {base_query}"
-            cursor.execute(count_query, params)
-            self.total_plants = cursor.fetchone()[0]
+            self.total_plants = self.db_manager.execute(count_query, params, fetch='one')[0]
             
             # Get plants for current page
             offset = self.current_page * self.plants_per_page
@@ -1128,8 +1073,7 @@ class PlantDatabaseScreen(BaseScreen):
                 ORDER BY safety_level DESC, name ASC
                 LIMIT ? OFFSET ?
             """
-            cursor.execute(data_query, params + [self.plants_per_page, offset])
-            raw_plants = cursor.fetchall()
+            raw_plants = self.db_manager.execute(data_query, params + [self.plants_per_page, offset])
             
             # Convert sqlite3.Row objects to tuples immediately
             self.current_plants = [tuple(plant) for plant in raw_plants]
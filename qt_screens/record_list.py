@@ -0,0 +1,318 @@
+"""
+Virtualized record list shared by the growth, health and reminder screens
+
+Records are fetched a page at a time as the user scrolls and painted by a
+delegate, so only the rows on screen cost anything however long the history
+gets. Screens supply a page fetcher and a formatter that turns a record into
+a card description:
+
+    {
+        'title': 'Shelly - Growth Record',
+        'subtitle': 'Recorded by: Default User',
+        'lines': [('Weight: 120g', '#333', True)],   # (text, color, bold)
+        'date': '2024-05-01',
+        'badges': [('Urgent', '#f44336')],
+        'background': '#ffffff',
+        'border': '#e0e0e0',
+        'photo': '/path/to/photo.jpg',                # optional thumbnail
+        'actions': [('delete', 'Delete', '#f44336')], # (action id, label, color)
+    }
+"""
+
+from PySide6.QtWidgets import QListView, QStyledItemDelegate, QAbstractItemView
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, QEvent, Signal
+from PySide6.QtGui import QPainter, QColor, QPen, QFont, QFontMetrics, QPixmapCache
+
+from utils.instrumentation import instrumentation
+
+PAGE_SIZE = 50
+ROW_HEIGHT = 150
+PHOTO_SIZE = 110
+
+# Item data role that returns the raw record dict
+RecordRole = Qt.UserRole + 1
+
+
+class RecordListModel(QAbstractListModel):
+    """List model that pulls records from a fetcher one page at a time"""
+
+    def __init__(self, fetch_page, page_size=PAGE_SIZE, parent=None):
+        """
+        Args:
+            fetch_page: Callable(offset, limit) returning a list of record dicts
+            page_size: Records fetched per page
+        """
+        super().__init__(parent)
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.records = []
+        self.exhausted = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.records)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.records):
+            return None
+        record = self.records[index.row()]
+        if role == RecordRole:
+            return record
+        if role == Qt.DisplayRole:
+            return record.get('title')
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.exhausted:
+            return
+        page = self.fetch_page(len(self.records), self.page_size)
+        if len(page) < self.page_size:
+            self.exhausted = True
+        if page:
+            self.beginInsertRows(QModelIndex(), len(self.records), len(self.records) + len(page) - 1)
+            self.records.extend(page)
+            self.endInsertRows()
+
+    def reload(self):
+        """Refetch from the start, keeping as many rows as were loaded (so the scroll position survives)"""
+        count = max(len(self.records), self.page_size)
+        records = self.fetch_page(0, count)
+        self.beginResetModel()
+        self.records = list(records)
+        self.exhausted = len(records) < count
+        self.endResetModel()
+
+    def record_at(self, row):
+        return self.records[row]
+
+
+class RecordCardDelegate(QStyledItemDelegate):
+    """Paints a record as a card with badges, optional thumbnail and action buttons"""
+
+    actionTriggered = Signal(str, object)
+
+    def __init__(self, formatter, pixmap_loader=None, parent=None):
+        """
+        Args:
+            formatter: Callable(record) returning a card description dict
+            pixmap_loader: Optional callable(photo_path, size) returning a QPixmap
+        """
+        super().__init__(parent)
+        self.formatter = formatter
+        self.pixmap_loader = pixmap_loader
+
+        self.title_font = QFont()
+        self.title_font.setPixelSize(16)
+        self.title_font.setBold(True)
+        self.subtitle_font = QFont()
+        self.subtitle_font.setPixelSize(12)
+        self.subtitle_font.setItalic(True)
+        self.text_font = QFont()
+        self.text_font.setPixelSize(12)
+        self.bold_font = QFont(self.text_font)
+        self.bold_font.setBold(True)
+        self.badge_font = QFont()
+        self.badge_font.setPixelSize(11)
+        self.badge_font.setBold(True)
+
+    def sizeHint(self, option, index):
+        # Cards stretch to the view's width
+        return QSize(0, ROW_HEIGHT)
+
+    def card_rect(self, rect):
+        return rect.adjusted(10, 5, -10, -5)
+
+    def photo_rect(self, card_rect):
+        return QRect(card_rect.right() - PHOTO_SIZE - 12, card_rect.top() + (card_rect.height() - PHOTO_SIZE) // 2,
+                     PHOTO_SIZE, PHOTO_SIZE)
+
+    def action_rects(self, card_rect, card):
+        """Positions of the action buttons along the bottom of the card"""
+        metrics = QFontMetrics(self.badge_font)
+        rects = []
+        x = card_rect.left() + 15
+        y = card_rect.bottom() - 36
+        for action_id, label, _ in card.get('actions', []):
+            width = metrics.horizontalAdvance(label) + 24
+            rects.append((action_id, QRect(x, y, width, 28)))
+            x += width + 8
+        return rects
+
+    def paint(self, painter, option, index):
+        record = index.data(RecordRole)
+        if record is None:
+            return
+        card = self.formatter(record)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        rect = self.card_rect(option.rect)
+        painter.setPen(QPen(QColor(card.get('border', '#e0e0e0')), 2))
+        painter.setBrush(QColor(card.get('background', '#ffffff')))
+        painter.drawRoundedRect(rect, 8, 8)
+
+        right = rect.right() - 15
+        if card.get('photo') and self.pixmap_loader:
+            photo_rect = self.photo_rect(rect)
+            pixmap = self.thumbnail(card['photo'])
+            if pixmap is not None and not pixmap.isNull():
+                target = pixmap.rect()
+                target.moveCenter(photo_rect.center())
+                painter.drawPixmap(target, pixmap)
+            right = photo_rect.left() - 10
+
+        # Badges stacked in the top right
+        badge_metrics = QFontMetrics(self.badge_font)
+        painter.setFont(self.badge_font)
+        badge_y = rect.top() + 12
+        badge_left = right
+        for text, color in card.get('badges', []):
+            width = badge_metrics.horizontalAdvance(text) + 14
+            badge_rect = QRect(right - width, badge_y, width, 20)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(color))
+            painter.drawRoundedRect(badge_rect, 10, 10)
+            painter.setPen(QColor('white'))
+            painter.drawText(badge_rect, Qt.AlignCenter, text)
+            badge_y += 24
+            badge_left = min(badge_left, badge_rect.left())
+
+        # Title row with the date on the right
+        text_left = rect.left() + 15
+        text_width = badge_left - text_left - 10
+        y = rect.top() + 10
+        if card.get('date'):
+            painter.setFont(self.subtitle_font)
+            painter.setPen(QColor('#666'))
+            date_width = QFontMetrics(self.subtitle_font).horizontalAdvance(card['date']) + 10
+            painter.drawText(QRect(badge_left - date_width - 10, y, date_width, 22),
+                             Qt.AlignRight | Qt.AlignVCenter, card['date'])
+            text_width -= date_width
+
+        painter.setFont(self.title_font)
+        painter.setPen(QColor(card.get('title_color', '#2E7D32')))
+        painter.drawText(QRect(text_left, y, text_width, 22), Qt.AlignLeft | Qt.AlignVCenter,
+                         QFontMetrics(self.title_font).elidedText(card.get('title', ''), Qt.ElideRight, text_width))
+        y += 24
+
+        if card.get('subtitle'):
+            painter.setFont(self.subtitle_font)
+            painter.setPen(QColor('#666'))
+            painter.drawText(QRect(text_left, y, text_width, 18), Qt.AlignLeft | Qt.AlignVCenter,
+                             QFontMetrics(self.subtitle_font).elidedText(card['subtitle'], Qt.ElideRight, text_width))
+            y += 20
+
+        line_width = right - text_left
+        for text, color, bold in card.get('lines', [])[:2]:
+            font = self.bold_font if bold else self.text_font
+            painter.setFont(font)
+            painter.setPen(QColor(color))
+            painter.drawText(QRect(text_left, y, line_width, 18), Qt.AlignLeft | Qt.AlignVCenter,
+                             QFontMetrics(font).elidedText(text, Qt.ElideRight, line_width))
+            y += 20
+
+        # Action buttons
+        painter.setFont(self.badge_font)
+        colors = {action_id: color for action_id, _, color in card.get('actions', [])}
+        labels = {action_id: label for action_id, label, _ in card.get('actions', [])}
+        for action_id, action_rect in self.action_rects(rect, card):
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(colors[action_id]))
+            painter.drawRoundedRect(action_rect, 5, 5)
+            painter.setPen(QColor('white'))
+            painter.drawText(action_rect, Qt.AlignCenter, labels[action_id])
+
+        painter.restore()
+
+    def thumbnail(self, photo_path):
+        """Load a thumbnail once and keep it in Qt's pixmap cache"""
+        key = f"record-list:{photo_path}:{PHOTO_SIZE}"
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None or pixmap.isNull():
+            pixmap = self.pixmap_loader(photo_path, PHOTO_SIZE)
+            if pixmap.isNull():
+                return None
+            pixmap = pixmap.scaled(PHOTO_SIZE, PHOTO_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            QPixmapCache.insert(key, pixmap)
+        return pixmap
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() != QEvent.MouseButtonRelease or event.button() != Qt.LeftButton:
+            return False
+        record = index.data(RecordRole)
+        if record is None:
+            return False
+        card = self.formatter(record)
+        rect = self.card_rect(option.rect)
+        position = event.position().toPoint()
+
+        for action_id, action_rect in self.action_rects(rect, card):
+            if action_rect.contains(position):
+                self.actionTriggered.emit(action_id, record)
+                return True
+        if card.get('photo') and self.photo_rect(rect).contains(position):
+            self.actionTriggered.emit('view_photo', record)
+            return True
+        return False
+
+
+class RecordListView(QListView):
+    """List view of record cards that loads more records as it is scrolled"""
+
+    actionTriggered = Signal(str, object)
+
+    def __init__(self, fetch_page, formatter, pixmap_loader=None, empty_text='No records found.', parent=None):
+        super().__init__(parent)
+        self.empty_text = empty_text
+        # Refreshes are timed under the fetcher's owner, e.g. HealthRecordsScreen.refresh
+        self.fetch_name = getattr(fetch_page, '__qualname__', 'RecordListView').rsplit('.', 1)[0]
+
+        self.record_model = RecordListModel(fetch_page, parent=self)
+        self.delegate = RecordCardDelegate(formatter, pixmap_loader, self)
+        self.delegate.actionTriggered.connect(self.actionTriggered)
+        self.setModel(self.record_model)
+        self.setItemDelegate(self.delegate)
+
+        # Every card is the same height, so Qt can skip measuring rows
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.verticalScrollBar().setSingleStep(20)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setStyleSheet("""
+            QListView {
+                border: 1px solid #ddd;
+                border-radius: 5px;
+                background-color: white;
+            }
+        """)
+
+    def refresh(self, empty_text=None):
+        """Reload records from the fetcher"""
+        if empty_text is not None:
+            self.empty_text = empty_text
+        try:
+            with instrumentation.timed('screen', f"{self.fetch_name}.refresh"):
+                self.record_model.reload()
+        except Exception as e:
+            self.empty_text = f'Error loading records: {str(e)}'
+            self.record_model.beginResetModel()
+            self.record_model.records = []
+            self.record_model.exhausted = True
+            self.record_model.endResetModel()
+        self.viewport().update()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.record_model.rowCount() == 0:
+            painter = QPainter(self.viewport())
+            font = QFont()
+            font.setPixelSize(16)
+            painter.setFont(font)
+            painter.setPen(QColor('#666'))
+            painter.drawText(self.viewport().rect().adjusted(20, 20, -20, -20),
+                             Qt.AlignCenter | Qt.TextWordWrap, self.empty_text)
@@ -649,13 +649,10 @@ class SettingsConnectionsScreen(BaseScreen):
     
     def update_setting_direct(self, key, value):
         """Direct database update for settings (fallback method)"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
+        self.db_manager.execute('''
             INSERT OR REPLACE INTO settings (key, value, updated_at) 
             VALUES (?, ?, CURRENT_TIMESTAMP)
-        ''', (key, value))
-        conn.commit()
+        ''', (key, value), fetch=None, commit=True)
     
     def test_adafruit_connection(self):
         """Test Adafruit.IO connection with current settings using enhanced utilities"""
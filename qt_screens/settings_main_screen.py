@@ -199,9 +199,14 @@ class SettingsMainScreen(BaseScreen):
         status_label = QLabel('Status: Running PySide6 on Pi Touch Display')
         status_label.setStyleSheet(f"color: {APP_COLORS['text']['muted']}; font-size: 12px;")
         
+        # Diagnostics (runtime timings)
+        diagnostics_button = self.create_button('Diagnostics', lambda: self.go_to_screen('diagnostics'))
+        diagnostics_button.setMinimumHeight(45)
+        
         info_layout.addWidget(version_label)
         info_layout.addStretch()
         info_layout.addWidget(status_label)
+        info_layout.addWidget(diagnostics_button)
         
         self.main_layout.addLayout(info_layout)
         
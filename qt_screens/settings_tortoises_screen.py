@@ -404,7 +404,7 @@ class SettingsTortoisesScreen(BaseScreen):
         # Load photo if available
         if tortoise.get('photo_path') and os.path.exists(tortoise['photo_path']):
             try:
-                pixmap = QPixmap(tortoise['photo_path'])
+                pixmap = self.load_photo_pixmap(tortoise['photo_path'], 400)
                 if not pixmap.isNull():
                     # Create a rounded version of the photo
                     rounded_pixmap = self.create_rounded_pixmap(pixmap, 400, 400, 25)
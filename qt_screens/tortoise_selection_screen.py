@@ -7,7 +7,6 @@ import os
 from PySide6.QtWidgets import (QVBoxLayout, QHBoxLayout, QGridLayout, QPushButton, 
                               QLabel, QScrollArea, QWidget, QFrame)
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QPixmap
 from .base_screen import BaseScreen
 from .icon_manager import create_icon_button
 
@@ -135,7 +134,7 @@ class TortoiseSelectionScreen(BaseScreen):
         # Load photo if available
         if tortoise.get('photo_path') and os.path.exists(tortoise['photo_path']):
             try:
-                pixmap = QPixmap(tortoise['photo_path'])
+                pixmap = self.load_photo_pixmap(tortoise['photo_path'], 88)
                 if not pixmap.isNull():
                     # Scale to fill entire space
                     scaled_pixmap = pixmap.scaled(88, 88, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
@@ -7,6 +7,8 @@ import warnings
 from typing import Optional, Dict, Any, Tuple
 from datetime import datetime
 
+from utils.instrumentation import instrumentation
+
 # Suppress pkg_resources deprecation warning from Adafruit.IO library
 # This warning comes from the third-party library (adafruit-io v2.8.0), not our code
 # The library uses pkg_resources which is deprecated in setuptools>=81
@@ -17,6 +19,16 @@ warnings.filterwarnings("ignore", message="pkg_resources is deprecated.*")
 # Set up logging
 logger = logging.getLogger(__name__)
 
+
+def feed_call_name(method: str):
+    """Instrumentation name for a feed call, e.g. 'get_feed_value temperature'"""
+    return lambda args, kwargs: f"{method} {args[1] if len(args) > 1 else kwargs.get('feed_name')}"
+
+
+def call_succeeded(result) -> bool:
+    """Connector methods return (success, ...) tuples"""
+    return bool(result[0])
+
 class AdafruitIOConnector:
     """Handles Adafruit.IO connections and data operations"""
     
@@ -39,6 +51,7 @@ class AdafruitIOConnector:
             logger.error(f"Failed to initialize Adafruit.IO client: {e}")
             raise
     
+    @instrumentation.instrument('network', outcome=call_succeeded)
     def test_connection(self) -> Tuple[bool, str]:
         """
         Test connection to Adafruit.IO
@@ -63,6 +76,7 @@ class AdafruitIOConnector:
             else:
                 return False, f"Connection error: {error_msg}"
     
+    @instrumentation.instrument('network', feed_call_name('get_feed_value'), call_succeeded)
     def get_feed_value(self, feed_name: str) -> Tuple[bool, Optional[float], str]:
         """
         Get the latest value from a feed
@@ -114,6 +128,7 @@ class AdafruitIOConnector:
         
         return results
     
+    @instrumentation.instrument('network', feed_call_name('create_feed'), call_succeeded)
     def create_feed_if_not_exists(self, feed_name: str, description: str = '') -> Tuple[bool, str]:
         """
         Create a feed if it doesn't exist
@@ -145,6 +160,7 @@ class AdafruitIOConnector:
         except Exception as e:
             return False, f"Failed to create feed: {str(e)}"
     
+    @instrumentation.instrument('network', feed_call_name('send_data'), call_succeeded)
     def send_data(self, feed_name: str, value: float) -> Tuple[bool, str]:
         """
         Send data to a feed
@@ -166,6 +182,7 @@ class AdafruitIOConnector:
         except Exception as e:
             return False, f"Failed to send data: {str(e)}"
     
+    @instrumentation.instrument('network', feed_call_name('get_feed_history'), call_succeeded)
     def get_feed_history(self, feed_name: str, limit: int = 10) -> Tuple[bool, list, str]:
         """
         Get historical data from a feed
@@ -0,0 +1,127 @@
+"""
+Cached dashboard snapshot for the home screen
+
+The snapshot gathers everything the home screen shows: latest feeding per
+tortoise, due and overdue reminder counts, open health issues, diet warnings
+and the latest habitat sensor readings. The database parts are only recomputed when one of
+the tables they read has been written (see table_versions) or the day has
+changed. Sensor readings come from Adafruit.IO, so they are refreshed on a
+timer instead.
+"""
+
+import logging
+import time
+from datetime import date, timedelta
+from typing import Optional, Dict, Any
+
+from utils.adafruit_io_utils import create_adafruit_connector, get_sensor_thresholds
+from utils.diet_analytics import DietAnalytics
+
+logger = logging.getLogger(__name__)
+
+# Tables whose writes change the database part of the snapshot
+SNAPSHOT_TABLES = ['tortoises', 'feeding_records', 'care_reminders', 'health_records', 'plants']
+
+# Sensor readings are fetched from Adafruit.IO at most this often
+SENSOR_REFRESH_SECONDS = 60
+
+
+class DashboardService:
+    """Builds and caches the home screen dashboard snapshot"""
+
+    def __init__(self, db_manager, sensor_refresh_seconds: float = SENSOR_REFRESH_SECONDS):
+        self.db_manager = db_manager
+        self.diet_analytics = DietAnalytics(db_manager)
+        self.sensor_refresh_seconds = sensor_refresh_seconds
+        self.snapshot = None
+        self.snapshot_key = None
+        self.settings_version = None
+        self.connector = None
+        self.sensor_config = None
+        self.sensors = None
+        self.sensors_fetched_at = 0.0
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """
+        Get the current dashboard snapshot
+
+        Returns:
+            Dict with 'feedings' (latest per tortoise), 'last_feeding', reminder and
+            health counts, 'diet_warnings', 'sensors' and 'updated_at'. The same dict is returned
+            until something it depends on changes.
+        """
+        versions = self.db_manager.get_table_versions(SNAPSHOT_TABLES + ['settings'])
+        settings_version = versions.pop('settings')
+        today = date.today()
+        key = (tuple(sorted(versions.items())), today)
+
+        sensors_changed = self.refresh_sensors(settings_version)
+        if key != self.snapshot_key:
+            self.snapshot = self.build_snapshot(today)
+            self.snapshot_key = key
+        elif sensors_changed:
+            self.snapshot = dict(self.snapshot)
+        else:
+            return self.snapshot
+
+        self.snapshot['sensors'] = self.sensors
+        self.snapshot['updated_at'] = time.time()
+        return self.snapshot
+
+    def build_snapshot(self, today: date) -> Dict[str, Any]:
+        """Read the database part of the snapshot"""
+        feedings = self.db_manager.get_latest_feedings()
+        counts = self.db_manager.get_dashboard_counts(today.isoformat(),
+                                                      (today + timedelta(days=1)).isoformat())
+        fed = [f for f in feedings if f['feeding_date']]
+        snapshot = {
+            'feedings': feedings,
+            'last_feeding': fed[0] if fed else None,
+            'diet_warnings': self.diet_analytics.warnings(today),
+        }
+        snapshot.update(counts)
+        return snapshot
+
+    def refresh_sensors(self, settings_version: int) -> bool:
+        """
+        Update the cached sensor readings if they are due for a refresh
+
+        Returns:
+            bool: True if the readings were fetched again
+        """
+        if settings_version != self.settings_version:
+            # Credentials, feed names or thresholds may have changed
+            self.settings_version = settings_version
+            self.connector = create_adafruit_connector(self.db_manager)
+            self.sensor_config = {
+                'temperature_feed': self.db_manager.get_setting('temp_feed_name') or 'temperature',
+                'humidity_feed': self.db_manager.get_setting('humidity_feed_name') or 'humidity',
+                'thresholds': get_sensor_thresholds(self.db_manager),
+            }
+            self.sensors = None
+
+        if self.sensors is not None and time.monotonic() - self.sensors_fetched_at < self.sensor_refresh_seconds:
+            return False
+        self.sensors_fetched_at = time.monotonic()
+
+        sensors = {'configured': self.connector is not None, 'thresholds': self.sensor_config['thresholds']}
+        if self.connector:
+            try:
+                sensors['temperature'] = self.connector.get_feed_value(self.sensor_config['temperature_feed'])
+                sensors['humidity'] = self.connector.get_feed_value(self.sensor_config['humidity_feed'])
+            except Exception as e:
+                logger.error(f"Failed to read sensors: {e}")
+                sensors['error'] = str(e)
+        self.sensors = sensors
+        return True
+
+
+_dashboard_service: Optional[DashboardService] = None
+
+
+def get_dashboard_service(db_manager) -> DashboardService:
+    """Get the shared dashboard service"""
+    global _dashboard_service
+    if _dashboard_service is None or _dashboard_service.db_manager is not db_manager:
+        _dashboard_service = DashboardService(db_manager)
+    return _dashboard_service
@@ -0,0 +1,172 @@
+"""
+Diet balance analytics over the feeding history
+
+Every feeding session adds its plant items to three aggregates (see
+DatabaseManager.add_diet_aggregates):
+
+    diet_cumulative  grams by safety level and nutrition class fed to each
+                     tortoise up to each feeding day (running totals)
+    diet_plant_last  the last day each plant was fed to each tortoise
+    diet_daily       grams per tortoise, day and plant
+
+A window such as "the last 30 days" is the running totals at today minus
+those at the day before the window starts - one primary key lookup per
+tortoise for each end, whatever the window length - and its variety is the
+number of plants last fed inside it. That only holds for windows ending
+today; variety for a window ending earlier, and the per-plant breakdown
+behind top_plants(), read the diet_daily rows in the window.
+
+Safety levels and nutrition classes come from the plant catalogue as it is
+now: when a plant is reclassified or deleted the aggregates are recounted
+(DatabaseManager.ensure_diet_aggregates).
+
+The home screen turns the windows into warnings:
+
+    toxic plant fed in the last 7 days            -> error
+    caution plants over 15% of the last 30 days   -> warning
+    more oxalate-heavy than calcium-rich food     -> warning
+    fewer than 5 different plants in 30 days      -> warning
+"""
+
+from datetime import date, timedelta
+from typing import Optional, List, Dict, Any
+
+from utils.feeding import NUTRITION_CLASSES, DIET_FIELDS
+
+# Windows (days) offered for diet balance
+WINDOWS = (7, 30, 90)
+
+# Warning thresholds
+TOXIC_WINDOW_DAYS = 7
+BALANCE_WINDOW_DAYS = 30
+CAUTION_SHARE_WARNING = 0.15
+MIN_PLANT_VARIETY = 5
+
+SAFETY_LEVELS = ('safe', 'caution', 'toxic')
+
+
+def empty_balance(days: int) -> Dict[str, Any]:
+    return {
+        'days': days,
+        'total': 0.0,
+        'by_safety': {level: 0.0 for level in SAFETY_LEVELS},
+        'nutrition': {name: 0.0 for name in NUTRITION_CLASSES},
+        'variety': 0,
+    }
+
+
+def share(balance: Dict[str, Any], grams: float) -> float:
+    """Fraction of a window's total weight (0 for an empty window)"""
+    return grams / balance['total'] if balance['total'] else 0.0
+
+
+class DietAnalytics:
+    """Windowed diet balance per tortoise from the diet aggregates"""
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+
+    def window_start(self, days: int, today: Optional[date] = None) -> str:
+        """First day of a window ending today (a 7 day window is today and the 6 days before)"""
+        return ((today or date.today()) - timedelta(days=days - 1)).isoformat()
+
+    def balances(self, days: int, today: Optional[date] = None,
+                 tortoise_id: Optional[int] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Diet balance of every tortoise fed in the window
+
+        Args:
+            days: Window length, usually one of WINDOWS
+            today: Last day of the window (defaults to today)
+            tortoise_id: Only this tortoise
+
+        Returns:
+            Dict[int, Dict]: Per tortoise - total grams, grams by_safety and by
+            nutrition class and variety (distinct plants)
+        """
+        self.db_manager.ensure_diet_aggregates()
+        today = today or date.today()
+        start = self.window_start(days, today)
+        before = (date.fromisoformat(start) - timedelta(days=1)).isoformat()
+        earlier = self.db_manager.get_diet_totals(before, tortoise_id)
+        # Plants' last feeding days only describe windows that end today
+        until = today.isoformat() if today < date.today() else None
+        variety = self.db_manager.get_diet_variety(start, until, tortoise_id)
+
+        balances = {}
+        for tid, totals in self.db_manager.get_diet_totals(today.isoformat(), tortoise_id).items():
+            previous = earlier.get(tid)
+            # Rounded so float residue from the subtraction never reads as a few mg fed
+            grams = {field: round(totals[field] - (previous[field] if previous else 0), 3)
+                     for field in DIET_FIELDS}
+            if grams['total'] <= 0:
+                continue
+            balance = balances[tid] = empty_balance(days)
+            balance['total'] = grams['total']
+            balance['by_safety'] = {level: grams[level] for level in SAFETY_LEVELS}
+            balance['nutrition'] = {name: grams[name] for name in NUTRITION_CLASSES}
+            balance['variety'] = variety.get(tid, 0)
+        return balances
+
+    def balance(self, tortoise_id: int, days: int, today: Optional[date] = None) -> Dict[str, Any]:
+        """Diet balance of one tortoise (an empty balance if it wasn't fed in the window)"""
+        return self.balances(days, today, tortoise_id).get(tortoise_id, empty_balance(days))
+
+    def caution_share(self, tortoise_id: int, days: int = BALANCE_WINDOW_DAYS,
+                      today: Optional[date] = None) -> float:
+        """Fraction of a tortoise's diet in the window that was 'caution' plants"""
+        balance = self.balance(tortoise_id, days, today)
+        return share(balance, balance['by_safety']['caution'])
+
+    def top_plants(self, tortoise_id: int, days: int, limit: int = 5,
+                   today: Optional[date] = None) -> List[Dict[str, Any]]:
+        """The plants fed most by weight in the window, with their share"""
+        self.db_manager.ensure_diet_aggregates()
+        plants = {}
+        today = today or date.today()
+        for row in self.db_manager.get_diet_window(self.window_start(days, today), tortoise_id,
+                                                   until=today.isoformat()):
+            plants[row['plant_id']] = plants.get(row['plant_id'], 0) + (row['grams'] or 0)
+        total = sum(plants.values())
+        plant_map = self.db_manager.get_plant_safety_map()
+        ranked = sorted(plants.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [{'plant_id': plant_id,
+                 'name': plant_map[plant_id]['name'] if plant_id in plant_map else f"Plant {plant_id}",
+                 'grams': grams,
+                 'share': grams / total if total else 0.0} for plant_id, grams in ranked]
+
+    def warnings(self, today: Optional[date] = None) -> List[Dict[str, Any]]:
+        """
+        Diet warnings for every active tortoise, most serious first
+
+        Returns:
+            List[Dict]: tortoise_id, tortoise_name, level ('error' or 'warning') and message
+        """
+        tortoises = {t['id']: t['name'] for t in self.db_manager.get_tortoises()}
+        recent = self.balances(TOXIC_WINDOW_DAYS, today)
+        window = self.balances(BALANCE_WINDOW_DAYS, today)
+
+        warnings = []
+        for tortoise_id, name in tortoises.items():
+            toxic = recent.get(tortoise_id, empty_balance(TOXIC_WINDOW_DAYS))['by_safety']['toxic']
+            if toxic:
+                warnings.append({'tortoise_id': tortoise_id, 'tortoise_name': name, 'level': 'error',
+                                 'message': f"{name} was fed {toxic:.0f} g of toxic plants this week"})
+
+            balance = window.get(tortoise_id)
+            if not balance:
+                continue
+            caution = share(balance, balance['by_safety']['caution'])
+            if caution > CAUTION_SHARE_WARNING:
+                warnings.append({'tortoise_id': tortoise_id, 'tortoise_name': name, 'level': 'warning',
+                                 'message': f"{name}: {caution:.0%} caution plants in {BALANCE_WINDOW_DAYS} days"})
+            if balance['nutrition']['oxalate'] > balance['nutrition']['calcium_rich']:
+                warnings.append({'tortoise_id': tortoise_id, 'tortoise_name': name, 'level': 'warning',
+                                 'message': f"{name}: more oxalate-heavy than calcium-rich food"})
+            if balance['variety'] < MIN_PLANT_VARIETY:
+                warnings.append({'tortoise_id': tortoise_id, 'tortoise_name': name, 'level': 'warning',
+                                 'message': f"{name}: only {balance['variety']} different plants "
+                                            f"in {BALANCE_WINDOW_DAYS} days"})
+
+        warnings.sort(key=lambda w: w['level'] != 'error')
+        return warnings
@@ -0,0 +1,125 @@
+"""
+Feeding session helpers
+
+A feeding session is a list of items, each either a plant from the
+catalogue or a supplement, with a weight in grams:
+
+    {'plant_id': 12, 'weight': 15.0}
+    {'supplement_name': 'Calcium', 'weight': 0.5}
+
+Plants are classed by the nutrition notes in the catalogue - calcium-rich,
+oxalate-heavy or goitrogenic (a plant can be several) - and by safety
+level. session_totals() turns a session into the grams per class that
+DatabaseManager adds to each tortoise's running nutrition totals.
+"""
+
+from typing import Dict, List, Any, FrozenSet
+
+# Nutrition classes tracked per tortoise, with the note keywords that mark them
+NUTRITION_KEYWORDS = {
+    'calcium_rich': ('calcium',),
+    'oxalate': ('oxalate',),
+    'goitrogen': ('goitrogen',),
+}
+NUTRITION_CLASSES = tuple(NUTRITION_KEYWORDS)
+
+# Columns of feeding_nutrition_totals in grams; total_weight is food only, not supplements
+TOTAL_FIELDS = ('total_weight', 'calcium_rich', 'oxalate', 'goitrogen', 'caution', 'toxic', 'supplements')
+
+# Columns of diet_cumulative in grams: plant food by safety level and nutrition class
+DIET_FIELDS = ('total', 'safe', 'caution', 'toxic') + NUTRITION_CLASSES
+
+SUPPLEMENTS = ['Calcium', 'Calcium + D3', 'Multivitamin', 'Cuttlebone']
+
+NUTRITION_LABELS = {
+    'calcium_rich': 'Calcium-rich',
+    'oxalate': 'Oxalate-heavy',
+    'goitrogen': 'Goitrogenic',
+}
+
+
+def classify_nutrition(notes: str) -> FrozenSet[str]:
+    """
+    Nutrition classes mentioned in a plant's notes
+
+    Args:
+        notes: nutrition_notes from the plants table
+
+    Returns:
+        frozenset: Subset of NUTRITION_CLASSES
+    """
+    text = (notes or '').lower()
+    return frozenset(name for name, keywords in NUTRITION_KEYWORDS.items()
+                     if any(keyword in text for keyword in keywords))
+
+
+def empty_totals() -> Dict[str, float]:
+    totals = {field: 0.0 for field in TOTAL_FIELDS}
+    totals['sessions'] = 0
+    return totals
+
+
+def session_totals(items: List[Dict[str, Any]], plant_map: Dict[int, Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Grams per nutrition class and safety level for one session
+
+    Args:
+        items: Session items (plant_id or supplement_name, weight)
+        plant_map: DatabaseManager.get_plant_safety_map()
+
+    Returns:
+        Dict with every TOTAL_FIELDS key and sessions = 1
+    """
+    totals = empty_totals()
+    totals['sessions'] = 1
+    for item in items:
+        weight = float(item.get('weight') or 0)
+        if item.get('supplement_name'):
+            # Supplements are tracked separately from the food weight
+            totals['supplements'] += weight
+            continue
+        totals['total_weight'] += weight
+        plant = plant_map.get(item.get('plant_id'))
+        if plant is None:
+            continue
+        for name in plant['nutrition']:
+            totals[name] += weight
+        if plant['safety_level'] in ('caution', 'toxic'):
+            totals[plant['safety_level']] += weight
+    return totals
+
+
+def add_totals(running: Dict[str, float], session: Dict[str, float]) -> Dict[str, float]:
+    """Running totals with a session's totals added (neither argument is changed)"""
+    combined = dict(running)
+    for field in TOTAL_FIELDS + ('sessions',):
+        combined[field] = (combined.get(field) or 0) + session.get(field, 0)
+    return combined
+
+
+def share(totals: Dict[str, float], field: str) -> float:
+    """Fraction of the total weight in one class (0 when nothing has been fed)"""
+    total = totals.get('total_weight') or 0
+    return (totals.get(field) or 0) / total if total else 0.0
+
+
+def diet_grams(items: List[Dict[str, Any]], plant_map: Dict[int, Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Grams of plant food per DIET_FIELDS for a session (supplements and unknown plants are left out)
+
+    Args:
+        items: Session items (plant_id or supplement_name, weight)
+        plant_map: DatabaseManager.get_plant_safety_map()
+    """
+    grams = {field: 0.0 for field in DIET_FIELDS}
+    for item in items:
+        plant = plant_map.get(item.get('plant_id'))
+        if plant is None:
+            continue
+        weight = float(item.get('weight') or 0)
+        grams['total'] += weight
+        if plant['safety_level'] in grams:
+            grams[plant['safety_level']] += weight
+        for name in plant['nutrition']:
+            grams[name] += weight
+    return grams
@@ -0,0 +1,351 @@
+"""
+Growth analytics for tortoise measurement history
+
+Loads growth_records into NumPy arrays and computes growth rates, a von
+Bertalanffy growth curve, a weight/length condition index and anomaly flags.
+Results are cached per tortoise and only recomputed when that tortoise's
+records change.
+"""
+
+import logging
+from typing import Optional, List, Dict, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Growth rates are reported per 30 days, from the measurements in this window
+RATE_WINDOW_DAYS = 90
+DAYS_PER_MONTH = 30.0
+
+# Growth constants (per day) tried when fitting the von Bertalanffy curve.
+# Hermann's tortoises take roughly 5-20 years to approach adult size. The best
+# coarse value is then refined on a finer grid between its neighbours.
+K_GRID = np.geomspace(1e-4, 2e-2, 24) if NUMPY_AVAILABLE else None
+K_REFINE_STEPS = 12
+
+MIN_CURVE_POINTS = 4
+
+# Upper bound on (k values x tortoises x measurements) evaluated at once when fitting
+MAX_FIT_ELEMENTS = 2_000_000
+
+# SQLite julianday() of the Unix epoch
+UNIX_EPOCH_JULIAN_DAY = 2440587.5
+
+# A measurement is anomalous when its robust z-score exceeds this
+ANOMALY_Z = 3.5
+
+# Weight drops larger than this fraction between measurements are flagged
+WEIGHT_DROP_FRACTION = 0.10
+
+
+def solve_growth_curves(k_values, days, values, weight):
+    """
+    Least-squares L_inf/L_0 for candidate growth constants
+
+    Args:
+        k_values: (candidates, tortoises) growth constants to try
+        days, values, weight: (tortoises, measurements), weight 0 for padding
+
+    Returns:
+        (a, b, sse) arrays of shape (candidates, tortoises) for value = a + b * exp(-k * day)
+    """
+    counts = weight.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        basis = np.exp(-k_values[:, :, None] * days[None, :, :])
+        basis_mean = (basis * weight).sum(axis=2) / counts
+        value_mean = values.sum(axis=1) / counts
+        centered = (basis - basis_mean[:, :, None]) * weight
+        variance = (centered ** 2).sum(axis=2)
+        covariance = (centered * (values - value_mean[:, None])).sum(axis=2)
+
+        b = covariance / variance
+        a = value_mean - b * basis_mean
+        residuals = (values - a[:, :, None] - b[:, :, None] * basis) * weight
+        sse = (residuals ** 2).sum(axis=2)
+    # Growth means approaching a positive asymptote from below (b < 0)
+    sse = np.where(np.isfinite(sse) & (b < 0) & (a > 0), sse, np.inf)
+    return a, b, sse
+
+
+def fit_von_bertalanffy_batch(days, values, mask) -> List[Optional[Dict[str, float]]]:
+    """
+    Fit L(t) = L_inf - (L_inf - L_0) * exp(-k * t) for many tortoises at once
+
+    For a fixed k the curve is linear in L_inf and L_0, so every candidate k
+    is solved in closed form for every tortoise in one set of array operations
+    and the best k per tortoise is kept.
+
+    Args:
+        days: (tortoises, measurements) days since each tortoise's first measurement
+        values: Measured lengths (or weights), same shape
+        mask: True where a value was measured (rows are padded with False)
+
+    Returns:
+        Per tortoise, a dict with l_inf, l_0, k (per day) and rmse, or None if no growth curve fits
+    """
+    weight = mask.astype(np.float64)
+    values = np.where(mask, values, 0.0)
+    counts = weight.sum(axis=1)
+    span = np.where(mask, days, -np.inf).max(axis=1) - np.where(mask, days, np.inf).min(axis=1)
+    columns = np.arange(len(counts))
+
+    # Coarse pass over K_GRID, then a finer pass around each tortoise's best k
+    coarse = np.repeat(K_GRID[:, None], len(counts), axis=1)
+    _, _, sse = solve_growth_curves(coarse, days, values, weight)
+    best_k = K_GRID[np.argmin(sse, axis=0)]
+    ratio = K_GRID[1] / K_GRID[0]
+    fine = best_k[None, :] * np.geomspace(1 / ratio, ratio, K_REFINE_STEPS)[:, None]
+    a, b, sse = solve_growth_curves(fine, days, values, weight)
+    best = np.argmin(sse, axis=0)
+
+    fits = []
+    for column, k_index in zip(columns, best):
+        if (not np.isfinite(sse[k_index, column]) or counts[column] < MIN_CURVE_POINTS
+                or span[column] <= 0):
+            fits.append(None)
+            continue
+        fits.append({
+            'l_inf': float(a[k_index, column]),
+            'l_0': float(a[k_index, column] + b[k_index, column]),
+            'k': float(fine[k_index, column]),
+            'rmse': float(np.sqrt(sse[k_index, column] / counts[column])),
+        })
+    return fits
+
+
+def fit_growth_curves(series: List[tuple]) -> List[tuple]:
+    """
+    Fit length and weight curves for a list of (days, weights, lengths) series
+
+    Series are padded into one matrix and fitted in chunks that keep the
+    intermediate arrays under MAX_FIT_ELEMENTS.
+
+    Returns:
+        List of (length_curve, weight_curve) in the same order
+    """
+    if not series:
+        return []
+    longest = max(len(days) for days, _, _ in series)
+    per_chunk = max(1, MAX_FIT_ELEMENTS // (max(len(K_GRID), K_REFINE_STEPS) * longest))
+
+    curves = []
+    for start in range(0, len(series), per_chunk):
+        chunk = series[start:start + per_chunk]
+        days = np.zeros((len(chunk), longest))
+        weights = np.full((len(chunk), longest), np.nan)
+        lengths = np.full((len(chunk), longest), np.nan)
+        for row, (d, w, l) in enumerate(chunk):
+            days[row, :len(d)] = d
+            weights[row, :len(w)] = w
+            lengths[row, :len(l)] = l
+        length_fits = fit_von_bertalanffy_batch(days, lengths, ~np.isnan(lengths))
+        weight_fits = fit_von_bertalanffy_batch(days, weights, ~np.isnan(weights))
+        curves.extend(zip(length_fits, weight_fits))
+    return curves
+
+
+def fit_von_bertalanffy(days, values) -> Optional[Dict[str, float]]:
+    """Fit the growth curve for a single series (see fit_von_bertalanffy_batch)"""
+    return fit_von_bertalanffy_batch(days[None, :], values[None, :], ~np.isnan(values)[None, :])[0]
+
+
+def julian_to_date(julian_day: float) -> str:
+    """Format a SQLite julian day number as YYYY-MM-DD"""
+    return str(np.datetime64(int(round(julian_day - UNIX_EPOCH_JULIAN_DAY)), 'D'))
+
+
+def rate_per_month(days, values) -> Optional[float]:
+    """Least-squares slope of the recent measurements, per 30 days"""
+    recent = days >= days[-1] - RATE_WINDOW_DAYS
+    days, values = days[recent], values[recent]
+    if len(values) < 2 or days[-1] <= days[0]:
+        return None
+    centered = days - days.mean()
+    slope = (centered @ (values - values.mean())) / (centered @ centered)
+    return float(slope * DAYS_PER_MONTH)
+
+
+def median(values):
+    """Median of a small 1-D array (np.median's overhead dominates at this size)"""
+    ordered = np.sort(values)
+    middle = len(ordered) // 2
+    return (ordered[middle] + ordered[~middle]) / 2
+
+
+def robust_z(values):
+    """Distance from the median in units of the (scaled) median absolute deviation"""
+    center = median(values)
+    mad = median(np.abs(values - center)) * 1.4826
+    if mad == 0:
+        return np.zeros_like(values)
+    return (values - center) / mad
+
+
+def analyze_series(julian_days, weights, lengths, curves=None) -> Dict[str, Any]:
+    """
+    Analyze one tortoise's measurement history
+
+    Args:
+        julian_days: Measurement dates as julian day numbers, sorted ascending
+        weights: Weights in grams (NaN where not measured)
+        lengths: Carapace lengths in cm (NaN where not measured)
+        curves: (length_curve, weight_curve) if already fitted in a batch
+
+    Returns:
+        Dict of growth statistics and anomalies
+    """
+    days = julian_days - julian_days[0]
+    if curves is None:
+        curves = (fit_von_bertalanffy(days, lengths), fit_von_bertalanffy(days, weights))
+    has_weight = ~np.isnan(weights)
+    has_length = ~np.isnan(lengths)
+    both = has_weight & has_length
+
+    result = {
+        'count': len(julian_days),
+        'first_date': julian_to_date(julian_days[0]),
+        'last_date': julian_to_date(julian_days[-1]),
+        'latest_weight': float(weights[has_weight][-1]) if has_weight.any() else None,
+        'latest_length': float(lengths[has_length][-1]) if has_length.any() else None,
+        'weight_rate_per_month': rate_per_month(days[has_weight], weights[has_weight]) if has_weight.any() else None,
+        'length_rate_per_month': rate_per_month(days[has_length], lengths[has_length]) if has_length.any() else None,
+        'length_curve': curves[0],
+        'weight_curve': curves[1],
+        'condition_index': None,
+        'anomalies': [],
+    }
+
+    # Condition index: grams per cubic cm of carapace length
+    if both.any():
+        condition = weights[both] / lengths[both] ** 3
+        result['condition_index'] = float(condition[-1])
+        if len(condition) >= MIN_CURVE_POINTS:
+            for index in np.flatnonzero(np.abs(robust_z(condition)) > ANOMALY_Z):
+                result['anomalies'].append({
+                    'date': julian_to_date(julian_days[both][index]),
+                    'kind': 'condition',
+                    'message': f"Condition index {condition[index]:.3f} is unusual for this tortoise",
+                })
+
+    # Sudden weight loss between consecutive weighings
+    if has_weight.sum() >= 2:
+        weight_values = weights[has_weight]
+        change = np.diff(weight_values) / weight_values[:-1]
+        for index in np.flatnonzero(change < -WEIGHT_DROP_FRACTION):
+            result['anomalies'].append({
+                'date': julian_to_date(julian_days[has_weight][index + 1]),
+                'kind': 'weight_drop',
+                'message': f"Weight dropped {-change[index] * 100:.0f}% since the previous measurement",
+            })
+
+    # Measurements far off the fitted growth curves (likely typos or weighing errors)
+    for name, mask, values, curve in (('length', has_length, lengths, result['length_curve']),
+                                      ('weight', has_weight, weights, result['weight_curve'])):
+        if curve is None:
+            continue
+        fitted = curve['l_inf'] - (curve['l_inf'] - curve['l_0']) * np.exp(-curve['k'] * days[mask])
+        for index in np.flatnonzero(np.abs(robust_z(values[mask] - fitted)) > ANOMALY_Z):
+            result['anomalies'].append({
+                'date': julian_to_date(julian_days[mask][index]),
+                'kind': f'{name}_outlier',
+                'message': f"{name.title()} {values[mask][index]:g} is far from the growth curve",
+            })
+
+    result['anomalies'].sort(key=lambda anomaly: anomaly['date'])
+    return result
+
+
+class GrowthAnalytics:
+    """Per-tortoise growth analytics cached against the growth_records they came from"""
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        # tortoise_id -> (signature, result)
+        self.cache: Dict[int, Tuple[tuple, Dict[str, Any]]] = {}
+        self.cached_version = None
+
+    def get_signatures(self) -> Dict[int, tuple]:
+        """Cheap per-tortoise fingerprint of its growth records"""
+        rows = self.db_manager.execute('''
+            SELECT tortoise_id, COUNT(*), MAX(id), TOTAL(weight), TOTAL(length), MAX(measurement_date)
+            FROM growth_records
+            GROUP BY tortoise_id
+        ''')
+        return {row[0]: tuple(row[1:]) for row in rows}
+
+    def load_arrays(self, tortoise_ids: List[int]) -> Dict[int, tuple]:
+        """
+        Load measurement history for several tortoises in one query
+
+        Returns:
+            Dict of tortoise_id -> (julian_days, weights, lengths) NumPy arrays
+        """
+        placeholders = ','.join('?' * len(tortoise_ids))
+        rows = self.db_manager.execute(f'''
+            SELECT tortoise_id, julianday(substr(measurement_date, 1, 10)), weight, length
+            FROM growth_records
+            WHERE tortoise_id IN ({placeholders}) AND (weight IS NOT NULL OR length IS NOT NULL)
+            ORDER BY tortoise_id, measurement_date
+        ''', tortoise_ids)
+        if not rows:
+            return {}
+
+        # NULL measurements become NaN
+        data = np.array(rows, dtype=np.float64)
+        ids, dates, weights, lengths = data.T
+
+        # Rows are grouped by tortoise, so each tortoise is one contiguous slice
+        starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+        ends = np.r_[starts[1:], len(ids)]
+        return {int(ids[s]): (dates[s:e], weights[s:e], lengths[s:e]) for s, e in zip(starts, ends)}
+
+    def analyze_all(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Get analytics for every tortoise with measurements
+
+        Only tortoises whose records changed since the last call are recomputed.
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("Install with: pip install numpy")
+
+        version = self.db_manager.get_table_version('growth_records')
+        if version == self.cached_version:
+            return self.cached_results()
+
+        signatures = self.get_signatures()
+        stale = [tortoise_id for tortoise_id, signature in signatures.items()
+                 if self.cache.get(tortoise_id, (None,))[0] != signature]
+
+        for tortoise_id in set(self.cache) - set(signatures):
+            del self.cache[tortoise_id]
+
+        if stale:
+            arrays = self.load_arrays(stale)
+            measured = [tortoise_id for tortoise_id in stale if tortoise_id in arrays]
+            curves = fit_growth_curves([(dates - dates[0], weights, lengths)
+                                        for dates, weights, lengths in (arrays[t] for t in measured)])
+            curves_by_id = dict(zip(measured, curves))
+
+            for tortoise_id in stale:
+                result = None
+                # Tortoises with only photo records have nothing to analyze
+                if tortoise_id in arrays:
+                    result = analyze_series(*arrays[tortoise_id], curves=curves_by_id[tortoise_id])
+                    result['tortoise_id'] = tortoise_id
+                self.cache[tortoise_id] = (signatures[tortoise_id], result)
+            logger.debug(f"Recomputed growth analytics for {len(stale)} tortoises")
+
+        self.cached_version = version
+        return self.cached_results()
+
+    def cached_results(self) -> Dict[int, Dict[str, Any]]:
+        return {tortoise_id: result for tortoise_id, (_, result) in self.cache.items() if result}
+
+    def analyze(self, tortoise_id: int) -> Optional[Dict[str, Any]]:
+        """Get analytics for one tortoise, or None if it has no measurements"""
+        return self.analyze_all().get(tortoise_id)
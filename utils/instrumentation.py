@@ -0,0 +1,334 @@
+"""
+Lightweight runtime instrumentation
+
+Times the app's hot paths and keeps per-operation aggregates (calls, total,
+average and worst duration, errors, rows) plus a ring buffer of the most
+recent events:
+
+    db       - every SQL statement (through InstrumentedConnection)
+    network  - Adafruit.IO calls, named by method and feed
+    image    - photo and thumbnail decodes
+    screen   - build_ui, on_enter and list/dashboard refreshes
+
+Instrumentation is off unless TORTOISE_INSTRUMENTATION=1 is set or the
+'instrumentation_enabled' setting is 'true'. While off, timed() hands back a
+shared no-op context and the database uses plain sqlite3 connections, so the
+cost is one attribute check per instrumented call.
+
+The photo server runs in its own process, so the app writes its summary to
+diagnostics.json next to the database for /api/diagnostics to serve.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from functools import wraps
+from typing import Optional, Dict, Any, Callable
+
+from utils.query_stats import fingerprint
+
+logger = logging.getLogger(__name__)
+
+ENV_VAR = 'TORTOISE_INSTRUMENTATION'
+SETTING_KEY = 'instrumentation_enabled'
+
+# Recent events kept for the diagnostics screen
+RING_SIZE = 500
+
+# Distinct operations tracked before the least recently used are dropped
+MAX_OPERATIONS = 300
+
+# Longest SQL text kept as an operation name
+MAX_SQL_LENGTH = 160
+
+SNAPSHOT_FILE = 'diagnostics.json'
+
+CATEGORIES = ('db', 'network', 'image', 'screen')
+
+
+def sql_label(sql: str) -> str:
+    """Fingerprint a SQL statement (so its literals don't split it) and trim it for display"""
+    label = fingerprint(sql)
+    return label if len(label) <= MAX_SQL_LENGTH else label[:MAX_SQL_LENGTH - 3] + '...'
+
+
+class _NullTimer:
+    """Context manager that does nothing, handed out while instrumentation is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    """Times a block and records it on exit (an exception counts as an error)"""
+
+    def __init__(self, instrumentation, category, name):
+        self.instrumentation = instrumentation
+        self.category = category
+        self.name = name
+        self.rows = None
+        self.ok = True
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.instrumentation.record(self.category, self.name, time.perf_counter() - self.start,
+                                    rows=self.rows, ok=self.ok and exc_type is None)
+        return False
+
+
+class Instrumentation:
+    """Aggregates and recent events for instrumented operations"""
+
+    def __init__(self, ring_size: int = RING_SIZE, max_operations: int = MAX_OPERATIONS):
+        self.enabled = False
+        self.max_operations = max_operations
+        self.events = deque(maxlen=ring_size)
+        self.operations: OrderedDict = OrderedDict()
+        self.started_at = time.time()
+        self.lock = threading.Lock()
+
+    def set_enabled(self, enabled: bool):
+        self.enabled = bool(enabled)
+
+    def configure(self, db_manager=None) -> bool:
+        """
+        Turn instrumentation on or off from the environment or the settings table
+
+        Returns:
+            bool: Whether instrumentation is now enabled
+        """
+        enabled = os.environ.get(ENV_VAR, '').lower() in ('1', 'true', 'yes')
+        if not enabled and db_manager is not None:
+            try:
+                enabled = (db_manager.get_setting(SETTING_KEY) or '').lower() == 'true'
+            except sqlite3.Error as e:
+                logger.warning(f"Could not read instrumentation setting: {e}")
+        self.set_enabled(enabled)
+        return self.enabled
+
+    def reset(self):
+        with self.lock:
+            self.events.clear()
+            self.operations.clear()
+            self.started_at = time.time()
+
+    def record(self, category: str, name: str, duration: float, rows: Optional[int] = None,
+               ok: bool = True, calls: int = 1):
+        """
+        Add a timing to the aggregates
+
+        Args:
+            category: One of CATEGORIES
+            name: Operation name (SQL text, method and feed, screen method...)
+            duration: Seconds
+            rows: Rows returned or changed, if known
+            ok: False if the operation failed
+            calls: 0 to add time and rows to an earlier call (e.g. fetching its results)
+        """
+        if not self.enabled:
+            return
+        key = (category, name)
+        with self.lock:
+            stats = self.operations.get(key)
+            if stats is None:
+                stats = self.operations[key] = {'calls': 0, 'total': 0.0, 'max': 0.0, 'errors': 0, 'rows': 0}
+                if len(self.operations) > self.max_operations:
+                    self.operations.popitem(last=False)
+            else:
+                self.operations.move_to_end(key)
+            stats['calls'] += calls
+            stats['total'] += duration
+            if calls:
+                stats['max'] = max(stats['max'], duration)
+            if not ok:
+                stats['errors'] += 1
+            if rows is not None and rows > 0:
+                stats['rows'] += rows
+            if calls:
+                self.events.append((time.time(), category, name, duration, rows, ok))
+
+    def timed(self, category: str, name: str):
+        """Context manager timing a block; a no-op while disabled"""
+        if not self.enabled:
+            return NULL_TIMER
+        return _Timer(self, category, name)
+
+    def instrument(self, category: str, name: Optional[Callable] = None,
+                   outcome: Optional[Callable] = None):
+        """
+        Decorator that times every call of a function
+
+        Args:
+            category: One of CATEGORIES
+            name: Function (args, kwargs) -> operation name; defaults to the function's qualname
+            outcome: Function (result) -> bool telling whether the call succeeded
+        """
+        def decorator(function):
+            default_name = function.__qualname__
+
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                start = time.perf_counter()
+                ok = False
+                try:
+                    result = function(*args, **kwargs)
+                    ok = outcome(result) if outcome else True
+                    return result
+                finally:
+                    label = name(args, kwargs) if name else default_name
+                    self.record(category, label, time.perf_counter() - start, ok=ok)
+            return wrapper
+        return decorator
+
+    def summary(self, recent: int = 50) -> Dict[str, Any]:
+        """
+        Aggregates grouped by category, slowest total first
+
+        Returns:
+            Dict with 'enabled', 'since', 'categories' {category: [operation stats]}
+            and the most recent events
+        """
+        with self.lock:
+            operations = list(self.operations.items())
+            events = list(self.events)[-recent:] if recent else []
+        categories = {category: [] for category in CATEGORIES}
+        for (category, name), stats in operations:
+            categories.setdefault(category, []).append({
+                'name': name,
+                'calls': stats['calls'],
+                'total_ms': round(stats['total'] * 1000, 3),
+                'avg_ms': round(stats['total'] * 1000 / stats['calls'], 3) if stats['calls'] else 0.0,
+                'max_ms': round(stats['max'] * 1000, 3),
+                'errors': stats['errors'],
+                'rows': stats['rows'],
+            })
+        for entries in categories.values():
+            entries.sort(key=lambda entry: entry['total_ms'], reverse=True)
+        return {
+            'enabled': self.enabled,
+            'since': self.started_at,
+            'categories': categories,
+            'recent': [{'time': t, 'category': c, 'name': n, 'ms': round(d * 1000, 3), 'rows': r, 'ok': ok}
+                       for t, c, n, d, r, ok in reversed(events)],
+        }
+
+    def write_snapshot(self, path: str, extra: Optional[Dict[str, Any]] = None):
+        """Write the summary (plus any extra sections) to a JSON file, replaced atomically, for another process to read"""
+        temp_path = path + '.tmp'
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump({**self.summary(), **(extra or {})}, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write diagnostics snapshot: {e}")
+
+
+def snapshot_path(db_path: str) -> str:
+    """Where the app process writes its diagnostics snapshot"""
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), SNAPSHOT_FILE)
+
+
+def read_snapshot(path: str) -> Optional[Dict[str, Any]]:
+    """Read a snapshot written by write_snapshot, or None if there isn't one"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read diagnostics snapshot: {e}")
+        return None
+
+
+# Shared instance for the process
+instrumentation = Instrumentation()
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that records each statement's SQL, duration and rows"""
+
+    label = None
+
+    def execute(self, sql, parameters=()):
+        self.label = sql_label(sql)
+        start = time.perf_counter()
+        ok = False
+        try:
+            super().execute(sql, parameters)
+            ok = True
+            return self
+        finally:
+            instrumentation.record('db', self.label, time.perf_counter() - start,
+                                   rows=self.rowcount, ok=ok)
+
+    def executemany(self, sql, seq_of_parameters):
+        self.label = sql_label(sql)
+        start = time.perf_counter()
+        ok = False
+        try:
+            super().executemany(sql, seq_of_parameters)
+            ok = True
+            return self
+        finally:
+            instrumentation.record('db', self.label, time.perf_counter() - start,
+                                   rows=self.rowcount, ok=ok)
+
+    def executescript(self, sql_script):
+        self.label = 'script: ' + sql_label(sql_script)
+        with instrumentation.timed('db', self.label):
+            return super().executescript(sql_script)
+
+    # SQLite does most of a SELECT's work while rows are fetched, so add that to the statement
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        if self.label:
+            instrumentation.record('db', self.label, time.perf_counter() - start,
+                                   rows=1 if row is not None else 0, calls=0)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        if self.label:
+            instrumentation.record('db', self.label, time.perf_counter() - start, rows=len(rows), calls=0)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        if self.label:
+            instrumentation.record('db', self.label, time.perf_counter() - start, rows=len(rows), calls=0)
+        return rows
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """sqlite3 connection whose cursors are InstrumentedCursors"""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    # The C implementations of these make a plain cursor, so route them through cursor()
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
@@ -0,0 +1,372 @@
+"""
+Background import of growth photos dropped into the watched folder
+
+New photos in the photo_import_folder setting are matched to a tortoise,
+copied into the photo store, given thumbnails and recorded as growth records.
+The watcher uses inotify on Linux when inotify_simple is installed and falls
+back to polling the folder otherwise. Everything runs on a worker thread.
+"""
+
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from typing import Optional, List, Dict, Any
+
+from utils import photo_store
+from utils.photo_pipeline import generate_derivatives, photo_taken_date
+
+logger = logging.getLogger(__name__)
+
+try:
+    from inotify_simple import INotify, flags
+    INOTIFY_AVAILABLE = True
+except ImportError:
+    INOTIFY_AVAILABLE = False
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'}
+
+# Imported originals are moved here so they are not picked up again
+IMPORTED_DIRNAME = 'imported'
+
+# Photos are imported in batches of up to this many files per transaction
+MAX_BATCH_SIZE = 50
+
+# Filenames like tortoise_3_2024-05-01.jpg name the tortoise by ID
+TORTOISE_ID_RE = re.compile(r'tortoise[_\- ]?(\d+)')
+
+
+def filename_tokens(text: str) -> List[str]:
+    """Split a filename or tortoise name into lowercase words"""
+    return [token for token in re.split(r'[^a-z0-9]+', text.lower()) if token]
+
+
+def match_tortoise_by_filename(filename: str, tortoises: List[Dict]) -> Optional[int]:
+    """
+    Find the tortoise a photo filename refers to
+
+    Args:
+        filename: Photo filename
+        tortoises: Active tortoises
+
+    Returns:
+        Tortoise ID, or None if no single tortoise matches
+    """
+    stem = os.path.splitext(filename)[0].lower()
+    active_ids = {t['id'] for t in tortoises}
+
+    id_match = TORTOISE_ID_RE.search(stem)
+    if id_match and int(id_match.group(1)) in active_ids:
+        return int(id_match.group(1))
+
+    tokens = filename_tokens(stem)
+    matches = set()
+    for tortoise in tortoises:
+        name_tokens = filename_tokens(tortoise['name'])
+        size = len(name_tokens)
+        if size and any(tokens[i:i + size] == name_tokens for i in range(len(tokens) - size + 1)):
+            matches.add(tortoise['id'])
+    return matches.pop() if len(matches) == 1 else None
+
+
+class PhotoFolderWatcher:
+    """Watches a folder and imports new photos as growth records"""
+
+    def __init__(self, folder: str, db_path: str = "tortoise_care.db",
+                 poll_interval: float = 5.0, batch_delay: float = 1.0):
+        self.folder = folder
+        self.db_path = db_path
+        self.poll_interval = poll_interval
+        self.batch_delay = batch_delay
+        self.worker = None
+        self.stop_event = threading.Event()
+        self.scan_event = threading.Event()
+        self.lock = threading.Lock()
+        # Files that could not be matched, keyed by path -> mtime, so they aren't retried every scan
+        self.skipped = {}
+        self.metrics = {
+            'mode': None,
+            'files_seen': 0,
+            'imported': 0,
+            'duplicates': 0,
+            'unmatched': 0,
+            'errors': 0,
+            'batches': 0,
+            'busy_seconds': 0.0,
+            'last_batch_size': 0,
+            'last_batch_seconds': 0.0,
+            'last_import_at': None,
+        }
+
+    def start(self):
+        """Start watching in the background"""
+        with self.lock:
+            if self.worker is None or not self.worker.is_alive():
+                self.stop_event.clear()
+                self.worker = threading.Thread(target=self._run, name='photo-import', daemon=True)
+                self.worker.start()
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        """Stop watching (the current batch is finished first; timeout=0 doesn't wait for it)"""
+        self.stop_event.set()
+        self.scan_event.set()
+        if self.worker:
+            self.worker.join(timeout)
+
+    def is_running(self) -> bool:
+        return self.worker is not None and self.worker.is_alive()
+
+    def scan_now(self):
+        """Rescan the whole folder, retrying previously unmatched photos"""
+        with self.lock:
+            self.skipped.clear()
+        self.scan_event.set()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get a snapshot of the import counters, including throughput"""
+        with self.lock:
+            metrics = dict(self.metrics)
+        busy = metrics['busy_seconds']
+        metrics['photos_per_second'] = metrics['imported'] / busy if busy else 0.0
+        return metrics
+
+    def _run(self):
+        # SQLite connections can't cross threads, so the worker has its own
+        from database.db_manager import DatabaseManager
+        db = DatabaseManager(self.db_path)
+        try:
+            failed = self.import_paths(db, self.list_photos())
+            if INOTIFY_AVAILABLE:
+                self._watch_inotify(db, failed)
+            else:
+                # Polling rescans the whole folder, so failed photos are picked up again anyway
+                self._watch_polling(db)
+        except Exception as e:
+            logger.error(f"Photo folder watcher stopped: {e}")
+        finally:
+            db.close()
+
+    def _watch_inotify(self, db, failed: Optional[List[str]] = None):
+        with self.lock:
+            self.metrics['mode'] = 'inotify'
+        inotify = INotify()
+        inotify.add_watch(self.folder, flags.CLOSE_WRITE | flags.MOVED_TO)
+        pending = []
+        # Photos whose batch failed are retried after poll_interval (no new event will come for them)
+        retry = list(failed or [])
+        retry_at = time.monotonic() + self.poll_interval
+        try:
+            while not self.stop_event.is_set():
+                # Wait briefly for more events so a copied folder becomes one batch
+                events = inotify.read(timeout=int(self.batch_delay * 1000))
+                pending.extend(os.path.join(self.folder, event.name) for event in events)
+                if self.scan_event.is_set():
+                    self.scan_event.clear()
+                    pending, retry = self.list_photos(), []
+                if retry and time.monotonic() >= retry_at:
+                    pending.extend(retry)
+                    retry = []
+                if pending and (not events or len(pending) >= MAX_BATCH_SIZE):
+                    failed = self.import_paths(db, [p for p in pending if self.is_photo(p)])
+                    pending = []
+                    if failed:
+                        retry.extend(failed)
+                        retry_at = time.monotonic() + self.poll_interval
+        finally:
+            inotify.close()
+
+    def _watch_polling(self, db):
+        with self.lock:
+            self.metrics['mode'] = 'polling'
+        previous = {}
+        while not self.stop_event.is_set():
+            requested = self.scan_event.wait(self.poll_interval)
+            self.scan_event.clear()
+            if self.stop_event.is_set():
+                break
+
+            # Only import files whose size has settled since the last scan,
+            # unless a rescan was asked for explicitly
+            current = {}
+            for path in self.list_photos():
+                try:
+                    current[path] = os.path.getsize(path)
+                except OSError:
+                    continue
+            ready = [path for path, size in current.items() if requested or previous.get(path) == size]
+            previous = current
+            self.import_paths(db, ready)
+
+    def is_photo(self, path: str) -> bool:
+        return os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS and os.path.isfile(path)
+
+    def list_photos(self) -> List[str]:
+        """Photos directly in the watched folder (not in sub-folders)"""
+        try:
+            with os.scandir(self.folder) as entries:
+                return [entry.path for entry in entries
+                        if entry.is_file() and os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS]
+        except OSError as e:
+            logger.error(f"Cannot read photo import folder {self.folder}: {e}")
+            return []
+
+    def import_paths(self, db, paths: List[str]) -> List[str]:
+        """
+        Import photos in batches
+
+        A batch that fails (e.g. "database is locked" while the UI or photo
+        server is writing) is logged and counted as an error; its photos stay
+        in the folder and the remaining batches still run.
+
+        Returns:
+            List[str]: Photos in batches that failed, to be retried
+        """
+        with self.lock:
+            paths = [p for p in dict.fromkeys(paths)
+                     if self.skipped.get(p) != self._mtime(p)]
+        failed = []
+        for start in range(0, len(paths), MAX_BATCH_SIZE):
+            if self.stop_event.is_set():
+                break
+            batch = paths[start:start + MAX_BATCH_SIZE]
+            try:
+                self.import_batch(db, batch)
+            except Exception as e:
+                logger.error(f"Photo import batch of {len(batch)} failed, will retry: {e}")
+                with self.lock:
+                    self.metrics['errors'] += 1
+                failed.extend(batch)
+        return failed
+
+    def _mtime(self, path: str) -> Optional[float]:
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return None
+
+    def import_batch(self, db, paths: List[str]) -> int:
+        """
+        Import one batch of photos
+
+        Args:
+            db: DatabaseManager owned by the worker thread
+            paths: Photo files in the watched folder
+
+        Returns:
+            int: Number of growth records created
+        """
+        if not paths:
+            return 0
+        started = time.perf_counter()
+        tortoises = db.get_tortoises()
+        users = db.get_users()
+        counts = {'duplicates': 0, 'unmatched': 0, 'errors': 0}
+        records, imported_sources = [], []
+
+        stored = {}
+        for path in paths:
+            try:
+                taken = photo_taken_date(path)
+                tortoise_id = match_tortoise_by_filename(os.path.basename(path), tortoises)
+                if tortoise_id is None and taken:
+                    # Otherwise use the tortoise that was measured on the day the photo was taken
+                    measured = db.get_tortoise_ids_measured_on(taken[:10])
+                    tortoise_id = measured[0] if len(measured) == 1 else None
+                if tortoise_id is None and len(tortoises) == 1:
+                    tortoise_id = tortoises[0]['id']
+                if tortoise_id is None or not users:
+                    counts['unmatched'] += 1
+                    with self.lock:
+                        self.skipped[path] = self._mtime(path)
+                    continue
+
+                # Without EXIF, the file's modification time is the best guess
+                measured_at = taken or time.strftime('%Y-%m-%d %H:%M:%S',
+                                                     time.localtime(os.path.getmtime(path)))
+                stored_path, is_new = photo_store.store_file(path)
+                stored[path] = (stored_path, tortoise_id, measured_at)
+            except Exception as e:
+                counts['errors'] += 1
+                logger.error(f"Failed to import {path}: {e}")
+                continue
+
+            if is_new:
+                # Viewers fall back to the original if thumbnails can't be made
+                try:
+                    db.add_photo_derivatives(stored_path, generate_derivatives(stored_path))
+                except Exception as e:
+                    logger.error(f"Failed to generate thumbnails for {path}: {e}")
+
+        # Photos that were imported before (same content) don't get a second record
+        existing = db.get_existing_growth_photos([p for p, _, _ in stored.values()])
+        for path, (stored_path, tortoise_id, measured_at) in stored.items():
+            imported_sources.append(path)
+            if stored_path in existing:
+                counts['duplicates'] += 1
+                continue
+            existing.add(stored_path)
+            records.append({
+                'tortoise_id': tortoise_id,
+                'user_id': users[0]['id'],
+                'measurement_date': measured_at,
+                'photo_path': stored_path,
+                'notes': f"Imported from {os.path.basename(path)}",
+            })
+
+        db.add_growth_records(records)
+        self._move_imported(imported_sources)
+
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            self.metrics['files_seen'] += len(paths)
+            self.metrics['imported'] += len(records)
+            self.metrics['batches'] += 1
+            self.metrics['busy_seconds'] += elapsed
+            self.metrics['last_batch_size'] = len(paths)
+            self.metrics['last_batch_seconds'] = elapsed
+            self.metrics['last_import_at'] = time.time()
+            for key, value in counts.items():
+                self.metrics[key] += value
+        logger.info(f"Imported {len(records)} of {len(paths)} photos in {elapsed:.2f}s")
+        return len(records)
+
+    def _move_imported(self, paths: List[str]):
+        imported_dir = os.path.join(self.folder, IMPORTED_DIRNAME)
+        os.makedirs(imported_dir, exist_ok=True)
+        for path in paths:
+            try:
+                shutil.move(path, self._unique_path(imported_dir, os.path.basename(path)))
+            except OSError as e:
+                logger.error(f"Could not move imported photo {path}: {e}")
+
+    def _unique_path(self, folder: str, filename: str) -> str:
+        """Path in folder for filename, numbered (IMG_0001_2.jpg) if the name is taken"""
+        stem, extension = os.path.splitext(filename)
+        path = os.path.join(folder, filename)
+        number = 1
+        while os.path.exists(path):
+            number += 1
+            path = os.path.join(folder, f"{stem}_{number}{extension}")
+        return path
+
+
+_photo_watcher: Optional[PhotoFolderWatcher] = None
+
+
+def get_photo_watcher(folder: str, db_path: str = "tortoise_care.db") -> PhotoFolderWatcher:
+    """Get the shared watcher, replacing it if the watched folder changed"""
+    global _photo_watcher
+    if _photo_watcher is not None and _photo_watcher.folder != folder:
+        # Called from the UI thread - let the old watcher finish its batch on its own
+        _photo_watcher.stop(timeout=0)
+        _photo_watcher = None
+    if _photo_watcher is None:
+        _photo_watcher = PhotoFolderWatcher(folder, db_path)
+    return _photo_watcher
+
+
+def current_photo_watcher() -> Optional[PhotoFolderWatcher]:
+    """Get the shared watcher if one has been created"""
+    return _photo_watcher
@@ -0,0 +1,198 @@
+"""
+Photo ingest pipeline - generates size-capped derivatives of uploaded photos
+
+Originals from phones are often 12+ megapixels. Screens only ever show them
+at 90-600px, so every photo gets EXIF-rotated JPEG/WebP derivatives that the
+viewers load instead of decoding the original.
+"""
+
+import logging
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+
+from utils.instrumentation import instrumentation
+
+logger = logging.getLogger(__name__)
+
+try:
+    from PIL import Image, ImageOps, features
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# Longest edge of each derivative variant, smallest first
+DERIVATIVE_SIZES = {
+    'thumbnail': 180,
+    'card': 400,
+    'display': 1280,
+}
+
+JPEG_QUALITY = 85
+WEBP_QUALITY = 80
+
+# Derivatives live next to the original in this sub-directory
+DERIVATIVES_DIRNAME = 'derivatives'
+
+
+def derivative_path(source_path: str, variant: str, extension: str) -> str:
+    """
+    Get the path of a derivative for a source photo
+
+    The size and quality are part of the name (<sha>_card_400q85.jpg), so a
+    derivative's bytes never change under a name and it can be cached forever.
+    """
+    source = Path(source_path)
+    quality = WEBP_QUALITY if extension == 'webp' else JPEG_QUALITY
+    settings = f"{DERIVATIVE_SIZES[variant]}q{quality}"
+    return str(source.parent / DERIVATIVES_DIRNAME / f"{source.stem}_{variant}_{settings}.{extension}")
+
+
+def webp_supported() -> bool:
+    """Check whether this Pillow build can write WebP"""
+    return PIL_AVAILABLE and features.check('webp')
+
+
+def generate_derivatives(source_path: str) -> List[Dict[str, Any]]:
+    """
+    Generate every derivative variant for a photo
+
+    Args:
+        source_path: Path to the original photo
+
+    Returns:
+        List of dicts with variant, format, path, width and height
+    """
+    if not PIL_AVAILABLE:
+        raise ImportError("Install with: pip install pillow")
+
+    formats = [('jpeg', 'jpg')]
+    if webp_supported():
+        formats.append(('webp', 'webp'))
+
+    derivatives = []
+    with instrumentation.timed('image', 'generate_derivatives'), Image.open(source_path) as original:
+        # Apply the camera orientation so derivatives display upright everywhere
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+
+        # Work from largest to smallest so each resize starts from fewer pixels
+        for variant, max_edge in sorted(DERIVATIVE_SIZES.items(), key=lambda item: -item[1]):
+            if max(image.size) > max_edge:
+                image = image.copy()
+                image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+
+            for image_format, extension in formats:
+                path = derivative_path(source_path, variant, extension)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = path + '.tmp'
+                if image_format == 'jpeg':
+                    image.save(temp_path, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+                else:
+                    image.save(temp_path, 'WEBP', quality=WEBP_QUALITY, method=4)
+                os.replace(temp_path, path)
+
+                derivatives.append({
+                    'variant': variant,
+                    'format': image_format,
+                    'path': path,
+                    'width': image.width,
+                    'height': image.height,
+                })
+
+    return derivatives
+
+
+def photo_taken_date(source_path: str) -> Optional[str]:
+    """
+    Get when a photo was taken from its EXIF data
+
+    Returns:
+        'YYYY-MM-DD HH:MM:SS' or None if the photo has no usable date
+    """
+    if not PIL_AVAILABLE:
+        return None
+    try:
+        with Image.open(source_path) as image:
+            exif = image.getexif()
+            # DateTimeOriginal lives in the Exif sub-IFD, DateTime in the main one
+            taken = exif.get_ifd(0x8769).get(0x9003) or exif.get(0x0132)
+    except Exception:
+        return None
+    if not taken or len(taken) < 19:
+        return None
+    # EXIF writes dates as YYYY:MM:DD HH:MM:SS
+    return taken[:10].replace(':', '-') + taken[10:19]
+
+
+class PhotoIngestQueue:
+    """Background worker that generates derivatives off the request/UI thread"""
+
+    def __init__(self, db_path: str = "tortoise_care.db"):
+        self.db_path = db_path
+        self.queue = queue.Queue()
+        self.worker = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        """Start the worker thread if it is not running"""
+        with self.lock:
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = threading.Thread(target=self._run, name='photo-ingest', daemon=True)
+                self.worker.start()
+
+    def submit(self, source_path: str, callback=None):
+        """
+        Queue a photo for derivative generation
+
+        Args:
+            source_path: Path to the stored original
+            callback: Optional callable(source_path, derivatives, error) run on the worker thread
+        """
+        self.start()
+        self.queue.put((source_path, callback))
+
+    def wait(self):
+        """Block until every queued photo has been processed"""
+        self.queue.join()
+
+    def _run(self):
+        # SQLite connections can't cross threads, so the worker has its own
+        from database.db_manager import DatabaseManager
+        db = DatabaseManager(self.db_path)
+        try:
+            while True:
+                source_path, callback = self.queue.get()
+                derivatives, error = [], None
+                try:
+                    derivatives = generate_derivatives(source_path)
+                    db.add_photo_derivatives(source_path, derivatives)
+                except Exception as e:
+                    error = str(e)
+                    logger.error(f"Failed to generate derivatives for {source_path}: {e}")
+                # Marked done only after the callback, so wait() covers it too
+                try:
+                    if callback:
+                        callback(source_path, derivatives, error)
+                except Exception as e:
+                    logger.error(f"Photo ingest callback failed: {e}")
+                finally:
+                    self.queue.task_done()
+        finally:
+            db.close()
+
+
+_ingest_queues: Dict[str, PhotoIngestQueue] = {}
+_ingest_queues_lock = threading.Lock()
+
+
+def get_ingest_queue(db_path: str = "tortoise_care.db") -> PhotoIngestQueue:
+    """Get the shared ingest queue for a database (one worker per database file)"""
+    key = os.path.abspath(db_path)
+    with _ingest_queues_lock:
+        if key not in _ingest_queues:
+            _ingest_queues[key] = PhotoIngestQueue(db_path)
+        return _ingest_queues[key]
@@ -0,0 +1,176 @@
+"""
+Content-addressed photo storage shared by tortoise, growth and health record photos
+
+Photos are streamed to a temporary file while their SHA-256 is computed and
+then moved to photos/<first two hex digits>/<sha256>.<ext>. Identical photos
+therefore end up at the same path and are only stored once.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from typing import BinaryIO, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Set to use another photo root, e.g. to keep load tests out of the real store
+ENV_VAR = 'TORTOISE_PHOTOS_DIR'
+
+# Shared photo root (same directory the photo upload server serves)
+PHOTOS_DIR = os.environ.get(ENV_VAR) or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'photos')
+
+# Partial uploads are written next to the photo root - on the same filesystem,
+# so committing is a rename, but outside what /photo/ serves
+INCOMING_DIR = PHOTOS_DIR.rstrip(os.sep) + '.incoming'
+
+# Where earlier versions staged uploads, inside the served root
+LEGACY_INCOMING_DIR = os.path.join(PHOTOS_DIR, '.incoming')
+
+# Temporary files older than this were left by a crash or abandoned upload
+STALE_INCOMING_SECONDS = 60 * 60
+
+CHUNK_SIZE = 64 * 1024
+
+# Normalize equivalent extensions so the same content always gets the same path
+EXTENSION_ALIASES = {'jpeg': 'jpg'}
+
+
+class HashingFile:
+    """Temporary file that hashes everything written to it"""
+
+    def __init__(self):
+        os.makedirs(INCOMING_DIR, exist_ok=True)
+        self.file = tempfile.NamedTemporaryFile(dir=INCOMING_DIR, delete=False)
+        self.path = self.file.name
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+        self.committed = False
+
+    def write(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        return self.file.write(data)
+
+    def __getattr__(self, name):
+        # read/seek/tell/flush etc. go straight to the underlying file; if
+        # __init__ failed before opening it, don't recurse looking for it
+        if name == 'file':
+            raise AttributeError(name)
+        return getattr(self.file, name)
+
+    def close(self):
+        """Close the file, deleting it unless it was committed to the store"""
+        if self.committed:
+            self.file.close()
+        else:
+            self.discard()
+
+    def discard(self):
+        """Close and delete the temporary file"""
+        self.file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def sweep_incoming(max_age: float = STALE_INCOMING_SECONDS) -> int:
+    """
+    Delete temporary upload files left behind by crashes (run at startup)
+
+    Args:
+        max_age: Only files not written for this many seconds are deleted, so
+                 uploads in progress in another process are left alone
+
+    Returns:
+        int: Number of files deleted
+    """
+    cutoff = time.time() - max_age
+    removed = 0
+    for folder in (INCOMING_DIR, LEGACY_INCOMING_DIR):
+        try:
+            entries = list(os.scandir(folder))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError as e:
+                logger.warning(f"Could not remove stale upload {entry.path}: {e}")
+    # Nothing is staged in the served root any more
+    try:
+        os.rmdir(LEGACY_INCOMING_DIR)
+    except OSError:
+        pass  # Missing, or still holds recent files
+    if removed:
+        logger.info(f"Removed {removed} stale temporary uploads")
+    return removed
+
+
+def normalize_extension(filename_or_ext: str) -> str:
+    """Get the lowercase stored extension for a filename or extension"""
+    extension = filename_or_ext.rsplit('.', 1)[-1].lower()
+    return EXTENSION_ALIASES.get(extension, extension)
+
+
+def content_path(digest: str, extension: str) -> str:
+    """Get the stored path for a content hash"""
+    return os.path.join(PHOTOS_DIR, digest[:2], f"{digest}.{extension}")
+
+
+def commit(hashing_file: HashingFile, extension: str) -> Tuple[str, bool]:
+    """
+    Move a fully written HashingFile to its content-addressed location
+
+    Returns:
+        Tuple[str, bool]: (stored path, True if this content was not stored before)
+    """
+    hashing_file.file.close()
+    hashing_file.committed = True
+    path = content_path(hashing_file.sha256.hexdigest(), normalize_extension(extension))
+
+    if os.path.exists(path):
+        # Already stored - drop the duplicate
+        hashing_file.discard()
+        return path, False
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(hashing_file.path, path)
+    return path, True
+
+
+def store_stream(stream: BinaryIO, extension: str) -> Tuple[str, bool]:
+    """Copy a binary stream into the store in chunks"""
+    hashing_file = HashingFile()
+    try:
+        while True:
+            chunk = stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            hashing_file.write(chunk)
+    except Exception:
+        hashing_file.discard()
+        raise
+    return commit(hashing_file, extension)
+
+
+def store_file(source_path: str) -> Tuple[str, bool]:
+    """Copy a file on disk into the store"""
+    with open(source_path, 'rb') as f:
+        return store_stream(f, source_path)
+
+
+def store_upload(file_storage) -> Tuple[str, bool]:
+    """
+    Store an uploaded file
+
+    Uploads parsed by a request class that streams into HashingFile are
+    committed without copying the data again.
+    """
+    stream = file_storage.stream
+    if isinstance(stream, HashingFile):
+        return commit(stream, file_storage.filename)
+    return store_stream(stream, file_storage.filename)
@@ -0,0 +1,189 @@
+"""
+Query fingerprints, latency percentiles and the slow-query log
+
+Queries run through DatabaseManager.execute are reduced to a fingerprint -
+literals replaced by ?, IN lists collapsed, whitespace normalized - so the
+same statement with different values or list lengths is counted together.
+Each fingerprint keeps a window of recent latencies for p50/p95/p99.
+
+Anything slower than the threshold is logged to the 'tortoise.slow_queries'
+logger with its EXPLAIN QUERY PLAN, so a slow field database can be
+diagnosed from the log alone. enable_log_file() sends that logger to a file.
+"""
+
+import logging
+import math
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+from typing import Optional, List, Dict, Any
+
+logger = logging.getLogger('tortoise.slow_queries')
+
+# Queries slower than this are logged with their query plan
+SLOW_QUERY_MS = 200
+
+# Latency samples kept per fingerprint for the percentiles
+SAMPLE_WINDOW = 500
+
+# Distinct fingerprints tracked
+MAX_FINGERPRINTS = 300
+
+# A fingerprint's plan is logged at most this often (seconds)
+EXPLAIN_INTERVAL = 300
+
+# Recent slow queries kept for the diagnostics screen
+SLOW_HISTORY = 50
+
+SLOW_LOG_FILE = 'slow_queries.log'
+
+_COMMENT_RE = re.compile(r'--[^\n]*|/\*.*?\*/', re.S)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])')
+_IN_LIST_RE = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.I)
+_VALUES_RE = re.compile(r'\bVALUES\s*\(([^()]*)\)(?:\s*,\s*\(\1\))+', re.I)
+_SPACE_RE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(sql: str) -> str:
+    """
+    Normalize a SQL statement so equivalent queries share one key
+
+    Args:
+        sql: Statement text
+
+    Returns:
+        str: e.g. "SELECT * FROM plants WHERE id IN (...) LIMIT ?"
+    """
+    text = _COMMENT_RE.sub(' ', sql)
+    text = _STRING_RE.sub('?', text)
+    text = _NUMBER_RE.sub('?', text)
+    text = _SPACE_RE.sub(' ', text).strip()
+    text = _IN_LIST_RE.sub('IN (...)', text)
+    text = _VALUES_RE.sub(r'VALUES (\1)', text)
+    return text
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class QueryStats:
+    """Per-fingerprint latency windows and recent slow queries"""
+
+    def __init__(self, slow_query_ms: float = SLOW_QUERY_MS, window: int = SAMPLE_WINDOW):
+        self.slow_query_ms = slow_query_ms
+        self.window = window
+        self.fingerprints: Dict[str, Dict[str, Any]] = {}
+        self.slow_queries = deque(maxlen=SLOW_HISTORY)
+        self.explained_at: Dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def record(self, sql: str, duration: float) -> bool:
+        """
+        Add a query's latency
+
+        Returns:
+            bool: True if the query was slower than the threshold
+        """
+        key = fingerprint(sql)
+        with self.lock:
+            stats = self.fingerprints.get(key)
+            if stats is None:
+                if len(self.fingerprints) >= MAX_FINGERPRINTS:
+                    # Forget the least used fingerprint
+                    del self.fingerprints[min(self.fingerprints, key=lambda k: self.fingerprints[k]['count'])]
+                stats = self.fingerprints[key] = {'count': 0, 'total': 0.0, 'max': 0.0, 'slow': 0,
+                                                  'samples': deque(maxlen=self.window)}
+            stats['count'] += 1
+            stats['total'] += duration
+            stats['max'] = max(stats['max'], duration)
+            stats['samples'].append(duration)
+            slow = duration * 1000 >= self.slow_query_ms
+            if slow:
+                stats['slow'] += 1
+        return slow
+
+    def log_slow(self, sql: str, duration: float, plan: Optional[List[str]]):
+        """Log a slow query, with its plan if one was gathered"""
+        key = fingerprint(sql)
+        self.slow_queries.append({'time': time.time(), 'fingerprint': key,
+                                  'ms': round(duration * 1000, 3), 'plan': plan})
+        message = f"Slow query ({duration * 1000:.1f} ms): {key}"
+        if plan:
+            message += '\n  Query plan:\n' + '\n'.join(f"    {line}" for line in plan)
+        logger.warning(message)
+
+    def should_explain(self, sql: str) -> bool:
+        """Whether this fingerprint's plan hasn't been logged recently"""
+        key = fingerprint(sql)
+        now = time.monotonic()
+        with self.lock:
+            last = self.explained_at.get(key)
+            if last is not None and now - last < EXPLAIN_INTERVAL:
+                return False
+            self.explained_at[key] = now
+        return True
+
+    def reset(self):
+        with self.lock:
+            self.fingerprints.clear()
+            self.slow_queries.clear()
+            self.explained_at.clear()
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Latency percentiles per fingerprint, highest p95 first"""
+        with self.lock:
+            items = [(key, stats['count'], stats['total'], stats['max'], stats['slow'], sorted(stats['samples']))
+                     for key, stats in self.fingerprints.items()]
+        summary = []
+        for key, count, total, maximum, slow, samples in items:
+            summary.append({
+                'fingerprint': key,
+                'calls': count,
+                'avg_ms': round(total * 1000 / count, 3),
+                'p50_ms': round(percentile(samples, 50) * 1000, 3),
+                'p95_ms': round(percentile(samples, 95) * 1000, 3),
+                'p99_ms': round(percentile(samples, 99) * 1000, 3),
+                'max_ms': round(maximum * 1000, 3),
+                'slow': slow,
+            })
+        summary.sort(key=lambda entry: entry['p95_ms'], reverse=True)
+        return summary
+
+
+def explain_query_plan(conn, sql: str, params=()) -> List[str]:
+    """EXPLAIN QUERY PLAN for a statement, as indented lines"""
+    try:
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    except Exception as e:
+        return [f"(no plan: {e})"]
+    depth = {0: -1}
+    lines = []
+    for node_id, parent_id, _, detail in rows:
+        depth[node_id] = depth.get(parent_id, -1) + 1
+        lines.append('  ' * depth[node_id] + detail)
+    return lines
+
+
+def enable_log_file(path: str):
+    """Also write slow queries to a rotating log file"""
+    for handler in logger.handlers:
+        if isinstance(handler, RotatingFileHandler) and handler.baseFilename == path:
+            return
+    handler = RotatingFileHandler(path, maxBytes=512 * 1024, backupCount=2)
+    handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.WARNING)
+
+
+# Shared statistics for the process (all DatabaseManagers feed it)
+query_stats = QueryStats()
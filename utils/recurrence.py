@@ -0,0 +1,161 @@
+"""
+Recurrence rules for care reminders
+
+A reminder's schedule is described by its reminder_type ('daily', 'weekly',
+'monthly', 'yearly' or 'once'), frequency_days, anchor_date (the first due
+date, which fixes the time of day and the day of the month) and a catch-up
+policy that decides what happens when a reminder is completed late:
+
+    skip             - jump to the first occurrence after now (default)
+    next             - advance one occurrence, so missed ones come up one by one
+    from_completion  - restart the interval from the time it was completed
+
+Only next_due_date is stored; further occurrences are expanded lazily for
+calendar views.
+"""
+
+import calendar
+from datetime import datetime, timedelta
+from typing import Optional, Iterator, Dict, Any, List
+
+CATCH_UP_POLICIES = ('skip', 'next', 'from_completion')
+DEFAULT_CATCH_UP = 'skip'
+
+# Safety limit for expanding a single rule
+MAX_OCCURRENCES = 1000
+
+
+def add_months(value: datetime, months: int, day: int) -> datetime:
+    """Move a datetime by whole months, keeping day (clamped to the month's length)"""
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    return value.replace(year=year, month=month, day=min(day, calendar.monthrange(year, month)[1]))
+
+
+class RecurrenceRule:
+    """When a reminder repeats"""
+
+    def __init__(self, reminder_type: str, frequency_days: int = 1, anchor: Optional[datetime] = None):
+        self.reminder_type = reminder_type
+        self.frequency_days = frequency_days or 0
+        self.anchor = anchor
+
+    @classmethod
+    def from_reminder(cls, reminder: Dict[str, Any]) -> 'RecurrenceRule':
+        """Build the rule for a care_reminders row"""
+        anchor = reminder.get('anchor_date') or reminder.get('next_due_date')
+        return cls(reminder['reminder_type'], reminder.get('frequency_days') or 0,
+                   datetime.fromisoformat(anchor) if anchor else None)
+
+    @property
+    def repeats(self) -> bool:
+        return self.reminder_type != 'once' and self.frequency_days > 0
+
+    def step(self, occurrence: datetime, count: int = 1) -> datetime:
+        """The occurrence count steps after the given one"""
+        if self.reminder_type == 'monthly':
+            months = max(1, round(self.frequency_days / 30)) * count
+            day = self.anchor.day if self.anchor else occurrence.day
+            return add_months(occurrence, months, day)
+        if self.reminder_type == 'yearly':
+            years = max(1, round(self.frequency_days / 365)) * count
+            day = self.anchor.day if self.anchor else occurrence.day
+            return add_months(occurrence, 12 * years, day)
+        # daily, weekly and custom intervals are a fixed number of days
+        return occurrence + timedelta(days=self.frequency_days * count)
+
+    def first_after(self, occurrence: datetime, after: datetime) -> datetime:
+        """First occurrence of the series through occurrence that is later than after"""
+        if occurrence > after:
+            return occurrence
+        if self.reminder_type not in ('monthly', 'yearly'):
+            # Fixed intervals: jump straight there instead of stepping
+            interval = timedelta(days=self.frequency_days)
+            return occurrence + interval * ((after - occurrence) // interval + 1)
+        # Months vary in length, so estimate the jump and step the rest of the way
+        if self.reminder_type == 'monthly':
+            months = max(1, round(self.frequency_days / 30))
+        else:
+            months = 12 * max(1, round(self.frequency_days / 365))
+        elapsed = (after.year - occurrence.year) * 12 + after.month - occurrence.month
+        candidate = self.step(occurrence, max(0, elapsed // months - 1))
+        while candidate <= after:
+            candidate = self.step(candidate)
+        return candidate
+
+    def next_due(self, current_due: datetime, completed_at: datetime,
+                 catch_up: str = DEFAULT_CATCH_UP) -> Optional[datetime]:
+        """
+        Work out the next due date when a reminder is completed
+
+        Args:
+            current_due: The due date that was completed
+            completed_at: When it was completed
+            catch_up: One of CATCH_UP_POLICIES
+
+        Returns:
+            Optional[datetime]: Next due date, or None if the reminder doesn't repeat
+        """
+        if not self.repeats:
+            return None
+        if catch_up == 'next':
+            return self.step(current_due)
+        if catch_up == 'from_completion':
+            start = completed_at.replace(hour=current_due.hour, minute=current_due.minute,
+                                         second=current_due.second, microsecond=0)
+            return self.step(start)
+        return self.first_after(self.step(current_due), completed_at)
+
+    def occurrences(self, first: datetime, start: datetime, end: datetime) -> Iterator[datetime]:
+        """
+        Lazily expand occurrences from first that fall in [start, end)
+
+        Args:
+            first: The next due date (the earliest occurrence that still exists)
+            start: Range start
+            end: Range end (exclusive)
+        """
+        occurrence = first
+        if occurrence < start and self.repeats:
+            occurrence = self.first_after(occurrence, start - timedelta(microseconds=1))
+        count = 0
+        while occurrence < end and count < MAX_OCCURRENCES:
+            if occurrence >= start:
+                yield occurrence
+                count += 1
+            if not self.repeats:
+                break
+            occurrence = self.step(occurrence)
+
+
+def expand_reminders(reminders: List[Dict[str, Any]], start: datetime, end: datetime,
+                     include_overdue: bool = False) -> List[Dict[str, Any]]:
+    """
+    Expand reminders into their occurrences in [start, end)
+
+    Args:
+        reminders: care_reminders rows (as returned by get_care_reminders_due_before)
+        start: Range start
+        end: Range end (exclusive)
+        include_overdue: Also include the next due date of reminders that are overdue (before start)
+
+    Returns:
+        List[Dict]: One copy of the reminder per occurrence with 'occurrence' set, in time order
+    """
+    expanded = []
+    for reminder in reminders:
+        if not reminder.get('next_due_date'):
+            continue
+        rule = RecurrenceRule.from_reminder(reminder)
+        first = datetime.fromisoformat(reminder['next_due_date'])
+        if include_overdue and first < start:
+            item = dict(reminder)
+            item['occurrence'] = first
+            expanded.append(item)
+        for occurrence in rule.occurrences(first, start, end):
+            item = dict(reminder)
+            item['occurrence'] = occurrence
+            expanded.append(item)
+    expanded.sort(key=lambda item: item['occurrence'])
+    return expanded
@@ -0,0 +1,137 @@
+"""
+Event-driven scheduler for care reminders
+
+Active reminders are loaded once into a min-heap keyed by their next due
+time, and a single timer is armed for the earliest one. When it fires, every
+reminder that has become due is announced with reminderDue and the timer is
+re-armed for the next. Adding, completing or deactivating a reminder updates
+the heap in place; superseded heap entries are skipped when they surface.
+
+The reminder screens group reminders by day, so the scheduler also emits
+dayChanged at midnight.
+"""
+
+import heapq
+import logging
+from datetime import datetime, date, time, timedelta
+from typing import Optional, Dict
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for a single wait, so the timer recovers from clock changes and suspend
+MAX_TIMER_MS = 60 * 60 * 1000
+
+
+def parse_due_date(value: str) -> Optional[datetime]:
+    """Parse a stored next_due_date ('YYYY-MM-DD[T| ]HH:MM[:SS]' or a plain date)"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        logger.warning(f"Unreadable reminder due date: {value}")
+        return None
+
+
+class ReminderScheduler(QObject):
+    """Fires reminderDue when each active reminder reaches its due time"""
+
+    reminderDue = Signal(int)
+    dayChanged = Signal()
+
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.heap = []
+        # Current due time per scheduled reminder; heap entries that don't match are stale
+        self.due_times: Dict[int, datetime] = {}
+        self.today = date.today()
+        self.loaded = False
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.process_due)
+
+    def load(self):
+        """Load every active reminder from the database and arm the timer"""
+        self.heap = []
+        self.due_times = {}
+        now = datetime.now()
+        for reminder_id, next_due_date in self.db_manager.get_active_reminder_due_dates():
+            due = parse_due_date(next_due_date)
+            # Reminders that are already due were shown when the screen loaded
+            if due is not None and due > now:
+                self.due_times[reminder_id] = due
+                self.heap.append((due, reminder_id))
+        heapq.heapify(self.heap)
+        self.loaded = True
+        self.arm()
+
+    def schedule(self, reminder_id: int, next_due_date: str):
+        """Add a reminder or move it to a new due time"""
+        due = parse_due_date(next_due_date)
+        if due is None or due <= datetime.now():
+            self.due_times.pop(reminder_id, None)
+        else:
+            self.due_times[reminder_id] = due
+            heapq.heappush(self.heap, (due, reminder_id))
+        self.arm()
+
+    def remove(self, reminder_id: int):
+        """Stop tracking a reminder (its heap entry is dropped lazily)"""
+        if self.due_times.pop(reminder_id, None) is not None:
+            self.arm()
+
+    def next_due(self) -> Optional[datetime]:
+        """Due time of the next reminder that hasn't become due yet"""
+        self.discard_stale()
+        return self.heap[0][0] if self.heap else None
+
+    def discard_stale(self):
+        while self.heap and self.due_times.get(self.heap[0][1]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+
+    def arm(self):
+        """Start the timer for whichever comes first: the next due reminder or midnight"""
+        if not self.loaded:
+            return
+        now = datetime.now()
+        wake = datetime.combine(self.today + timedelta(days=1), time.min)
+        next_due = self.next_due()
+        if next_due is not None:
+            wake = min(wake, next_due)
+        delay_ms = max(0, int((wake - now).total_seconds() * 1000) + 1)
+        self.timer.start(min(delay_ms, MAX_TIMER_MS))
+
+    def process_due(self):
+        """Announce everything that has become due, then re-arm"""
+        now = datetime.now()
+        self.discard_stale()
+        while self.heap and self.heap[0][0] <= now:
+            due, reminder_id = heapq.heappop(self.heap)
+            if self.due_times.get(reminder_id) == due:
+                del self.due_times[reminder_id]
+                self.reminderDue.emit(reminder_id)
+            self.discard_stale()
+
+        if date.today() != self.today:
+            self.today = date.today()
+            self.dayChanged.emit()
+        self.arm()
+
+    def stop(self):
+        self.timer.stop()
+
+
+_reminder_scheduler: Optional[ReminderScheduler] = None
+
+
+def get_reminder_scheduler(db_manager) -> ReminderScheduler:
+    """Get the shared reminder scheduler, loading it on first use"""
+    global _reminder_scheduler
+    if _reminder_scheduler is None or _reminder_scheduler.db_manager is not db_manager:
+        _reminder_scheduler = ReminderScheduler(db_manager)
+        _reminder_scheduler.load()
+    return _reminder_scheduler